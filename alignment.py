@@ -0,0 +1,182 @@
+# alignment.py
+import os
+import json
+import hashlib
+import numpy as np
+
+ZERO_LINE_CONFIG_NAME = "zero_line_config.json"
+BASELINE_SUFFIX = "_baseline.json"
+
+
+def read_zero_line_config(layer_path):
+    """Return the parsed zero_line_config.json of a layer folder, or None"""
+    json_path = os.path.join(layer_path, ZERO_LINE_CONFIG_NAME)
+    if not os.path.exists(json_path):
+        return None
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Could not read {json_path}: {e}")
+        return None
+
+
+def read_layer_curves(layer_path):
+    """Collect curve turns saved with the baselines of a layer.
+    Returns [(chainage_m, angle_deg, left_turn)] sorted by chainage, duplicates across baselines removed.
+    Same sources as the viewer uses: a separate "curves" list or points carrying "angle_deg".
+    """
+    curves = {}
+    if not os.path.isdir(layer_path):
+        return []
+    for filename in os.listdir(layer_path):
+        if not filename.endswith(BASELINE_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(layer_path, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Skipping unreadable baseline {filename}: {e}")
+            continue
+        entries = list(data.get("curves", []))
+        for poly in data.get("polylines", []):
+            entries.extend(pt for pt in poly.get("points", []) if "angle_deg" in pt)
+        for entry in entries:
+            chainage = round(float(entry.get("chainage_m", 0.0)), 3)
+            curves[chainage] = (chainage, float(entry.get("angle_deg", 5.0)), bool(entry.get("inner_curve", False)))
+    return [curves[ch] for ch in sorted(curves)]
+
+
+def curves_from_labels(curve_labels):
+    """Convert the viewer's curve_labels entries into [(chainage_m, angle_deg, left_turn)]"""
+    return sorted((float(item['chainage']), float(item['config']['angle']), bool(item['config']['inner_curve']))
+                  for item in curve_labels)
+
+
+def alignment_vertices(start_point, end_point, total_length, curves=()):
+    """Plan (XY) polyline of the road centre line.
+    The line leaves start_point towards end_point and turns by each curve angle at its chainage
+    (left for inner curves), the same way the 3D baseline planes are laid out.
+    """
+    start = np.asarray(start_point, dtype=np.float64)[:2]
+    direction = np.asarray(end_point, dtype=np.float64)[:2] - start
+    length = np.linalg.norm(direction)
+    direction = direction / length if length > 0 else np.array([1.0, 0.0])
+    total_length = float(total_length) if total_length else length
+
+    vertices = [start]
+    position = start.copy()
+    travelled = 0.0
+    for chainage, angle_deg, left_turn in curves:
+        if chainage <= travelled or chainage >= total_length:
+            continue
+        position = position + direction * (chainage - travelled)
+        travelled = chainage
+        vertices.append(position)
+        rad = np.deg2rad(angle_deg if left_turn else -angle_deg)
+        c, s = np.cos(rad), np.sin(rad)
+        direction = np.array([c * direction[0] - s * direction[1], s * direction[0] + c * direction[1]])
+    vertices.append(position + direction * (total_length - travelled))
+    return np.array(vertices)
+
+
+def alignment_frames(vertices, chainages):
+    """Plan position (N, 2) and unit left normal (N, 2) of the alignment at each chainage.
+    Chainages before the start / past the end continue along the first / last segment.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)[:, :2]
+    chainages = np.asarray(chainages, dtype=np.float64)
+    seg = np.diff(vertices, axis=0)
+    lengths = np.hypot(seg[:, 0], seg[:, 1])
+    keep = lengths > 0
+    seg, lengths, starts = seg[keep], lengths[keep], vertices[:-1][keep]
+    if len(seg) == 0:
+        return np.repeat(vertices[:1], len(chainages), axis=0), np.tile([0.0, 1.0], (len(chainages), 1))
+    seg_start = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+    i = np.clip(np.searchsorted(seg_start, chainages, side='right') - 1, 0, len(seg) - 1)
+    unit = seg[i] / lengths[i, None]
+    positions = starts[i] + unit * (chainages - seg_start[i])[:, None]
+    normals = np.column_stack([-unit[:, 1], unit[:, 0]])
+    return positions, normals
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS CORRIDOR **
+# =====================================================================================================================================
+class Corridor:
+    """Plan-view band of half_width metres either side of an alignment polyline"""
+    def __init__(self, vertices, half_width):
+        self.vertices = np.asarray(vertices, dtype=np.float64)
+        self.half_width = float(half_width)
+        low = self.vertices.min(axis=0) - self.half_width
+        high = self.vertices.max(axis=0) + self.half_width
+        self.bounds_xy = (low[0], high[0], low[1], high[1])
+
+    @classmethod
+    def from_layer(cls, layer_path, half_width):
+        """Corridor along the zero line (and curves) saved in a layer folder, or None without a zero line"""
+        config = read_zero_line_config(layer_path)
+        if not config or not config.get("zero_line_set", True):
+            return None
+        start = config.get("point1", {}).get("coordinates")
+        end = config.get("point2", {}).get("coordinates")
+        if not start or not end:
+            return None
+        vertices = alignment_vertices(start, end, config.get("total_length_m"), read_layer_curves(layer_path))
+        return cls(vertices, half_width)
+
+    def signature(self):
+        """Stable text identifying the corridor geometry (used in cache keys)"""
+        data = np.round(self.vertices, 3).tobytes() + np.float64(round(self.half_width, 3)).tobytes()
+        return hashlib.sha1(data).hexdigest()
+
+    def intersects_bounds(self, bounds):
+        """True if a world box [xmin, xmax, ymin, ymax, ...] comes within half_width of the alignment"""
+        xmin, xmax, ymin, ymax = bounds[:4]
+        cxmin, cxmax, cymin, cymax = self.bounds_xy
+        if xmax < cxmin or xmin > cxmax or ymax < cymin or ymin > cymax:
+            return False
+        # Nearest point of the box to each segment: sample the segment against the clamped box
+        for a, b in zip(self.vertices[:-1], self.vertices[1:]):
+            t = np.linspace(0.0, 1.0, 64)
+            sx = a[0] + t * (b[0] - a[0])
+            sy = a[1] + t * (b[1] - a[1])
+            dx = sx - np.clip(sx, xmin, xmax)
+            dy = sy - np.clip(sy, ymin, ymax)
+            step = np.hypot(*(b - a)) / 63.0
+            if np.min(np.hypot(dx, dy)) <= self.half_width + step:
+                return True
+        return False
+
+    def contains(self, points, origin=None):
+        """Boolean mask of points (N, >=2) lying inside the corridor.
+        With origin the points are local offsets from it; the alignment is shifted instead of the points.
+        """
+        points = np.asarray(points)
+        vertices = self.vertices
+        xmin, xmax, ymin, ymax = self.bounds_xy
+        if origin is not None:
+            vertices = vertices - np.asarray(origin, dtype=np.float64)[:2]
+            xmin, xmax = xmin - origin[0], xmax - origin[0]
+            ymin, ymax = ymin - origin[1], ymax - origin[1]
+        x = points[:, 0]
+        y = points[:, 1]
+        mask = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return mask
+
+        # Squared distance to the nearest segment, only for points inside the bounding box
+        px = x[candidates].astype(np.float64)
+        py = y[candidates].astype(np.float64)
+        best = np.full(len(candidates), np.inf)
+        for a, b in zip(vertices[:-1], vertices[1:]):
+            seg = b - a
+            seg_len2 = seg @ seg
+            t = ((px - a[0]) * seg[0] + (py - a[1]) * seg[1]) / seg_len2 if seg_len2 > 0 else np.zeros_like(px)
+            np.clip(t, 0.0, 1.0, out=t)
+            dx = px - (a[0] + t * seg[0])
+            dy = py - (a[1] + t * seg[1])
+            np.minimum(best, dx * dx + dy * dy, out=best)
+        mask[candidates] = best <= self.half_width ** 2
+        return mask
@@ -2,7 +2,7 @@
 import os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QWidget, QGroupBox, 
-    QFrame, QPushButton, QSizePolicy, QTextEdit, QCheckBox, QScrollArea, QSlider
+    QFrame, QPushButton, QSizePolicy, QTextEdit, QCheckBox, QScrollArea, QSlider, QDoubleSpinBox
 
 )
 from PyQt5.QtCore import Qt, QByteArray, QSize, QRectF, QTimer, QPoint
@@ -866,6 +866,33 @@ class ApplicationUI(QMainWindow):
             }
         """)
         # self.volume_slider.valueChanged.connect(self.volume_changed)
+
+        # Section window: draw only the points around the slider chainage
+        section_window_layout = QHBoxLayout()
+        section_window_layout.setContentsMargins(16, 2, 16, 0)
+        self.section_window_checkbox = QCheckBox("Section window")
+        self.section_window_checkbox.setToolTip("Show only the points within ± the given distance of the slider chainage")
+        self.section_window_spin = QDoubleSpinBox()
+        self.section_window_spin.setRange(1.0, 500.0)
+        self.section_window_spin.setValue(25.0)
+        self.section_window_spin.setSingleStep(5.0)
+        self.section_window_spin.setPrefix("± ")
+        self.section_window_spin.setSuffix(" m")
+        self.section_context_checkbox = QCheckBox("Context")
+        self.section_context_checkbox.setToolTip("Also draw a thinned-out copy of the whole cloud")
+        self.section_context_checkbox.setChecked(True)
+        section_window_layout.addWidget(self.section_window_checkbox)
+        section_window_layout.addWidget(self.section_window_spin)
+        section_window_layout.addWidget(self.section_context_checkbox)
+        section_window_layout.addStretch()
+        self.cross_sections_button = QPushButton("Cross Sections")
+        self.cross_sections_button.setToolTip("Ground cross sections at every chainage interval with the design baselines")
+        section_window_layout.addWidget(self.cross_sections_button)
+        self.deviation_button = QPushButton("Deviation")
+        self.deviation_button.setCheckable(True)
+        self.deviation_button.setToolTip("Colour the point cloud by its vertical distance to the design road surface / construction")
+        section_window_layout.addWidget(self.deviation_button)
+        scale_layout.addLayout(section_window_layout)
         scale_layout.addWidget(self.volume_slider)
 
         # Scale figure
@@ -1195,6 +1222,28 @@ class ApplicationUI(QMainWindow):
             }
         """))
 
+        # Extract the surface line from the point cloud along the zero line
+        self.surface_auto_button = QPushButton("Auto")
+        self.surface_auto_button.setFixedSize(44, 30)
+        self.surface_auto_button.setToolTip("Extract the surface line from the point cloud along the zero line")
+        self.surface_auto_button.setCursor(Qt.PointingHandCursor)
+        self.surface_auto_button.setStyleSheet("""
+            QPushButton {
+                background-color: #28a745;
+                color: white;
+                font-weight: bold;
+                border: none;
+                border-radius: 3px;
+            }
+            QPushButton:hover {
+                background-color: #218838;
+            }
+            QPushButton:pressed {
+                background-color: #1e7e34;
+            }
+        """)
+        self.surface_container.layout().insertWidget(2, self.surface_auto_button)
+
         line_layout.addWidget(self.surface_container)
 
         # Construction Line
@@ -1836,18 +1885,33 @@ class ApplicationUI(QMainWindow):
             }
         """)
         self.percentage_label.setAlignment(Qt.AlignCenter)
+        # Cancel button (only shown for background loads)
+        self.progress_cancel_button = QPushButton("Cancel")
+        self.progress_cancel_button.setStyleSheet("""
+            QPushButton {
+                font-size: 14px;
+                color: white;
+                background-color: #555;
+                border: 1px solid #777;
+                border-radius: 6px;
+                padding: 4px 16px;
+            }
+            QPushButton:hover { background-color: #6E6E6E; }
+        """)
+        self.progress_cancel_button.setVisible(False)
         # Add widgets to layout
         layout.addWidget(self.loading_label)
         layout.addWidget(file_info_container)
         layout.addWidget(self.progress)
         layout.addWidget(self.percentage_label)
+        layout.addWidget(self.progress_cancel_button, 0, Qt.AlignCenter)
         # Center the progress bar on screen but shifted slightly to the right
         screen_geometry = QApplication.desktop().screenGeometry()
         x = (screen_geometry.width() - self.progress_bar.width()) // 2 + 150 # Shift 100 pixels right
         y = (screen_geometry.height() - self.progress_bar.height()) // 2
         self.progress_bar.move(x, y)
 
-    def show_progress_bar(self, file_path=None):
+    def show_progress_bar(self, file_path=None, cancellable=False):
         """Show and position the progress bar"""
         if file_path:
             file_name = os.path.basename(file_path)
@@ -1866,19 +1930,22 @@ class ApplicationUI(QMainWindow):
                 self.file_size_label.setText("Size: Unknown")
         self.progress.setValue(0)
         self.percentage_label.setText("0%")
+        self.progress_cancel_button.setVisible(cancellable)
         self.progress_bar.show()
         QApplication.processEvents() # Force UI update
 
-    def update_progress(self, value, message=None):
+    def update_progress(self, value, message=None, process_events=True):
         """Update progress bar value and optionally the message"""
         self.progress.setValue(value)
         self.percentage_label.setText(f"{value}%")
         if message:
             self.loading_label.setText(message)
-        QApplication.processEvents() # Ensure UI updates
+        if process_events:
+            QApplication.processEvents() # Ensure UI updates
 
     def hide_progress_bar(self):
         """Hide the progress bar with a smooth fade-out"""
+        self.progress_cancel_button.setVisible(False)
         self.progress_bar.hide()
         self.progress.setValue(0)
         self.percentage_label.setText("0%")
@@ -2122,14 +2189,21 @@ class ApplicationUI(QMainWindow):
             self.message_text.append(f"Auto-fit error: {str(e)}")
 
 # =============================================================================
-    def add_layer_to_panel(self, layer_name: str, dimension: str):
+    def add_layer_to_panel(self, layer_name: str, dimension: str, on_toggled=None, checked=True):
         """
         Adds a layer label to the correct panel (3D or 2D Layers).
         Used for both worksheet initial layers and design layers.
+        With on_toggled the entry is a checkbox that shows / hides the layer.
+        Returns the label / checkbox widget.
         """
-        label = QLabel(f"• {layer_name}")
+        if on_toggled is not None:
+            label = QCheckBox(layer_name)
+            label.setChecked(checked)
+            label.toggled.connect(on_toggled)
+        else:
+            label = QLabel(f"• {layer_name}")
         label.setStyleSheet("""
-            QLabel {
+            QLabel, QCheckBox {
                 padding: 8px 12px;
                 background-color: rgba(255, 255, 255, 0.9);
                 border-radius: 8px;
@@ -2138,7 +2212,7 @@ class ApplicationUI(QMainWindow):
                 color: #0D47A1;
                 border-left: 4px solid #1976D2;
             }
-            QLabel:hover {
+            QLabel:hover, QCheckBox:hover {
                 background-color: #BBDEFB;
             }
         """)
@@ -2150,6 +2224,7 @@ class ApplicationUI(QMainWindow):
         elif dimension == "2D":
             if self.two_D_layers_layout:
                 self.two_D_layers_layout.insertWidget(self.two_D_layers_layout.count() - 1, label)
+        return label
 
 
 
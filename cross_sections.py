@@ -0,0 +1,202 @@
+# cross_sections.py
+import os
+import json
+import glob
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+SECTION_CACHE_DIR_NAME = ".cross_sections"
+CROSS_SECTION_VERSION = 1
+DEFAULT_SECTION_SLAB = 0.5          # points within ± this many metres (along the alignment) of a station
+DEFAULT_SECTION_REACH = 30.0        # sections extend this far either side of the zero line
+DEFAULT_OFFSET_BIN = 0.25           # metres of offset per profile point
+DEFAULT_SECTION_PERCENTILE = 10.0   # low percentile of each offset bin: ground below vegetation
+SECTION_CHUNK_STATIONS = 64         # stations per parallel work item
+SECTION_WORKERS = max(1, min(8, (os.cpu_count() or 2)))
+
+
+def section_stations(length, interval):
+    """Chainages 0, interval, 2*interval ... up to the end of the alignment (always included)"""
+    if length <= 0 or not interval or interval <= 0:
+        return np.zeros(1)
+    stations = np.arange(0.0, length, float(interval))
+    if length - stations[-1] > 1e-6:
+        stations = np.append(stations, float(length))
+    return stations
+
+
+def binned_low_profile(offsets, z, reach, bin_width, percentile):
+    """(offset centres, elevations) of the non-empty offset bins: a low percentile of z per bin.
+    One lexsort groups the points by bin with z ascending, so every percentile is a single lookup.
+    """
+    bins = np.floor((offsets + reach) / bin_width).astype(np.int64)
+    order = np.lexsort((z, bins))
+    bins = bins[order]
+    z = z[order]
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    counts = np.diff(np.r_[starts, len(bins)])
+    picks = starts + np.floor((counts - 1) * (percentile / 100.0)).astype(np.int64)
+    centres = (bins[starts] + 0.5) * bin_width - reach
+    return centres, z[picks]
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS CROSSSECTIONSET **
+# =====================================================================================================================================
+class CrossSectionSet:
+    """Ground cross sections (offset, elevation relative to the zero line start) at a list of stations.
+
+    All profiles are stored end to end in two flat arrays; section i is offsets[starts[i]:starts[i+1]]
+    (views, so browsing never copies). Saved per worksheet as .npy files with a signature of the
+    cloud, alignment and section parameters.
+    """
+    def __init__(self, stations, starts, offsets, elevations, signature=None):
+        self.stations = stations            # (K,) chainages
+        self.starts = starts                # (K+1,) start of each section in offsets / elevations
+        self.offsets = offsets              # (M,) metres from the zero line, positive to the left
+        self.elevations = elevations        # (M,) metres relative to the zero line start elevation
+        self.signature = signature
+
+    def __len__(self):
+        return len(self.stations)
+
+    def section(self, i):
+        """(offsets, elevations) of station i"""
+        lo, hi = self.starts[i], self.starts[i + 1]
+        return self.offsets[lo:hi], self.elevations[lo:hi]
+
+    def nearest(self, chainage):
+        """Index of the station closest to a chainage"""
+        i = int(np.searchsorted(self.stations, chainage))
+        if i > 0 and (i == len(self.stations) or chainage - self.stations[i - 1] <= self.stations[i] - chainage):
+            i -= 1
+        return i
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def compute(cls, station_index, stations, reference_z, slab=DEFAULT_SECTION_SLAB, reach=DEFAULT_SECTION_REACH,
+                bin_width=DEFAULT_OFFSET_BIN, percentile=DEFAULT_SECTION_PERCENTILE, signature=None,
+                progress=None, is_cancelled=None):
+        """Cross sections of a StationIndex at every station.
+
+        The station slabs are located with one binary search over the chainage-sorted index, then
+        chunks of stations are profiled in parallel (numpy releases the GIL in the sorts/gathers).
+        """
+        store = station_index.store
+        stations = np.asarray(stations, dtype=np.float64)
+        los = np.searchsorted(station_index.chainage, stations - slab, side='left')
+        his = np.searchsorted(station_index.chainage, stations + slab, side='right')
+        z_shift = float(store.origin[2] - reference_z)
+
+        def profile_chunk(first, last):
+            results = []
+            for lo, hi in zip(los[first:last], his[first:last]):
+                offset = np.asarray(station_index.offset[lo:hi], dtype=np.float64)
+                near = np.abs(offset) <= reach
+                if not near.any():
+                    results.append((np.empty(0), np.empty(0)))
+                    continue
+                indices = station_index.order[lo:hi][near]
+                z = store.local_points[indices, 2].astype(np.float64) + z_shift
+                results.append(binned_low_profile(offset[near], z, reach, bin_width, percentile))
+            return results
+
+        chunks = [(first, min(first + SECTION_CHUNK_STATIONS, len(stations)))
+                  for first in range(0, len(stations), SECTION_CHUNK_STATIONS)]
+        profiles = []
+        with ThreadPoolExecutor(max_workers=SECTION_WORKERS) as executor:
+            futures = [executor.submit(profile_chunk, first, last) for first, last in chunks]
+            for done, future in enumerate(futures, 1):
+                if is_cancelled and is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                profiles.extend(future.result())
+                if progress:
+                    progress(done * 100 // len(futures))
+
+        counts = np.array([len(p[0]) for p in profiles], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(counts)])
+        offsets = np.concatenate([p[0] for p in profiles]).astype(np.float32) if profiles else np.empty(0, np.float32)
+        elevations = np.concatenate([p[1] for p in profiles]).astype(np.float32) if profiles else np.empty(0, np.float32)
+        return cls(stations, starts, offsets, elevations, signature)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        # meta.json goes last: an interrupted save never pairs old metadata with new arrays
+        meta_path = os.path.join(cache_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        for name in ("stations", "starts", "offsets", "elevations"):
+            path = os.path.join(cache_dir, f"{name}.npy")
+            with open(path + ".tmp", 'wb') as f:
+                np.save(f, getattr(self, name))
+            os.replace(path + ".tmp", path)
+        meta = {"version": CROSS_SECTION_VERSION, "signature": self.signature, "station_count": len(self)}
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    @classmethod
+    def load(cls, cache_dir, signature):
+        """Saved sections, or None if missing or computed for another cloud / alignment / parameters"""
+        meta_path = os.path.join(cache_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("version") != CROSS_SECTION_VERSION or meta.get("signature") != signature:
+                return None
+            arrays = [np.load(os.path.join(cache_dir, f"{name}.npy"))
+                      for name in ("stations", "starts", "offsets", "elevations")]
+        except Exception as e:
+            print(f"Ignoring unreadable cross sections in {cache_dir}: {e}")
+            return None
+        return cls(*arrays, signature)
+
+
+def section_signature(index_signature, stations, slab, reach, bin_width, percentile):
+    """Cache key of a CrossSectionSet: the station index it came from plus every parameter"""
+    stations = np.asarray(stations, dtype=np.float64)
+    params = f"{len(stations)}|{stations[0]:.3f}|{stations[-1]:.3f}|{slab:.3f}|{reach:.3f}|{bin_width:.3f}|{percentile:.2f}"
+    return f"{index_signature}|{params}"
+
+
+def load_design_baselines(layer_folder):
+    """{key: {'color', 'width', 'polylines': [(N, 2) chainage / relative elevation arrays]}} from *_baseline.json"""
+    baselines = {}
+    if not layer_folder:
+        return baselines
+    for path in sorted(glob.glob(os.path.join(layer_folder, "*_baseline.json"))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Could not read {path}: {e}")
+            continue
+        key = data.get("baseline_key") or os.path.basename(path)[:-len("_baseline.json")]
+        polylines = []
+        for poly in data.get("polylines", []):
+            points = [(pt.get("chainage_m", 0.0), pt.get("relative_elevation_m", 0.0)) for pt in poly.get("points", [])]
+            if len(points) >= 2:
+                points = np.array(points, dtype=np.float64)
+                polylines.append(points[np.argsort(points[:, 0], kind='stable')])
+        if polylines:
+            baselines[key] = {"color": data.get("color", "black"), "width": float(data.get("width_meters", 0.0)),
+                              "polylines": polylines}
+    return baselines
+
+
+def design_section(baseline, chainage):
+    """(offsets, elevations) of a baseline across a station: a level line over its width, or None
+    where the baseline does not cover the chainage (or has no width)
+    """
+    half = baseline["width"] / 2.0
+    if half <= 0:
+        return None
+    for poly in baseline["polylines"]:
+        if poly[0, 0] <= chainage <= poly[-1, 0]:
+            z = float(np.interp(chainage, poly[:, 0], poly[:, 1]))
+            return np.array([-half, half]), np.array([z, z])
+    return None
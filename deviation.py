@@ -0,0 +1,140 @@
+# deviation.py
+import os
+import json
+import hashlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from earthwork import baseline_profile, design_elevation
+
+DEVIATION_CACHE_DIR_NAME = ".deviation"
+DEVIATION_VERSION = 1
+DEVIATION_CHUNK = 2_000_000         # chainage-sorted points per work item
+DEVIATION_WORKERS = max(1, min(8, (os.cpu_count() or 2)))
+DEFAULT_DEVIATION_RANGE = 0.10      # metres: the colour scale saturates at ± this
+DEVIATION_BASELINES = ("road_surface", "construction")
+
+
+# =====================================================================================================================================
+#                                                      ** CLASS DEVIATIONFIELD **
+# =====================================================================================================================================
+class DeviationField:
+    """Signed vertical distance of every cloud point to a design surface (point Z minus design Z, metres).
+
+    values[i] belongs to point i of the store; NaN outside the design's swept width or where no
+    baseline polyline covers the chainage. Saved as deviation.npy (memory-mapped when loaded) plus
+    meta.json; signature ties it to one cloud, alignment and design baseline.
+    """
+    def __init__(self, values, signature=None, baseline_key=None):
+        self.values = values                # (N,) float32
+        self.signature = signature
+        self.baseline_key = baseline_key
+
+    def __len__(self):
+        return len(self.values)
+
+    def summary(self):
+        """Point count, mean, RMS and extremes of the deviations inside the corridor"""
+        inside = self.values[~np.isnan(self.values)].astype(np.float64)
+        if len(inside) == 0:
+            return {"count": 0}
+        return {"count": int(len(inside)), "mean": float(inside.mean()), "rms": float(np.sqrt(np.mean(inside ** 2))),
+                "min": float(inside.min()), "max": float(inside.max())}
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def compute(cls, station_index, baseline_data, reference_z, width, signature=None, baseline_key=None,
+                out_dir=None, progress=None, is_cancelled=None):
+        """Deviation of a StationIndex's cloud from a *_baseline.json design swept at width metres.
+
+        Only the chainage window the baseline covers is visited; chunks of the chainage-sorted index
+        are evaluated in parallel (one interpolation per polyline and one gather per chunk) and
+        scattered into the output, which is a memory-mapped .npy in out_dir when given.
+        """
+        store = station_index.store
+        profile = baseline_profile(baseline_data)
+        half = float(width) / 2.0
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+            values = np.lib.format.open_memmap(os.path.join(out_dir, "deviation.npy.tmp"), mode='w+',
+                                               dtype=np.float32, shape=(len(store),))
+        else:
+            values = np.empty(len(store), dtype=np.float32)
+        values[:] = np.nan
+        if profile and half > 0:
+            window = station_index.window(min(ch[0] for ch, _ in profile), max(ch[-1] for ch, _ in profile))
+            z_shift = float(store.origin[2])
+
+            def chunk_deviation(lo, hi):
+                offset = station_index.offset[lo:hi]
+                near = np.abs(offset) <= half
+                chainage = np.asarray(station_index.chainage[lo:hi][near], dtype=np.float64)
+                indices = station_index.order[lo:hi][near]
+                deviation = store.local_points[indices, 2].astype(np.float64) + z_shift
+                deviation -= design_elevation(profile, chainage, reference_z)
+                values[indices] = deviation     # chunks hold disjoint points
+                return len(indices)
+
+            chunks = [(lo, min(lo + DEVIATION_CHUNK, window.stop)) for lo in range(window.start, window.stop, DEVIATION_CHUNK)]
+            with ThreadPoolExecutor(max_workers=DEVIATION_WORKERS) as executor:
+                futures = [executor.submit(chunk_deviation, lo, hi) for lo, hi in chunks]
+                for done, future in enumerate(futures, 1):
+                    if is_cancelled and is_cancelled():
+                        for pending in futures:
+                            pending.cancel()
+                        return None
+                    future.result()
+                    if progress:
+                        progress(done * 100 // len(futures))
+        field = cls(values, signature, baseline_key)
+        if out_dir:
+            values.flush()
+            field.values = None
+            del values
+            field._save_meta(out_dir)
+            return cls.load(out_dir, signature)
+        return field
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _save_meta(self, out_dir):
+        """Move the written values into place and write meta.json last (an interrupted run leaves no meta)"""
+        meta_path = os.path.join(out_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        values_path = os.path.join(out_dir, "deviation.npy")
+        os.replace(values_path + ".tmp", values_path)
+        meta = {"version": DEVIATION_VERSION, "signature": self.signature, "baseline_key": self.baseline_key,
+                "nodata": "NaN", "sign": "point minus design"}
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    def save(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, "deviation.npy.tmp"), 'wb') as f:
+            np.save(f, np.asarray(self.values, dtype=np.float32))
+        self._save_meta(out_dir)
+
+    @classmethod
+    def load(cls, out_dir, signature=None):
+        """Memory-map saved deviations, or None if missing or computed for another cloud / design"""
+        meta_path = os.path.join(out_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("version") != DEVIATION_VERSION or (signature is not None and meta.get("signature") != signature):
+                return None
+            values = np.load(os.path.join(out_dir, "deviation.npy"), mmap_mode='r')
+        except Exception as e:
+            print(f"Ignoring unreadable deviations in {out_dir}: {e}")
+            return None
+        return cls(values, meta.get("signature"), meta.get("baseline_key"))
+
+
+def deviation_signature(index_signature, baseline_data, reference_z, width):
+    """Cache key of a DeviationField: the station index plus the design polylines, reference level and width"""
+    design = [[(pt.get("chainage_m"), pt.get("relative_elevation_m")) for pt in poly.get("points", [])]
+              for poly in (baseline_data or {}).get("polylines", [])]
+    text = json.dumps([design, round(float(reference_z), 4), round(float(width), 4)])
+    return f"{index_signature}|{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
@@ -2,8 +2,10 @@ import numpy as np
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QGridLayout, QGroupBox, QCheckBox, 
     QTextEdit, QComboBox, QDoubleSpinBox, QRadioButton, QButtonGroup, QWidget, QFileDialog, QInputDialog, QMessageBox,
-    QScrollArea, QMenu, QAction, QListWidget, QMainWindow
+    QScrollArea, QMenu, QAction, QListWidget, QMainWindow, QSlider
 )
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 
 from vtkmodules.vtkRenderingCore import vtkActor, vtkPolyDataMapper
 from vtkmodules.vtkFiltersSources import vtkPlaneSource
@@ -16,6 +18,9 @@ import json
 from datetime import datetime
 import glob
 
+from point_cloud_readers import point_cloud_file_summary
+from cross_sections import design_section
+
 # ===========================================================================================================================
 # ** ZERO LINE DIALOG **
 # ===========================================================================================================================
@@ -1778,7 +1783,7 @@ class ConstructionNewDialog(QDialog):
                     self.parent.renderer.AddActor(actor)
                     self.parent.construction_base_actors.append(actor)
 
-            self.parent.vtk_widget.GetRenderWindow().Render()
+            self.parent.request_render()
             self.parent.message_text.append(f"Base plane created from first selected baseline (width: {width:.2f}m)")
 
         self.accept()
@@ -2221,8 +2226,48 @@ class ExistingWorksheetDialog(QDialog):
         self.layer_list.itemDoubleClicked.connect(self.final_open)  # Double-click to open
         layout.addWidget(QLabel("Select a layer folder:"))
         layout.addWidget(self.layer_list)
+
+        # Corridor load of Road / Bridge worksheets (corridor_buffer_m in worksheet_config.txt)
+        self.corridor_group = QGroupBox("Point cloud load")
+        corridor_layout = QHBoxLayout(self.corridor_group)
+        self.corridor_mode_combo = QComboBox()
+        self.corridor_mode_combo.addItems(["Ask on load", "Full point cloud", "Corridor around zero line"])
+        self.corridor_width_spin = QDoubleSpinBox()
+        self.corridor_width_spin.setRange(1.0, 1000.0)
+        self.corridor_width_spin.setDecimals(1)
+        self.corridor_width_spin.setSuffix(" m")
+        self.corridor_width_spin.setValue(30.0)
+        self.corridor_mode_combo.currentIndexChanged.connect(
+            lambda index: self.corridor_width_spin.setEnabled(index == 2))
+        corridor_layout.addWidget(self.corridor_mode_combo, 1)
+        corridor_layout.addWidget(QLabel("±"))
+        corridor_layout.addWidget(self.corridor_width_spin)
+        layout.addWidget(self.corridor_group)
         return widget
 
+    def show_corridor_setting(self, data):
+        """Show the saved corridor width of a 2D Road / Bridge worksheet (hidden for other worksheets)"""
+        applies = data.get("dimension") == "2D" and data.get("worksheet_category") in ("Road", "Bridge")
+        self.corridor_group.setVisible(applies)
+        buffer_m = data.get("corridor_buffer_m")
+        if buffer_m is None:
+            self.corridor_mode_combo.setCurrentIndex(0)
+        elif float(buffer_m) <= 0:
+            self.corridor_mode_combo.setCurrentIndex(1)
+        else:
+            self.corridor_width_spin.setValue(float(buffer_m))
+            self.corridor_mode_combo.setCurrentIndex(2)
+        self.corridor_width_spin.setEnabled(self.corridor_mode_combo.currentIndex() == 2)
+
+    def corridor_buffer(self):
+        """corridor_buffer_m chosen in the dialog: None = ask on load, 0.0 = full cloud, else the width"""
+        mode = self.corridor_mode_combo.currentIndex()
+        if mode == 0:
+            return None
+        if mode == 1:
+            return 0.0
+        return float(self.corridor_width_spin.value())
+
     # ------------------------------------------------------------------
     # Navigation: Next button logic
     # ------------------------------------------------------------------
@@ -2238,6 +2283,7 @@ class ExistingWorksheetDialog(QDialog):
                 if radio is selected_radio:
                     self.selected_worksheet_data = data
                     self.selected_worksheet_folder = os.path.join(self.base_dir, folder_name)
+                    self.show_corridor_setting(data)
                     worksheet_name = data.get("worksheet_name", folder_name)
 
                     # Find actual subfolders that exist
@@ -2358,13 +2404,16 @@ class ExistingWorksheetDialog(QDialog):
             self.selected_layer_name
         )
 
-        return {
+        selected = {
             "worksheet_data": self.selected_worksheet_data,
             "worksheet_name": self.selected_worksheet_data.get("worksheet_name"),
             "subfolder_type": self.selected_subfolder_type,
             "layer_name": self.selected_layer_name,
             "full_layer_path": full_path
         }
+        if self.corridor_group.isVisibleTo(self):
+            selected["corridor_buffer_m"] = self.corridor_buffer()
+        return selected
 
 
 # =================================================================================================================================================================
@@ -2584,11 +2633,18 @@ class WorksheetNewDialog(QDialog):
 
         # === Point Cloud Selection ===
         pc_group = QGroupBox("Select Point Cloud File (optional)")
-        pc_layout = QHBoxLayout(pc_group)
+        pc_group_layout = QVBoxLayout(pc_group)
+        pc_layout = QHBoxLayout()
         self.pc_combo = QComboBox()
         self.pc_combo.addItem("No file selected")
         pc_layout.addWidget(QLabel("File:"))
         pc_layout.addWidget(self.pc_combo, 1)
+        pc_group_layout.addLayout(pc_layout)
+        # Size / point count read from the file header only (instant even for huge LAS files)
+        self.pc_info_label = QLabel("")
+        self.pc_info_label.setWordWrap(True)
+        pc_group_layout.addWidget(self.pc_info_label)
+        self.pc_combo.currentIndexChanged.connect(self.on_point_cloud_selected)
         layout.addWidget(pc_group)
 
         # Connect dimension change
@@ -2667,6 +2723,13 @@ class WorksheetNewDialog(QDialog):
             self.pc_combo.addItem(f"Error reading config: {e}")
             self.pc_combo.setEnabled(False)
 
+    def on_point_cloud_selected(self, index):
+        file_path = self.pc_combo.itemData(index)
+        if not file_path or not os.path.exists(file_path):
+            self.pc_info_label.setText("")
+            return
+        self.pc_info_label.setText(point_cloud_file_summary(file_path))
+
     def load_projects_from_folders(self):
         import glob
         BASE_DIR = r"E:\3D_Tool\projects"
@@ -2863,6 +2926,124 @@ class RoadPlaneWidthDialog(QDialog):
             return None  # This should never happen due to validator
 
 
+# ===========================================================================================================================
+# ** GROUND PROFILE DIALOG **  Surface line extracted from the 3D Point Cloud Data along the zero line
+# ===========================================================================================================================
+class GroundProfileDialog(QDialog):
+    """Parameters for extracting the surface line from the point cloud along the zero line"""
+    def __init__(self, interval=1.0, band=2.0, percentile=10.0, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Extract Ground Profile")
+        self.setModal(True)
+        self.setFixedSize(420, 260)
+
+        self.setStyleSheet("""
+            QDialog {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                            stop:0 #f0e6fa, stop:1 #e6e6fa);
+                border-radius: 15px;
+            }
+            QLabel {
+                color: #2d1b3d;
+                font-weight: bold;
+                font-size: 13px;
+            }
+            QDoubleSpinBox {
+                border: 2px solid #BA68C8;
+                border-radius: 8px;
+                padding: 6px;
+                font-size: 14px;
+                background-color: white;
+            }
+            QDoubleSpinBox:focus {
+                border: 2px solid #9C27B0;
+            }
+            QPushButton {
+                border-radius: 20px;
+                padding: 10px;
+                font-weight: bold;
+                min-width: 100px;
+                border: none;
+            }
+            QPushButton#okBtn {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #AB47BC, stop:1 #8E24AA);
+                color: white;
+            }
+            QPushButton#okBtn:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #9C27B0, stop:1 #7B1FA2);
+            }
+            QPushButton#cancelBtn {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #E1BEE7, stop:1 #CE93D8);
+                color: #333;
+            }
+            QPushButton#cancelBtn:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #CE93D8, stop:1 #BA68C8);
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(25, 20, 25, 20)
+        layout.setSpacing(12)
+
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(15)
+
+        # Chainage step between profile points
+        self.interval_spin = QDoubleSpinBox()
+        self.interval_spin.setRange(0.1, 100.0)
+        self.interval_spin.setDecimals(2)
+        self.interval_spin.setSuffix(" m")
+        self.interval_spin.setValue(interval)
+        grid.addWidget(QLabel("Interval:"), 0, 0)
+        grid.addWidget(self.interval_spin, 0, 1)
+
+        # Only points this close to the zero line (in plan) are used
+        self.band_spin = QDoubleSpinBox()
+        self.band_spin.setRange(0.1, 100.0)
+        self.band_spin.setDecimals(2)
+        self.band_spin.setPrefix("± ")
+        self.band_spin.setSuffix(" m")
+        self.band_spin.setValue(band)
+        grid.addWidget(QLabel("Band half-width:"), 1, 0)
+        grid.addWidget(self.band_spin, 1, 1)
+
+        # Low percentile of each bin's elevations (after outlier rejection)
+        self.percentile_spin = QDoubleSpinBox()
+        self.percentile_spin.setRange(0.0, 50.0)
+        self.percentile_spin.setDecimals(1)
+        self.percentile_spin.setSuffix(" %")
+        self.percentile_spin.setValue(percentile)
+        grid.addWidget(QLabel("Ground percentile:"), 2, 0)
+        grid.addWidget(self.percentile_spin, 2, 1)
+
+        layout.addLayout(grid)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setObjectName("cancelBtn")
+        cancel_btn.clicked.connect(self.reject)
+
+        ok_btn = QPushButton("Extract")
+        ok_btn.setObjectName("okBtn")
+        ok_btn.clicked.connect(self.accept)
+
+        btn_layout.addWidget(cancel_btn)
+        btn_layout.addWidget(ok_btn)
+
+        layout.addLayout(btn_layout)
+
+    def get_values(self):
+        """(interval, band, percentile)"""
+        return self.interval_spin.value(), self.band_spin.value(), self.percentile_spin.value()
+
+
 # =======================================================================================================================================
 # ADD THIS NEW DIALOG CLASS TO dialogs.py (or inline if preferred)
 # =======================================================================================================================================
@@ -3506,4 +3687,82 @@ class NewMaterialLineDialog(QDialog):
         self.accept()
 
     def get_material_data(self):
-        return getattr(self, 'result_data', None)
\ No newline at end of file
+        return getattr(self, 'result_data', None)
+
+
+# ======================================================================================================================================================================
+# ** CROSS SECTION DIALOG **  Browse the ground cross sections at every chainage interval with the design baselines
+# ======================================================================================================================================================================
+class CrossSectionDialog(QDialog):
+    """Non-modal browser over a CrossSectionSet. Only the line data changes between stations."""
+    def __init__(self, sections, baselines=None, format_chainage=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Cross Sections")
+        self.setModal(False)
+        self.resize(900, 500)
+        self.sections = sections
+        self.baselines = baselines or {}
+        self.format_chainage = format_chainage or (lambda x: f"{x:.2f}m")
+        self.current = 0
+
+        layout = QVBoxLayout(self)
+        self.figure = Figure(dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel("Offset from zero line (m, left +)")
+        self.ax.set_ylabel("Elevation relative to zero line start (m)")
+        self.ax.grid(True, linestyle='--', alpha=0.4)
+        self.ax.axvline(0.0, color='purple', linewidth=1, linestyle=':')
+        self.ground_line, = self.ax.plot([], [], color='saddlebrown', linewidth=1.5, label='Ground (point cloud)')
+        self.design_lines = {}
+        for key, baseline in self.baselines.items():
+            self.design_lines[key], = self.ax.plot([], [], color=baseline['color'], linewidth=2,
+                                                   label=key.replace('_', ' ').title())
+        self.ax.legend(loc='upper right', fontsize=8)
+        layout.addWidget(self.canvas, 1)
+
+        nav_layout = QHBoxLayout()
+        self.prev_button = QPushButton("◀")
+        self.prev_button.setFixedWidth(40)
+        self.prev_button.clicked.connect(lambda: self.show_station(self.current - 1))
+        self.next_button = QPushButton("▶")
+        self.next_button.setFixedWidth(40)
+        self.next_button.clicked.connect(lambda: self.show_station(self.current + 1))
+        self.station_slider = QSlider(Qt.Horizontal)
+        self.station_slider.setRange(0, max(0, len(sections) - 1))
+        self.station_slider.valueChanged.connect(self.show_station)
+        self.station_label = QLabel()
+        self.station_label.setMinimumWidth(160)
+        nav_layout.addWidget(self.prev_button)
+        nav_layout.addWidget(self.station_slider, 1)
+        nav_layout.addWidget(self.next_button)
+        nav_layout.addWidget(self.station_label)
+        layout.addLayout(nav_layout)
+
+        self.show_station(0, force=True)
+
+    def show_chainage(self, chainage):
+        """Show the station nearest to a chainage (e.g. the main slider position)"""
+        self.show_station(self.sections.nearest(chainage))
+
+    def show_station(self, i, force=False):
+        i = int(min(max(i, 0), len(self.sections) - 1))
+        if i == self.current and not force:
+            return
+        self.current = i
+        if self.station_slider.value() != i:
+            self.station_slider.blockSignals(True)
+            self.station_slider.setValue(i)
+            self.station_slider.blockSignals(False)
+
+        chainage = float(self.sections.stations[i])
+        offsets, elevations = self.sections.section(i)
+        self.ground_line.set_data(offsets, elevations)
+        for key, line in self.design_lines.items():
+            design = design_section(self.baselines[key], chainage)
+            line.set_data(*(design if design is not None else ([], [])))
+        self.station_label.setText(f"Station {i + 1}/{len(self.sections)}  {self.format_chainage(chainage)}")
+        self.ax.set_title(f"Cross section at {self.format_chainage(chainage)}")
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
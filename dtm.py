@@ -0,0 +1,219 @@
+# dtm.py
+import os
+import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+DTM_CACHE_DIR_NAME = ".dtm"
+DTM_VERSION = 1
+DEFAULT_DTM_CELL = 0.5              # metres between grid nodes
+DEFAULT_DTM_STATISTIC = "min"       # "min" (lowest point: ground under vegetation) or "median"
+DEFAULT_MAX_FILL = 10.0             # holes are filled from the nearest node up to this distance (metres)
+DTM_MAX_CELLS = 25_000_000          # the cell size grows if a cloud's extent would need more nodes
+DTM_CHUNK = 4_000_000               # points rasterized per work item
+DTM_WORKERS = max(1, min(8, (os.cpu_count() or 2)))
+
+
+# =====================================================================================================================================
+#                                                           ** CLASS DTMGRID **
+# =====================================================================================================================================
+class DTMGrid:
+    """Regular elevation grid of a cloud's ground, in world coordinates.
+
+    Node (row, col) is at (x0 + col * cell_size, y0 + row * cell_size) and holds a world Z
+    (NaN where there is no ground). Saved as elevations.npy (memory-mapped when loaded) plus
+    meta.json with the georeference; signature ties it to one cloud and build settings.
+    """
+    def __init__(self, elevations, x0, y0, cell_size, signature=None, statistic=DEFAULT_DTM_STATISTIC):
+        self.elevations = elevations        # (rows, cols) float32 world Z
+        self.x0 = float(x0)
+        self.y0 = float(y0)
+        self.cell_size = float(cell_size)
+        self.signature = signature
+        self.statistic = statistic
+
+    @property
+    def shape(self):
+        return self.elevations.shape
+
+    def bounds(self):
+        """World [xmin, xmax, ymin, ymax] covered by the grid nodes"""
+        rows, cols = self.shape
+        return [self.x0, self.x0 + (cols - 1) * self.cell_size, self.y0, self.y0 + (rows - 1) * self.cell_size]
+
+    def elevation_at(self, xs, ys):
+        """Bilinear world Z at world XY (arrays or scalars); NaN outside the grid or next to a hole"""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        rows, cols = self.shape
+        fx = (xs - self.x0) / self.cell_size
+        fy = (ys - self.y0) / self.cell_size
+        inside = (fx >= 0) & (fy >= 0) & (fx <= cols - 1) & (fy <= rows - 1)
+        # Clamp so the last row / column interpolates within the grid
+        c = np.clip(np.floor(fx), 0, max(cols - 2, 0)).astype(np.int64)
+        r = np.clip(np.floor(fy), 0, max(rows - 2, 0)).astype(np.int64)
+        tx = np.clip(fx - c, 0.0, 1.0)
+        ty = np.clip(fy - r, 0.0, 1.0)
+        c1 = np.minimum(c + 1, cols - 1)
+        r1 = np.minimum(r + 1, rows - 1)
+        grid = self.elevations
+        z = ((grid[r, c] * (1 - tx) + grid[r, c1] * tx) * (1 - ty)
+             + (grid[r1, c] * (1 - tx) + grid[r1, c1] * tx) * ty)
+        return np.where(inside, z, np.nan)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def build(cls, store, cell_size=DEFAULT_DTM_CELL, statistic=DEFAULT_DTM_STATISTIC, max_fill=DEFAULT_MAX_FILL,
+              signature=None, out_dir=None, progress=None, is_cancelled=None):
+        """Rasterize a PointStore; with out_dir the grid is written straight into a memory-mapped .npy there.
+
+        "min" reduces each chunk in parallel (sort by node, minimum.reduceat) and merges the partial
+        grids; "median" needs every point of a node together, so it sorts the whole cloud by node once.
+        """
+        if not store.has_points():
+            return None
+        bounds = store.bounds()
+        width, height = bounds[1] - bounds[0], bounds[3] - bounds[2]
+        cell_size = float(cell_size)
+        if (width / cell_size + 1) * (height / cell_size + 1) > DTM_MAX_CELLS:
+            cell_size = float(np.ceil(np.sqrt(width * height / DTM_MAX_CELLS) * 100) / 100)
+            print(f"DTM cell size raised to {cell_size:.2f} m to stay under {DTM_MAX_CELLS:,} nodes")
+        x0 = np.floor(bounds[0] / cell_size) * cell_size
+        y0 = np.floor(bounds[2] / cell_size) * cell_size
+        cols = int(np.round((bounds[1] - x0) / cell_size)) + 1
+        rows = int(np.round((bounds[3] - y0) / cell_size)) + 1
+        # Node lookups in the store's float32 local frame, shifted to the grid corner
+        local_x0 = x0 - store.origin[0]
+        local_y0 = y0 - store.origin[1]
+
+        def node_ids(start, end):
+            chunk = store.local_points[start:end]
+            col = np.clip(np.rint((chunk[:, 0] - local_x0) / cell_size), 0, cols - 1).astype(np.int64)
+            row = np.clip(np.rint((chunk[:, 1] - local_y0) / cell_size), 0, rows - 1).astype(np.int64)
+            return row * cols + col
+
+        def reduce_min(start, end):
+            ids = node_ids(start, end)
+            order = np.argsort(ids, kind='stable')
+            ids = ids[order]
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            return ids[starts], np.minimum.reduceat(store.local_points[start:end, 2][order], starts)
+
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+            grid_path = os.path.join(out_dir, "elevations.npy.tmp")
+            elevations = np.lib.format.open_memmap(grid_path, mode='w+', dtype=np.float32, shape=(rows, cols))
+        else:
+            elevations = np.empty((rows, cols), dtype=np.float32)
+        flat = elevations.reshape(-1)
+        chunks = [(start, min(start + DTM_CHUNK, len(store))) for start in range(0, len(store), DTM_CHUNK)]
+
+        with ThreadPoolExecutor(max_workers=DTM_WORKERS) as executor:
+            if statistic == "median":
+                ids = np.empty(len(store), dtype=np.int64)
+                futures = [(start, end, executor.submit(node_ids, start, end)) for start, end in chunks]
+                for done, (start, end, future) in enumerate(futures, 1):
+                    if is_cancelled and is_cancelled():
+                        return None
+                    ids[start:end] = future.result()
+                    if progress:
+                        progress(done * 50 // len(futures))
+                z = store.local_points[:, 2]
+                order = np.lexsort((z, ids))
+                ids = ids[order]
+                starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+                counts = np.diff(np.r_[starts, len(ids)])
+                # Mean of the two middle values for even counts
+                low = z[order[starts + (counts - 1) // 2]].astype(np.float64)
+                high = z[order[starts + counts // 2]].astype(np.float64)
+                flat[:] = np.nan
+                flat[ids[starts]] = (low + high) / 2.0
+                del ids, order
+            else:
+                flat[:] = np.inf
+                futures = [executor.submit(reduce_min, start, end) for start, end in chunks]
+                for done, future in enumerate(futures, 1):
+                    if is_cancelled and is_cancelled():
+                        for pending in futures:
+                            pending.cancel()
+                        return None
+                    nodes, values = future.result()
+                    flat[nodes] = np.minimum(flat[nodes], values)
+                    if progress:
+                        progress(done * 90 // len(futures))
+                flat[np.isinf(flat)] = np.nan
+        # Local -> world Z
+        flat += np.float32(store.origin[2])
+
+        fill_holes(elevations, max_fill / cell_size)
+        if progress:
+            progress(100)
+        grid = cls(elevations, x0, y0, cell_size, signature, statistic)
+        if out_dir:
+            elevations.flush()
+            grid.elevations = None
+            del elevations, flat
+            grid._save_meta(out_dir)
+            return cls.load(out_dir, signature)
+        return grid
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _save_meta(self, out_dir):
+        """Move the written grid into place and write meta.json last (an interrupted build leaves no meta)"""
+        meta_path = os.path.join(out_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        grid_path = os.path.join(out_dir, "elevations.npy")
+        os.replace(grid_path + ".tmp", grid_path)
+        meta = {"version": DTM_VERSION, "signature": self.signature,
+                "x0": self.x0, "y0": self.y0, "cell_size": self.cell_size, "statistic": self.statistic,
+                "nodata": "NaN", "z": "world"}
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    def save(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, "elevations.npy.tmp"), 'wb') as f:
+            np.save(f, np.asarray(self.elevations, dtype=np.float32))
+        self._save_meta(out_dir)
+
+    @classmethod
+    def load(cls, out_dir, signature=None):
+        """Memory-map a saved grid, or None if missing or built for another cloud / settings"""
+        meta_path = os.path.join(out_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("version") != DTM_VERSION or (signature is not None and meta.get("signature") != signature):
+                return None
+            elevations = np.load(os.path.join(out_dir, "elevations.npy"), mmap_mode='r')
+        except Exception as e:
+            print(f"Ignoring unreadable DTM in {out_dir}: {e}")
+            return None
+        return cls(elevations, meta["x0"], meta["y0"], meta["cell_size"], meta.get("signature"),
+                   meta.get("statistic", DEFAULT_DTM_STATISTIC))
+
+
+def fill_holes(elevations, max_distance_cells):
+    """Give empty (NaN) nodes the value of the nearest filled node within max_distance_cells (in place)"""
+    holes = np.isnan(elevations)
+    if not holes.any() or holes.all() or max_distance_cells <= 0:
+        return
+    if ndimage is None:
+        print("scipy not available: DTM holes are left empty")
+        return
+    distance, (rows, cols) = ndimage.distance_transform_edt(holes, return_indices=True)
+    fill = holes & (distance <= max_distance_cells)
+    elevations[fill] = elevations[rows[fill], cols[fill]]
+
+
+def dtm_signature(cloud_signature, cell_size=DEFAULT_DTM_CELL, statistic=DEFAULT_DTM_STATISTIC, max_fill=DEFAULT_MAX_FILL):
+    """Cache key of a DTM: the source cloud fingerprint plus the build settings"""
+    return f"{cloud_signature}|{cell_size:.3f}|{statistic}|{max_fill:.2f}"
@@ -0,0 +1,162 @@
+# earthwork.py
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from alignment import alignment_frames
+
+EARTHWORK_RESOLUTION = 0.25         # metres between grid samples, along and across the alignment
+EARTHWORK_CHUNK_ROWS = 4096         # cross-section rows per parallel work item
+EARTHWORK_WORKERS = max(1, min(8, (os.cpu_count() or 2)))
+TOL_BALANCED = 0.20                 # terrain within this of the construction level: balanced
+TOL_SURF_ROAD = 0.04                # terrain within this of the road surface: balanced
+MIN_TERRAIN_COVERAGE = 0.5          # segments with less terrain under the road are reported as data_missing
+
+
+def baseline_profile(baseline_data):
+    """[(chainages, relative elevations)] per polyline of a *_baseline.json dict, each sorted by chainage"""
+    profile = []
+    for poly in (baseline_data or {}).get("polylines", []):
+        points = [(pt["chainage_m"], pt["relative_elevation_m"]) for pt in poly.get("points", [])]
+        if len(points) >= 2:
+            points = np.array(points, dtype=np.float64)
+            points = points[np.argsort(points[:, 0], kind='stable')]
+            profile.append((points[:, 0], points[:, 1]))
+    return profile
+
+
+def design_elevation(profile, chainages, ref_z):
+    """Absolute design elevation at chainages, linear along each baseline polyline (NaN where none covers)"""
+    chainages = np.asarray(chainages, dtype=np.float64)
+    z = np.full(len(chainages), np.nan)
+    for profile_ch, profile_z in profile or ():
+        inside = (chainages >= profile_ch[0]) & (chainages <= profile_ch[-1])
+        z[inside] = ref_z + np.interp(chainages[inside], profile_ch, profile_z)
+    return z
+
+
+def segment_volumes(segment_bounds, vertices, terrain_at, road_profile, construction_profile, ref_z,
+                    road_width, construction_width, resolution=EARTHWORK_RESOLUTION, surface_profile=None,
+                    is_cancelled=None):
+    """Cut / fill of the design road and construction levels against the terrain, per chainage segment.
+
+    The corridor is sampled on a grid of resolution x resolution cells (rows across the alignment at
+    every resolution metres of chainage, following its curves). terrain_at(xs, ys) gives world
+    terrain elevations (NaN for no data); without it the surface baseline is used level across
+    the section. Returns a dict of (K,) arrays for the K segments between consecutive bounds.
+    """
+    bounds = np.maximum.accumulate(np.asarray(segment_bounds, dtype=np.float64))   # backward steps: empty segments
+    count = len(bounds) - 1
+    reach = max(road_width, construction_width) / 2.0
+    offsets = np.arange(-reach + resolution / 2.0, reach, resolution)
+    road_band = np.abs(offsets) <= road_width / 2.0
+    construction_band = np.abs(offsets) <= construction_width / 2.0
+    cell_area = resolution * resolution
+    rows = np.arange(bounds[0] + resolution / 2.0, bounds[-1], resolution)
+    row_segment = np.clip(np.searchsorted(bounds, rows, side='right') - 1, 0, max(count - 1, 0))
+
+    def chunk_sums(first, last):
+        chainages = rows[first:last]
+        road_z = design_elevation(road_profile, chainages, ref_z)
+        construction_z = design_elevation(construction_profile, chainages, ref_z)
+        if terrain_at is not None:
+            positions, normals = alignment_frames(vertices, chainages)
+            xs = positions[:, 0, None] + normals[:, 0, None] * offsets
+            ys = positions[:, 1, None] + normals[:, 1, None] * offsets
+            terrain = np.asarray(terrain_at(xs.ravel(), ys.ravel()), dtype=np.float64).reshape(xs.shape)
+        else:
+            surface_z = design_elevation(surface_profile, chainages, ref_z)
+            terrain = np.repeat(surface_z[:, None], len(offsets), axis=1)
+
+        road_terrain = terrain[:, road_band]
+        road_valid = ~np.isnan(road_terrain)
+        road_dz = np.nan_to_num(road_terrain - road_z[:, None])
+        construction_terrain = terrain[:, construction_band]
+        construction_dz = np.nan_to_num(construction_terrain - construction_z[:, None])
+        has_road = ~np.isnan(road_z)
+        return {
+            "cut_road": np.maximum(road_dz, 0).sum(axis=1) * cell_area,
+            "fill_road": np.maximum(-road_dz, 0).sum(axis=1) * cell_area,
+            "cut_construction": np.maximum(construction_dz, 0).sum(axis=1) * cell_area,
+            "terrain_sum": np.where(road_valid, road_terrain, 0.0).sum(axis=1),
+            "terrain_cells": road_valid.sum(axis=1) * has_road,
+            "construction_cells": (~np.isnan(construction_terrain)).sum(axis=1) * ~np.isnan(construction_z),
+            "road_sum": np.nan_to_num(road_z),
+            "road_rows": has_road.astype(np.float64),
+            "construction_sum": np.nan_to_num(construction_z),
+            "construction_rows": (~np.isnan(construction_z)).astype(np.float64),
+        }
+
+    chunks = [(first, min(first + EARTHWORK_CHUNK_ROWS, len(rows))) for first in range(0, len(rows), EARTHWORK_CHUNK_ROWS)]
+    totals = {}
+    with ThreadPoolExecutor(max_workers=EARTHWORK_WORKERS) as executor:
+        futures = [(first, last, executor.submit(chunk_sums, first, last)) for first, last in chunks]
+        for first, last, future in futures:
+            if is_cancelled and is_cancelled():
+                return None
+            for key, values in future.result().items():
+                segment_sum = np.bincount(row_segment[first:last], weights=values, minlength=count)
+                totals[key] = totals.get(key, 0.0) + segment_sum
+
+    zeros = np.zeros(count)
+    segment_rows = np.bincount(row_segment, minlength=count).astype(np.float64)
+    coverage = totals.get("terrain_cells", zeros) / np.maximum(segment_rows * road_band.sum(), 1)
+    construction_coverage = totals.get("construction_cells", zeros) / np.maximum(segment_rows * construction_band.sum(), 1)
+    # Volumes over the cells with terrain, scaled up to the full band (holes in the cloud)
+    scale = np.where(coverage > 0, 1.0 / np.maximum(coverage, 1e-9), 0.0)
+    construction_scale = np.where(construction_coverage > 0, 1.0 / np.maximum(construction_coverage, 1e-9), 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            "cut_road": totals.get("cut_road", zeros) * scale,
+            "fill_road": totals.get("fill_road", zeros) * scale,
+            "cut_construction": totals.get("cut_construction", zeros) * construction_scale,
+            "coverage": coverage,
+            "avg_terrain": totals.get("terrain_sum", zeros) / totals.get("terrain_cells", zeros),
+            "avg_road": totals.get("road_sum", zeros) / totals.get("road_rows", zeros),
+            "avg_construction": totals.get("construction_sum", zeros) / totals.get("construction_rows", zeros),
+        }
+
+
+def earthwork_operations(road_points, volumes, road_width, construction_width):
+    """operation_config.json segments from the road surface baseline points and segment_volumes()"""
+    operations = []
+    for i in range(len(road_points) - 1):
+        p1, p2 = road_points[i], road_points[i + 1]
+        if p2["chainage_m"] - p1["chainage_m"] <= 0:
+            continue
+        segment = {
+            "from_chainage_str": p1["chainage_str"],
+            "to_chainage_str": p2["chainage_str"],
+            "operation_type": "data_missing",
+            "cut_volume_ref_construction_m3": 0.0,
+            "cut_volume_ref_road_surface_m3": 0.0,
+            "digging_volume_m3": 0.0,
+            "width_construction_m": round(construction_width, 1),
+            "width_road_surface_m": round(road_width, 1)
+        }
+        avg_surf = volumes["avg_terrain"][i]
+        avg_road = volumes["avg_road"][i]
+        avg_const = volumes["avg_construction"][i]
+        if volumes["coverage"][i] < MIN_TERRAIN_COVERAGE or np.isnan(avg_surf) or np.isnan(avg_road):
+            operations.append(segment)
+            continue
+
+        height_surf_road = avg_surf - avg_road
+        if not np.isnan(avg_const) and abs(avg_surf - avg_const) <= TOL_BALANCED:
+            operation = "balanced"
+        elif height_surf_road > TOL_SURF_ROAD:
+            operation = "cutting"
+        elif height_surf_road < -TOL_SURF_ROAD:
+            operation = "digging"
+        else:
+            operation = "balanced"
+
+        segment["operation_type"] = operation
+        if operation == "cutting":
+            segment["cut_volume_ref_construction_m3"] = round(float(volumes["cut_construction"][i]), 2)
+            segment["cut_volume_ref_road_surface_m3"] = round(float(volumes["cut_road"][i]), 2)
+        elif operation == "digging":
+            segment["digging_volume_m3"] = round(float(volumes["fill_road"][i]), 2)
+        # balanced → all volumes stay 0.0
+        operations.append(segment)
+    return operations
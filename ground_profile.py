@@ -0,0 +1,64 @@
+# ground_profile.py
+import numpy as np
+
+DEFAULT_PROFILE_INTERVAL = 1.0      # metres of chainage per profile point
+DEFAULT_PROFILE_BAND = 2.0          # points within this plan distance of the zero line are used
+DEFAULT_GROUND_PERCENTILE = 10.0    # low percentile: vegetation / vehicles sit above the ground
+OUTLIER_MAD_FACTOR = 3.5            # points further than this many robust sigmas from the median are dropped
+MIN_BIN_POINTS = 5                  # bins with fewer points leave a gap in the profile
+
+
+def robust_ground_elevation(z, percentile=DEFAULT_GROUND_PERCENTILE, mad_factor=OUTLIER_MAD_FACTOR):
+    """Low percentile of z after rejecting outliers with the median absolute deviation"""
+    median = np.median(z)
+    mad = np.median(np.abs(z - median))
+    if mad > 0:
+        z = z[np.abs(z - median) <= mad_factor * 1.4826 * mad]
+    return float(np.percentile(z, percentile))
+
+
+def extract_ground_profile(station_index, reference_z, start=0.0, end=None, interval=DEFAULT_PROFILE_INTERVAL,
+                           band=DEFAULT_PROFILE_BAND, percentile=DEFAULT_GROUND_PERCENTILE,
+                           min_points=MIN_BIN_POINTS, progress=None, is_cancelled=None):
+    """Ground profile along the zero line from a StationIndex.
+
+    Points within band metres of the alignment are binned by chainage (bins of interval metres,
+    found by binary search in the sorted chainages) and each bin gives one robust ground elevation
+    at its centre. Returns graph polylines [[(chainage, elevation - reference_z), ...], ...]; runs
+    of empty bins split the profile. progress(percent) and is_cancelled() are optional callbacks.
+    """
+    store = station_index.store
+    chainage = station_index.chainage
+    if end is None:
+        end = float(chainage[-1]) if len(chainage) else start
+    count = int(np.ceil((end - start) / interval)) if end > start else 0
+    edges = start + interval * np.arange(count + 1)
+    bounds = np.searchsorted(chainage, edges, side='left')
+    z_shift = float(store.origin[2] - reference_z)
+
+    polylines, current = [], []
+    last_percent = -1
+    for i in range(count):
+        lo, hi = bounds[i], bounds[i + 1]
+        indices = ()
+        if hi - lo >= min_points:
+            indices = station_index.order[lo:hi][np.abs(station_index.offset[lo:hi]) <= band]
+        if len(indices) >= min_points:
+            z = store.local_points[indices, 2].astype(np.float64)
+            centre = min(edges[i] + interval / 2.0, end)
+            current.append((float(centre), robust_ground_elevation(z, percentile) + z_shift))
+        elif current:
+            # Gap: close the running polyline
+            if len(current) > 1:
+                polylines.append(current)
+            current = []
+        percent = (i + 1) * 100 // count
+        if percent != last_percent:
+            last_percent = percent
+            if is_cancelled and is_cancelled():
+                return None
+            if progress:
+                progress(percent)
+    if len(current) > 1:
+        polylines.append(current)
+    return polylines
@@ -0,0 +1,63 @@
+# measurement_geometry.py
+import numpy as np
+
+from utils import find_best_fitting_plane
+
+
+def plane_basis(points):
+    """(centroid, normal, u, v) of the best-fit plane of (N, 3) points; u, v are orthonormal in-plane axes"""
+    centroid, normal = find_best_fitting_plane(np.asarray(points, dtype=np.float64))
+    # Start from the world axis least aligned with the normal so the cross product is well conditioned
+    helper = np.eye(3)[np.argmin(np.abs(normal))]
+    u = np.cross(normal, helper)
+    u /= np.linalg.norm(u)
+    v = np.cross(normal, u)
+    return centroid, normal, u, v
+
+
+def to_plane_coords(points, centroid, u, v):
+    """(N, 2) coordinates of points in the plane through centroid spanned by u, v (orthogonal projection)"""
+    centered = np.asarray(points, dtype=np.float64) - centroid
+    return np.column_stack([centered @ u, centered @ v])
+
+
+def signed_area(coords):
+    """Shoelace area of a closed 2D polygon: positive for counter-clockwise vertex order"""
+    x = coords[:, 0]
+    y = coords[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def side_lengths(coords):
+    """Length of every side i -> i+1 (the last side closes the polygon)"""
+    return np.linalg.norm(np.roll(coords, -1, axis=0) - coords, axis=1)
+
+
+def interior_angles(coords):
+    """Interior angle in degrees at every vertex of a simple 2D polygon, reflex angles (> 180) included"""
+    to_prev = np.roll(coords, 1, axis=0) - coords
+    to_next = np.roll(coords, -1, axis=0) - coords
+    dot = np.einsum('ij,ij->i', to_prev, to_next)
+    cross = to_next[:, 0] * to_prev[:, 1] - to_next[:, 1] * to_prev[:, 0]
+    angles = np.degrees(np.arctan2(np.abs(cross), dot))
+    # A vertex turning against the polygon's orientation is concave
+    orientation = 1.0 if signed_area(coords) >= 0 else -1.0
+    return np.where(cross * orientation < 0, 360.0 - angles, angles)
+
+
+def polygon_metrics(points):
+    """Area, perimeter, side lengths and interior angles of a 3D polygon on its best-fit plane.
+    All O(n) and vectorised; side_lengths[i] is side i -> i+1 and angles[i] is the angle at vertex i.
+    """
+    centroid, normal, u, v = plane_basis(points)
+    coords = to_plane_coords(points, centroid, u, v)
+    sides = side_lengths(coords)
+    return {
+        "area": abs(signed_area(coords)),
+        "perimeter": float(sides.sum()),
+        "side_lengths": sides,
+        "angles": interior_angles(coords),
+        "centroid": centroid,
+        "normal": normal,
+        "coords": coords,
+    }
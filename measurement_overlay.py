@@ -0,0 +1,357 @@
+# measurement_overlay.py
+import numpy as np
+import vtk
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+from vtk_utils import numpy_to_vtk_points, make_vertex_cells, make_line_cells
+
+MARKER_SPHERE_RESOLUTION = 16
+SEGMENT_LINE_WIDTH = 2
+MIN_LABEL_FONT_SIZE = 12
+MAX_LABEL_FONT_SIZE = 28
+
+
+def label_font_size(scale):
+    """Screen font size for a label drawn at the given world text scale by the old followers"""
+    return int(np.clip(round(scale * 36), MIN_LABEL_FONT_SIZE, MAX_LABEL_FONT_SIZE))
+
+
+def _rgb(color):
+    return np.clip(np.rint(np.asarray([color[0], color[1], color[2]], dtype=np.float64) * 255.0), 0, 255)
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS OVERLAYITEM **
+# =====================================================================================================================================
+class OverlayItem:
+    """Handle for one marker, segment or label of a MeasurementOverlay (kept in measurement_actors)"""
+    def __init__(self, kind, points, text=None):
+        self.kind = kind                    # 'marker', 'segment' or 'label'
+        self.points = points                # world coordinates: (3,) or (2, 3) for segments
+        self.text = text
+        self.label = None                   # label item attached to a marker / segment
+        self.layer = None
+        self.slot = -1                      # row in the layer arrays, -1 once removed
+
+    def is_removed(self):
+        return self.slot < 0
+
+
+class _OverlayLayer:
+    """Rows of per-item arrays; removal moves the last row into the freed slot"""
+    def __init__(self, columns):
+        self.columns = columns              # name -> (row shape, dtype)
+        self.arrays = {name: np.zeros((16,) + shape, dtype=dtype) for name, (shape, dtype) in columns.items()}
+        self.visible = np.zeros(16, dtype=bool)
+        self.items = []
+        self.dirty = True
+
+    def __len__(self):
+        return len(self.items)
+
+    def _reserve(self, needed):
+        count, capacity = len(self.items), len(self.visible)
+        if needed <= capacity:
+            return
+        capacity = max(2 * capacity, needed)
+        for name, array in self.arrays.items():
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:count] = array[:count]
+            self.arrays[name] = grown
+        visible = np.zeros(capacity, dtype=bool)
+        visible[:count] = self.visible[:count]
+        self.visible = visible
+
+    def add(self, item, **values):
+        count = len(self.items)
+        self._reserve(count + 1)
+        for name, value in values.items():
+            self.arrays[name][count] = value
+        self.visible[count] = True
+        item.layer, item.slot = self, count
+        self.items.append(item)
+        self.dirty = True
+
+    def extend(self, items, **columns):
+        """Append many items at once; each column holds one row per item"""
+        count = len(self.items)
+        self._reserve(count + len(items))
+        for name, values in columns.items():
+            self.arrays[name][count:count + len(items)] = values
+        self.visible[count:count + len(items)] = True
+        for slot, item in enumerate(items, count):
+            item.layer, item.slot = self, slot
+        self.items.extend(items)
+        self.dirty = True
+
+    def remove(self, item):
+        slot, last = item.slot, len(self.items) - 1
+        if slot != last:
+            moved = self.items[last]
+            for array in self.arrays.values():
+                array[slot] = array[last]
+            self.visible[slot] = self.visible[last]
+            self.items[slot] = moved
+            moved.slot = slot
+        self.items.pop()
+        item.slot = -1
+        self.dirty = True
+
+    def set(self, item, name, value):
+        self.arrays[name][item.slot] = value
+        self.dirty = True
+
+    def set_visible(self, item, visible):
+        self.visible[item.slot] = bool(visible)
+        self.dirty = True
+
+    def shown(self, name):
+        """Column rows of the visible items (a copy handed to VTK)"""
+        count = len(self.items)
+        return self.arrays[name][:count][self.visible[:count]]
+
+    def clear(self):
+        for item in self.items:
+            item.slot = -1
+        self.items = []
+        self.dirty = True
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS MEASUREMENTOVERLAY **
+# =====================================================================================================================================
+class MeasurementOverlay:
+    """Measurement markers, segments and labels drawn with three props in total.
+
+    Markers are sphere glyphs of one vtkGlyph3DMapper, segments are line cells of one polydata and
+    labels are drawn by one vtkLabeledDataMapper. Adding, removing, recolouring or hiding an item
+    only edits rows of NumPy arrays; the VTK inputs are rebuilt once per render from the dirty layers.
+    Coordinates are kept relative to an integer origin so large survey coordinates stay precise.
+    """
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.origin = None
+        self.markers = _OverlayLayer({'center': ((3,), np.float64), 'radius': ((), np.float32),
+                                      'color': ((3,), np.uint8)})
+        self.segments = _OverlayLayer({'ends': ((2, 3), np.float64), 'color': ((3,), np.uint8)})
+        self.labels = _OverlayLayer({'position': ((3,), np.float64), 'style': ((), np.int32)})
+        self.label_styles = {}              # (r, g, b, font size) -> label type id
+        self.label_style_keys = []          # label type id -> (r, g, b, font size)
+
+        sphere = vtk.vtkSphereSource()
+        sphere.SetRadius(1.0)
+        sphere.SetThetaResolution(MARKER_SPHERE_RESOLUTION)
+        sphere.SetPhiResolution(MARKER_SPHERE_RESOLUTION)
+        self.marker_mapper = vtk.vtkGlyph3DMapper()
+        self.marker_mapper.SetSourceConnection(sphere.GetOutputPort())
+        self.marker_mapper.SetScaleArray("radius")
+        self.marker_mapper.SetScaleModeToScaleByMagnitude()
+        self.marker_mapper.SetScalarModeToUsePointFieldData()
+        self.marker_mapper.SelectColorArray("color")
+        self.marker_actor = vtk.vtkActor()
+        self.marker_actor.SetMapper(self.marker_mapper)
+
+        self.segment_mapper = vtk.vtkPolyDataMapper()
+        self.segment_mapper.SetScalarModeToUseCellData()
+        self.segment_actor = vtk.vtkActor()
+        self.segment_actor.SetMapper(self.segment_mapper)
+        self.segment_actor.GetProperty().SetLineWidth(SEGMENT_LINE_WIDTH)
+
+        self.label_mapper = vtk.vtkLabeledDataMapper()
+        self.label_mapper.SetLabelModeToLabelFieldData()
+        self.label_mapper.SetFieldDataName("text")
+        # Per-label colour and size come from the label type array
+        self.label_mapper.SetInputArrayToProcess(0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_POINTS, "style")
+        self.label_transform = vtk.vtkTransform()
+        self.label_mapper.SetTransform(self.label_transform)
+        self.label_actor = vtk.vtkActor2D()
+        self.label_actor.SetMapper(self.label_mapper)
+
+        self._sync()
+        # Rebuild the VTK inputs at most once per frame, however many items changed
+        renderer.AddObserver("StartEvent", lambda obj, event: self._sync())
+
+    def props(self):
+        return (self.segment_actor, self.marker_actor, self.label_actor)
+
+    def _attach(self):
+        """(Re-)add the overlay props; scene resets elsewhere remove every actor of the renderer"""
+        for prop in self.props():
+            if not self.renderer.HasViewProp(prop):
+                self.renderer.AddViewProp(prop)
+
+    def _local(self, point):
+        point = np.asarray(point, dtype=np.float64)[:3]
+        if self.origin is None:
+            self.origin = np.floor(point)
+            for actor in (self.marker_actor, self.segment_actor):
+                actor.SetPosition(*self.origin)
+            self.label_transform.Identity()
+            self.label_transform.Translate(*self.origin)
+        return point - self.origin
+
+    def __len__(self):
+        return len(self.markers) + len(self.segments) + len(self.labels)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def add_marker(self, center, radius, color):
+        item = OverlayItem('marker', np.array(center[:3], dtype=np.float64))
+        self.markers.add(item, center=self._local(center), radius=radius, color=_rgb(color))
+        self._attach()
+        return item
+
+    def add_segment(self, p1, p2, color):
+        item = OverlayItem('segment', np.array([p1[:3], p2[:3]], dtype=np.float64))
+        self.segments.add(item, ends=[self._local(p1), self._local(p2)], color=_rgb(color))
+        self._attach()
+        return item
+
+    def add_label(self, position, text, color, font_size=MIN_LABEL_FONT_SIZE):
+        item = OverlayItem('label', np.array(position[:3], dtype=np.float64), str(text))
+        self.labels.add(item, position=self._local(position), style=self._label_style(color, font_size))
+        self._attach()
+        return item
+
+    def add_markers(self, centers, radius, colors):
+        """Many markers in one step: (N, 3) centres, a radius and (N, 3) colours"""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        if len(centers) == 0:
+            return []
+        items = [OverlayItem('marker', center) for center in centers]
+        self._local(centers[0])
+        self.markers.extend(items, center=centers - self.origin, radius=radius,
+                            color=np.clip(np.rint(np.asarray(colors) * 255.0), 0, 255))
+        self._attach()
+        return items
+
+    def add_segments(self, ends, colors):
+        """Many segments in one step: (N, 2, 3) end points and (N, 3) colours"""
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2, 3)
+        if len(ends) == 0:
+            return []
+        items = [OverlayItem('segment', pair) for pair in ends]
+        self._local(ends[0, 0])
+        self.segments.extend(items, ends=ends - self.origin,
+                             color=np.clip(np.rint(np.asarray(colors) * 255.0), 0, 255))
+        self._attach()
+        return items
+
+    def add_labels(self, positions, texts, colors, font_sizes):
+        """Many labels in one step: (N, 3) positions, N texts, (N, 3) colours and N font sizes"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if len(positions) == 0:
+            return []
+        items = [OverlayItem('label', position, str(text)) for position, text in zip(positions, texts)]
+        self._local(positions[0])
+        keys = [(tuple(color), font_size) for color, font_size in zip(colors, font_sizes)]
+        style_of = {key: self._label_style(*key) for key in set(keys)}
+        styles = [style_of[key] for key in keys]
+        self.labels.extend(items, position=positions - self.origin, style=styles)
+        self._attach()
+        return items
+
+    def _label_style(self, color, font_size):
+        key = tuple(int(c) for c in _rgb(color)) + (int(font_size),)
+        style = self.label_styles.get(key)
+        if style is None:
+            style = len(self.label_styles)
+            self.label_styles[key] = style
+            self.label_style_keys.append(key)
+            text_property = vtk.vtkTextProperty()
+            text_property.SetColor(*(c / 255.0 for c in key[:3]))
+            text_property.SetFontSize(key[3])
+            text_property.SetFontFamilyToArial()
+            self.label_mapper.SetLabelTextProperty(text_property, style)
+        return style
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def remove(self, item):
+        """Remove an item (and the label attached to it)"""
+        if item is None or item.is_removed():
+            return
+        item.layer.remove(item)
+        if item.label is not None:
+            self.remove(item.label)
+        if len(self) == 0:
+            self.origin = None
+
+    def set_color(self, item, color):
+        if item is None or item.is_removed():
+            return
+        if item.kind == 'label':
+            font_size = self.label_style_keys[item.layer.arrays['style'][item.slot]][3]
+            item.layer.set(item, 'style', self._label_style(color, font_size))
+        else:
+            item.layer.set(item, 'color', _rgb(color))
+
+    def label_style(self, item):
+        """(rgb colour 0..1, font size) of a label item"""
+        key = self.label_style_keys[item.layer.arrays['style'][item.slot]]
+        return tuple(c / 255.0 for c in key[:3]), key[3]
+
+    def set_text(self, item, text):
+        if item is None or item.is_removed() or item.kind != 'label':
+            return
+        item.text = str(text)
+        self.labels.dirty = True
+
+    def set_visible(self, item, visible):
+        """Show or hide an item (and its attached label) without removing it"""
+        if item is None or item.is_removed():
+            return
+        item.layer.set_visible(item, visible)
+        if item.label is not None:
+            self.set_visible(item.label, visible)
+
+    def clear(self):
+        for layer in (self.markers, self.segments, self.labels):
+            layer.clear()
+        self.origin = None
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _sync(self):
+        if self.markers.dirty:
+            centers = self.markers.shown('center')
+            polydata = vtk.vtkPolyData()
+            polydata.SetPoints(numpy_to_vtk_points(centers))
+            radius = numpy_to_vtk(self.markers.shown('radius'), deep=True)
+            radius.SetName("radius")
+            color = numpy_to_vtk(self.markers.shown('color'), deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+            color.SetName("color")
+            polydata.GetPointData().AddArray(radius)
+            polydata.GetPointData().AddArray(color)
+            self.marker_mapper.SetInputData(polydata)
+            self.marker_actor.SetVisibility(len(centers) > 0)
+            self.markers.dirty = False
+
+        if self.segments.dirty:
+            ends = self.segments.shown('ends').reshape(-1, 3)
+            polydata = vtk.vtkPolyData()
+            polydata.SetPoints(numpy_to_vtk_points(ends))
+            polydata.SetLines(make_line_cells(len(ends) // 2))
+            color = numpy_to_vtk(self.segments.shown('color'), deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+            color.SetName("color")
+            polydata.GetCellData().SetScalars(color)
+            self.segment_mapper.SetInputData(polydata)
+            self.segment_actor.SetVisibility(len(ends) > 0)
+            self.segments.dirty = False
+
+        if self.labels.dirty:
+            positions = self.labels.shown('position')
+            count = len(self.labels)
+            shown = np.flatnonzero(self.labels.visible[:count])
+            polydata = vtk.vtkPolyData()
+            polydata.SetPoints(numpy_to_vtk_points(positions))
+            polydata.SetVerts(make_vertex_cells(len(positions)))
+            texts = vtk.vtkStringArray()
+            texts.SetName("text")
+            texts.SetNumberOfValues(len(shown))
+            for row, slot in enumerate(shown):
+                texts.SetValue(row, self.labels.items[slot].text)
+            style = numpy_to_vtk(self.labels.shown('style'), deep=True, array_type=vtk.VTK_INT)
+            style.SetName("style")
+            polydata.GetPointData().AddArray(texts)
+            polydata.GetPointData().AddArray(style)
+            self.label_mapper.SetInputData(polydata)
+            self.label_actor.SetVisibility(len(positions) > 0)
+            self.labels.dirty = False
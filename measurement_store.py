@@ -0,0 +1,279 @@
+# measurement_store.py
+import os
+import numpy as np
+
+from measurement_overlay import label_font_size
+
+MEASUREMENT_LAYER_FILE = "measurements.npz"
+MEASUREMENT_STORE_VERSION = 1
+UNIT_FACTORS = {"m": 1.0, "cm": 100.0, "mm": 1000.0}
+AREA_NAMES = {"m": "square meter", "cm": "square cm", "mm": "square mm"}
+VOLUME_NAMES = {"m": "cubic meter", "cm": "cubic cm", "mm": "cubic mm"}
+MARKER_RADIUS = 0.07
+MARKER_LABEL_OFFSET = 0.15
+
+
+def format_quantity(value, quantity, units="m"):
+    """Text of a value stored in metres (m², m³, degrees for angles) in the given units"""
+    factor = UNIT_FACTORS.get(units, 1.0)
+    if quantity == "angle":
+        return f"{value:.1f}°"
+    if quantity == "area":
+        return f"{value * factor ** 2:.2f} {AREA_NAMES.get(units, AREA_NAMES['m'])}"
+    if quantity == "volume":
+        return f"{value * factor ** 3:.2f} {VOLUME_NAMES.get(units, VOLUME_NAMES['m'])}"
+    return f"{value * factor:.2f}{units}"
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS MEASUREMENT **
+# =====================================================================================================================================
+class Measurement:
+    """One measurement: its picked points and values in metres, plus the label templates that show them.
+
+    A template is a str.format pattern over the value names, e.g. "AB={length}"; the text is
+    rebuilt from the values whenever the units change, never parsed back from the label.
+    """
+    def __init__(self, kind, points, values, quantities=None, names="", color=(1.0, 0.0, 0.0), closed=False,
+                 outline=True):
+        self.kind = kind                    # 'vertical_line', 'horizontal_line', 'segment', 'polygon', ...
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.values = dict(values)          # name -> metres / m² / m³ / degrees
+        self.quantities = {name: "length" for name in self.values}
+        self.quantities.update(quantities or {})
+        self.names = names                  # marker letter per point ("" for unnamed points)
+        self.color = tuple(float(c) for c in color)
+        self.closed = closed                # polygon outline: last point joins the first
+        self.outline = outline              # draw() joins the points (off where other records draw the sides)
+        self.labels = []                    # [{'template', 'position', 'color', 'font_size'}]
+        self.items = []                     # overlay label item per entry of labels (None until drawn)
+
+    def text(self, template, units="m"):
+        return template.format(**{name: format_quantity(value, self.quantities[name], units)
+                                  for name, value in self.values.items()})
+
+
+# =====================================================================================================================================
+#                                                    ** CLASS MEASUREMENTSTORE **
+# =====================================================================================================================================
+class MeasurementStore:
+    """The measurements of one layer as typed records, separate from the overlay labels showing them.
+
+    A unit switch rewrites all label texts from the stored values in one pass (the overlay redraws
+    them once on the next render). A layer is saved as one columnar measurements.npz; loading only
+    reads the columns, records and overlay items are created by draw() when the layer is first shown.
+    """
+    def __init__(self, overlay, units="m", layer_name=None):
+        self.overlay = overlay
+        self.units = units
+        self.layer_name = layer_name
+        self._records = []
+        self.columns = None                 # loaded columns not yet turned into records
+        self.items = []                     # overlay items created by draw()
+        self.drawn = False
+        self.visible = True
+        self.dirty = False                  # changed since the last save / load
+
+    @property
+    def records(self):
+        if self.columns is not None:
+            self._records = _records_from_columns(self.columns) + self._records
+            self.columns = None
+        return self._records
+
+    def __len__(self):
+        pending = len(self.columns["kinds"]) if self.columns is not None else 0
+        return pending + len(self._records)
+
+    def add(self, kind, points, values, quantities=None, names="", color=(1.0, 0.0, 0.0), closed=False, outline=True):
+        record = Measurement(kind, points, values, quantities, names, color, closed, outline)
+        self._records.append(record)
+        self.dirty = True
+        return record
+
+    def attach_label(self, record, item, template):
+        """Bind an overlay label to a record; its text is (re)written from the record values"""
+        if item is None:
+            return
+        color, font_size = self.overlay.label_style(item)
+        record.labels.append({"template": template, "position": item.points.tolist(),
+                              "color": list(color), "font_size": font_size})
+        record.items.append(item)
+        self.overlay.set_text(item, record.text(template, self.units))
+        self.dirty = True
+
+    def relabel(self, units):
+        """Rewrite every bound label for new units; returns the number of labels changed"""
+        self.units = units
+        changed = 0
+        # Layers not drawn yet have no labels: they are written in these units when shown
+        for record in self._records:
+            for entry, item in zip(record.labels, record.items):
+                if item is None or item.is_removed():
+                    continue
+                item.text = record.text(entry["template"], units)
+                changed += 1
+        if changed:
+            self.overlay.labels.dirty = True
+        return changed
+
+    def clear(self):
+        if len(self):
+            self.dirty = True
+        self._records = []
+        self.columns = None
+        self.undraw()
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def draw(self):
+        """Create the overlay markers, segments and labels of every record (one batch per kind); returns the items"""
+        overlay = self.overlay
+        records = self.records
+        ends, end_colors, centers, center_colors, names = [], [], [], [], []
+        label_records, label_entries = [], []
+        for record in records:
+            points = record.points
+            count = len(points)
+            if record.outline and count >= 2:
+                last = count if record.closed and count > 2 else count - 1
+                if last == 1:
+                    ends.append(points[None, :2])
+                else:
+                    ends.append(np.stack([points[:last], points[np.arange(1, last + 1) % count]], axis=1))
+                end_colors.extend([record.color] * last)
+            for point, name in zip(points, record.names):
+                if name.strip():
+                    centers.append(point)
+                    center_colors.append(record.color)
+                    names.append(name)
+            for i, entry in enumerate(record.labels):
+                label_records.append((record, i))
+                label_entries.append(entry)
+
+        segments = overlay.add_segments(np.concatenate(ends) if ends else [], end_colors)
+        markers = overlay.add_markers(centers, MARKER_RADIUS, center_colors)
+        marker_labels = overlay.add_labels(np.asarray(centers).reshape(-1, 3) + [MARKER_LABEL_OFFSET, MARKER_LABEL_OFFSET, 0.0],
+                                           names, [(1.0, 1.0, 1.0)] * len(names), [label_font_size(0.1)] * len(names))
+        for marker, label in zip(markers, marker_labels):
+            marker.label = label
+        labels = overlay.add_labels([entry["position"] for entry in label_entries],
+                                    [record.text(entry["template"], self.units)
+                                     for (record, _), entry in zip(label_records, label_entries)],
+                                    [entry["color"] for entry in label_entries],
+                                    [entry["font_size"] for entry in label_entries])
+        for (record, i), item in zip(label_records, labels):
+            record.items[i] = item
+        self.items = segments + markers + marker_labels + labels
+        self.drawn = True
+        self.visible = True
+        return self.items
+
+    def undraw(self):
+        """Forget the overlay items (after the overlay was cleared); the next show draws them again"""
+        self.items = []
+        self.drawn = False
+        for record in self._records:
+            record.items = [None] * len(record.labels)
+
+    def set_visible(self, visible):
+        """Show or hide the drawn items of the layer; returns the items created if it had to be drawn"""
+        if visible and not self.drawn:
+            return self.draw()
+        for item in self.items:
+            self.overlay.set_visible(item, visible)
+        self.visible = bool(visible)
+        return []
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def save(self, folder):
+        """Write the layer to folder/measurements.npz (via a temporary file)"""
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, MEASUREMENT_LAYER_FILE)
+        columns = self.columns if self.columns is not None and not self._records else _columns_from_records(self.records)
+        with open(path + ".tmp", 'wb') as f:
+            np.savez_compressed(f, version=np.int32(MEASUREMENT_STORE_VERSION), units=np.str_(self.units), **columns)
+        os.replace(path + ".tmp", path)
+        self.dirty = False
+        return path
+
+    def load(self, folder):
+        """Read a saved layer's columns (no records or overlay items yet); False if there is none.
+        The values are in metres: the saved units are not applied, labels keep the store's display units.
+        """
+        path = os.path.join(folder, MEASUREMENT_LAYER_FILE)
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != MEASUREMENT_STORE_VERSION:
+                    return False
+                columns = {name: data[name] for name in MEASUREMENT_COLUMNS}
+        except Exception as e:
+            print(f"Ignoring unreadable measurements {path}: {e}")
+            return False
+        self._records = []
+        self.columns = columns
+        self.undraw()
+        self.dirty = False
+        return True
+
+
+MEASUREMENT_COLUMNS = ("kinds", "names", "colors", "flags", "point_starts", "points",
+                       "value_starts", "value_names", "value_quantities", "values",
+                       "label_starts", "label_templates", "label_positions", "label_colors", "label_font_sizes")
+FLAG_CLOSED = 1
+FLAG_OUTLINE = 2
+
+
+def _columns_from_records(records):
+    """Flat arrays of a record list: per-record columns plus points / values / labels end to end"""
+    def starts(counts):
+        return np.concatenate([[0], np.cumsum(counts, dtype=np.int64)]).astype(np.int64)
+
+    labels = [entry for record in records for entry in record.labels]
+    return {
+        "kinds": np.array([record.kind for record in records], dtype=np.str_),
+        "names": np.array([record.names for record in records], dtype=np.str_),
+        "colors": np.array([record.color for record in records], dtype=np.float32).reshape(-1, 3),
+        "flags": np.array([FLAG_CLOSED * record.closed + FLAG_OUTLINE * record.outline for record in records],
+                          dtype=np.uint8),
+        "point_starts": starts([len(record.points) for record in records]),
+        "points": (np.concatenate([record.points for record in records]) if records
+                   else np.empty((0, 3))).astype(np.float64),
+        "value_starts": starts([len(record.values) for record in records]),
+        "value_names": np.array([name for record in records for name in record.values], dtype=np.str_),
+        "value_quantities": np.array([record.quantities[name] for record in records for name in record.values],
+                                     dtype=np.str_),
+        "values": np.array([value for record in records for value in record.values.values()], dtype=np.float64),
+        "label_starts": starts([len(record.labels) for record in records]),
+        "label_templates": np.array([entry["template"] for entry in labels], dtype=np.str_),
+        "label_positions": np.array([entry["position"] for entry in labels], dtype=np.float64).reshape(-1, 3),
+        "label_colors": np.array([entry["color"] for entry in labels], dtype=np.float32).reshape(-1, 3),
+        "label_font_sizes": np.array([entry["font_size"] for entry in labels], dtype=np.int16),
+    }
+
+
+def _records_from_columns(columns):
+    c = columns
+    point_starts, value_starts, label_starts = c["point_starts"], c["value_starts"], c["label_starts"]
+    points = c["points"]
+    values = c["values"].tolist()
+    value_names = c["value_names"].tolist()
+    value_quantities = c["value_quantities"].tolist()
+    templates = c["label_templates"].tolist()
+    positions = c["label_positions"].tolist()
+    colors = c["label_colors"].tolist()
+    font_sizes = c["label_font_sizes"].tolist()
+    records = []
+    for i, (kind, names, color, flags) in enumerate(zip(c["kinds"].tolist(), c["names"].tolist(),
+                                                        c["colors"].tolist(), c["flags"].tolist())):
+        v0, v1 = value_starts[i], value_starts[i + 1]
+        record = Measurement(kind, points[point_starts[i]:point_starts[i + 1]],
+                             dict(zip(value_names[v0:v1], values[v0:v1])),
+                             dict(zip(value_names[v0:v1], value_quantities[v0:v1])),
+                             names, color, bool(flags & FLAG_CLOSED), bool(flags & FLAG_OUTLINE))
+        record.labels = [{"template": templates[j], "position": positions[j], "color": colors[j],
+                          "font_size": font_sizes[j]} for j in range(label_starts[i], label_starts[i + 1])]
+        record.items = [None] * len(record.labels)
+        records.append(record)
+    return records
@@ -0,0 +1,183 @@
+# point_cloud_cache.py
+import os
+import json
+import time
+import hashlib
+import numpy as np
+
+DEFAULT_CACHE_DIR_NAME = ".pointcloud_cache"
+DEFAULT_MAX_CACHE_BYTES = 20 * 1024 ** 3      # 20 GB across all projects
+CORRIDOR_CACHE_DIR_NAME = ".corridor_cache"   # per-worksheet cache of corridor-cropped clouds
+CORRIDOR_MAX_CACHE_BYTES = 4 * 1024 ** 3
+CACHE_FORMAT_VERSION = 1
+
+
+def file_fingerprint(file_path, variant=None):
+    """Return the cache key for a source file: hash of absolute path, size and mtime.
+    variant distinguishes derived versions of the same file (e.g. a corridor crop).
+    """
+    st = os.stat(file_path)
+    ident = f"{os.path.normcase(os.path.abspath(file_path))}|{st.st_size}|{st.st_mtime_ns}"
+    if variant:
+        ident += f"|{variant}"
+    return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS CACHEDPOINTCLOUD **
+# =====================================================================================================================================
+class CachedPointCloud:
+    """Memory-mapped view of a cache entry: float32 XYZ relative to origin + optional uint8 RGB"""
+    def __init__(self, meta, local_points, colors):
+        self.meta = meta
+        self.origin = np.asarray(meta["origin"], dtype=np.float64)
+        self.bounds = meta["bounds"]                 # [xmin, xmax, ymin, ymax, zmin, zmax]
+        self.point_count = meta["point_count"]
+        self.local_points = local_points             # np.memmap (N, 3) float32
+        self.colors = colors                         # np.memmap (N, 3) uint8 or None
+
+    def world_points(self):
+        """Return float64 world coordinates (materialises the mapped array)"""
+        return self.local_points.astype(np.float64) + self.origin
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS POINTCLOUDCACHE **
+# =====================================================================================================================================
+class PointCloudCache:
+    """Binary sidecar cache for parsed point clouds.
+
+    Each entry is keyed by the source file fingerprint (path, size, mtime) and stored as
+    <key>.xyz.npy / <key>.rgb.npy / <key>.json in one directory shared by all projects.
+    The total size is capped; least recently used entries are evicted first.
+    """
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".xyz.npy", base + ".rgb.npy", base + ".json"
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def load(self, file_path, variant=None):
+        """Map a cached cloud for file_path in, or return None on a miss"""
+        try:
+            key = file_fingerprint(file_path, variant)
+        except OSError:
+            return None
+        xyz_path, rgb_path, meta_path = self._paths(key)
+        if not (os.path.exists(meta_path) and os.path.exists(xyz_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            local_points = np.load(xyz_path, mmap_mode='r')
+            colors = np.load(rgb_path, mmap_mode='r') if meta.get("has_colors") else None
+        except Exception as e:
+            print(f"Ignoring unreadable point cloud cache entry {key}: {e}")
+            return None
+
+        self._touch(meta_path, meta)
+        return CachedPointCloud(meta, local_points, colors)
+
+    def cached_bounds(self, file_path, variant=None):
+        """World bounds recorded for a valid entry (meta only, nothing mapped), or None"""
+        try:
+            key = file_fingerprint(file_path, variant)
+            with open(self._paths(key)[2], 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta.get("bounds") if meta.get("version") == CACHE_FORMAT_VERSION else None
+
+    def store(self, file_path, store, variant=None):
+        """Write the sidecar for file_path from a PointStore (float32 offsets are written as they are)"""
+        if store is None or not store.has_points():
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = file_fingerprint(file_path, variant)
+        xyz_path, rgb_path, meta_path = self._paths(key)
+
+        bounds = store.bounds()
+        self._save_npy(xyz_path, np.asarray(store.local_points, dtype=np.float32))
+        if store.has_colors():
+            self._save_npy(rgb_path, np.asarray(store.colors, dtype=np.uint8))
+
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "source_path": os.path.abspath(file_path),
+            "source_size": os.path.getsize(file_path),
+            "source_mtime": os.path.getmtime(file_path),
+            "variant": variant,
+            "origin": store.origin.tolist(),
+            "bounds": [float(v) for v in bounds],
+            "point_count": int(len(store)),
+            "has_colors": store.has_colors(),
+            "created_at": time.time(),
+            "last_used": time.time(),
+        }
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+        os.replace(tmp_meta, meta_path)       # meta last: entry only becomes visible when complete
+
+        self.evict()
+        return key
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _save_npy(self, path, array):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+    def _touch(self, meta_path, meta):
+        """Record the access time used for LRU eviction"""
+        meta["last_used"] = time.time()
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=4)
+        except OSError:
+            pass
+
+    def entries(self):
+        """Return [(last_used, total_bytes, key)] for all cache entries"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        result = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[:-len(".json")]
+            paths = self._paths(key)
+            try:
+                with open(paths[2], 'r', encoding='utf-8') as f:
+                    last_used = json.load(f).get("last_used", 0.0)
+            except Exception:
+                last_used = 0.0
+            size = sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+            result.append((last_used, size, key))
+        return result
+
+    def remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Still mapped on Windows – retried on the next eviction
+                print(f"Could not remove cache file {path}: {e}")
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for last_used, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
@@ -0,0 +1,644 @@
+# point_cloud_loader.py
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import open3d as o3d
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from point_cloud_readers import (read_ply_header, iter_ply_chunks, iter_ascii_chunks,
+                                 estimate_ascii_point_count, read_las_header, iter_las_chunks,
+                                 las_local_origin, ASCII_EXTENSIONS, LAS_EXTENSIONS)
+from point_store import PointStore, choose_origin
+from point_octree import PointOctree, build_point_octree, octree_dir_for
+from point_tiles import TileSet
+from spatial_index import SpatialIndex
+from station_index import StationIndex
+from ground_profile import extract_ground_profile
+from cross_sections import CrossSectionSet
+from dtm import DTMGrid
+from deviation import DeviationField
+
+# Progress ranges reported while reading (the rest is conversion / display)
+READ_PROGRESS_START = 5
+READ_PROGRESS_END = 85
+MAX_TILE_WORKERS = 6
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS POINTSTOREREADER **
+# =====================================================================================================================================
+class PointStoreReader:
+    """Read one point cloud file into a PointStore (no Qt; usable from any thread).
+
+    Streamable formats report growing prefixes of the final store through preview(store).
+    When a cache is given, an up-to-date binary sidecar is mapped in instead of parsing the
+    source, and a new sidecar is written after the first parse. An up-to-date octree next
+    to the source takes precedence over both; its mapped points become the store and
+    self.octree is set. With a corridor, points outside it are dropped while streaming and
+    the cropped result is cached under the corridor's signature (the whole-file octree is not used).
+    progress(percent, message), preview(store) and is_cancelled() are optional callbacks.
+    """
+    def __init__(self, file_path, cache=None, corridor=None, chunk_interval=0.5,
+                 progress=None, preview=None, is_cancelled=None, allow_empty=False):
+        self.file_path = file_path
+        self.cache = cache                      # PointCloudCache or None
+        self.corridor = corridor                # alignment.Corridor or None
+        self.cache_variant = corridor.signature() if corridor is not None else None
+        self.chunk_interval = chunk_interval    # min seconds between preview updates
+        self.allow_empty = allow_empty          # return an empty store instead of raising
+        self.from_cache = False
+        self.octree = None                      # PointOctree when one was found next to the source
+        self._progress = progress or (lambda value, message: None)
+        self._preview = preview or (lambda store: None)
+        self._is_cancelled = is_cancelled or (lambda: False)
+
+    def read(self):
+        """Return the PointStore, or None when cancelled"""
+        store = self._read_octree() if self.corridor is None else None
+        if store is None:
+            store = self._read_cached()
+        if store is None and not self._is_cancelled():
+            store = self._read()
+            if store is not None and store.has_points() and not self._is_cancelled():
+                self._store_cached(store)
+        if self._is_cancelled():
+            return None
+        return store
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _report_bytes(self, bytes_read, message):
+        total = max(os.path.getsize(self.file_path), 1)
+        fraction = min(bytes_read / total, 1.0)
+        value = READ_PROGRESS_START + int(fraction * (READ_PROGRESS_END - READ_PROGRESS_START))
+        self._progress(value, f"{message} {bytes_read / (1024 * 1024):.0f} / {total / (1024 * 1024):.0f} MB")
+
+    def _read_octree(self):
+        """Map the points of an up-to-date octree written next to the source file"""
+        octree = PointOctree.open_for_source(self.file_path)
+        if octree is None:
+            return None
+        self.octree = octree
+        self.from_cache = True
+        self._progress(READ_PROGRESS_END, "Opening point cloud octree...")
+        return octree.store
+
+    def _read_cached(self):
+        """Map the binary sidecar in if the source file is unchanged since it was written"""
+        if self.cache is None:
+            return None
+        cached = self.cache.load(self.file_path, self.cache_variant)
+        if cached is None:
+            return None
+        self.from_cache = True
+        self._progress(READ_PROGRESS_END, "Loading cached point cloud...")
+        # The sidecar already holds float32 offsets, so the mapped arrays are used as they are
+        return PointStore(cached.local_points, cached.origin, cached.colors)
+
+    def _store_cached(self, store):
+        if self.cache is None:
+            return
+        self._progress(READ_PROGRESS_END, "Writing point cloud cache...")
+        try:
+            self.cache.store(self.file_path, store, self.cache_variant)
+        except Exception as e:
+            # A failed cache write must never fail the load itself
+            print(f"Could not write point cloud cache for {self.file_path}: {e}")
+
+    def _read(self):
+        """Read the source file into a PointStore"""
+        ext = os.path.splitext(self.file_path)[1].lower()
+        self._progress(READ_PROGRESS_START, "Starting file loading...")
+
+        if ext == '.ply':
+            header = read_ply_header(self.file_path)
+            if header['vertex_dtype'] is not None:
+                return self._read_streamed(iter_ply_chunks(self.file_path, header),
+                                           header['vertex_count'], exact_count=True)
+
+        if ext in LAS_EXTENSIONS:
+            header = read_las_header(self.file_path)
+            b = header['bounds']
+            centre = np.floor([(b[0] + b[1]) / 2.0, (b[2] + b[3]) / 2.0, (b[4] + b[5]) / 2.0])
+            _, origin = las_local_origin(header, centre)
+            # Scale/offset go straight into float32 offsets from the origin – no float64 pass
+            chunks = iter_las_chunks(self.file_path, header, attributes=('rgb',), origin=origin)
+            return self._read_streamed(chunks, header['point_count'], exact_count=True,
+                                       origin=origin, chunks_are_local=True)
+
+        if ext in ASCII_EXTENSIONS:
+            return self._read_streamed(iter_ascii_chunks(self.file_path),
+                                       estimate_ascii_point_count(self.file_path), exact_count=False)
+
+        if ext in ('.ply', '.pcd'):
+            self._progress(30, "Loading point cloud data...")
+            cloud = o3d.io.read_point_cloud(self.file_path)
+            store = PointStore.from_world(np.asarray(cloud.points),
+                                          np.asarray(cloud.colors) if cloud.has_colors() else None)
+            del cloud
+            if self.corridor is not None:
+                store = store.subset(self.corridor.contains(store.local_points, store.origin))
+        else:
+            raise ValueError(f"Unsupported file format: {ext}")
+
+        if self._is_cancelled():
+            return None
+        if not store.has_points() and not self.allow_empty:
+            raise ValueError(self._no_points_message())
+        self._progress(READ_PROGRESS_END, "Preparing visualization...")
+        return store
+
+    def _read_streamed(self, chunks, expected_count, exact_count, origin=None, chunks_are_local=False):
+        """Copy PointChunk blocks into float32 local arrays preallocated for expected_count points.
+        Estimated counts grow the arrays if the estimate turns out too small. Without an origin
+        one is picked from the first chunk; chunks_are_local means chunks are already offsets from it.
+        """
+        if expected_count == 0:
+            raise ValueError("No points found in the file.")
+        if self.corridor is not None:
+            # Only a fraction of the file survives the crop – start small and grow
+            expected_count = min(expected_count, max(1_000_000, expected_count // 8))
+            exact_count = False
+
+        local = np.empty((expected_count, 3), dtype=np.float32)
+        colors = None
+        filled = 0
+        last_emit = time.monotonic()
+
+        for chunk in chunks:
+            if self._is_cancelled():
+                return None
+            if self.corridor is not None:
+                chunk = self._crop_chunk(chunk, origin if chunks_are_local else None)
+            n = len(chunk.points)
+            if n == 0:
+                self._report_bytes(chunk.bytes_read, "Reading points...")
+                continue
+            if origin is None:
+                origin = choose_origin(chunk.points)
+            if filled + n > len(local):
+                capacity = max(filled + n, int(len(local) * 1.25))
+                local = self._grow(local, capacity)
+                if colors is not None:
+                    colors = self._grow(colors, capacity)
+            if chunks_are_local:
+                local[filled:filled + n] = chunk.points
+            else:
+                np.subtract(chunk.points, origin, out=local[filled:filled + n], casting='unsafe')
+            if chunk.colors is not None:
+                if colors is None:
+                    colors = np.zeros((len(local), 3), dtype=np.uint8)
+                colors[filled:filled + n] = chunk.colors
+            filled += n
+
+            self._report_bytes(chunk.bytes_read, "Reading points...")
+            now = time.monotonic()
+            if now - last_emit >= self.chunk_interval and (filled < expected_count or not exact_count):
+                self._preview(PointStore(local[:filled], origin,
+                                         colors[:filled] if colors is not None else None))
+                last_emit = now
+
+        if filled == 0:
+            if self.allow_empty:
+                return PointStore(np.empty((0, 3), dtype=np.float32), origin if origin is not None else np.zeros(3))
+            raise ValueError(self._no_points_message())
+        return PointStore(local[:filled], origin, colors[:filled] if colors is not None else None)
+
+    def _crop_chunk(self, chunk, origin):
+        """Keep only the points of a chunk inside the corridor"""
+        inside = self.corridor.contains(chunk.points, origin)
+        if inside.all():
+            return chunk
+        return chunk._replace(**{field: (value[inside] if isinstance(value, np.ndarray) else value)
+                                 for field, value in chunk._asdict().items() if field != 'bytes_read'})
+
+    def _no_points_message(self):
+        if self.corridor is not None:
+            return "No points found inside the zero line corridor."
+        return "No points found in the file."
+
+    @staticmethod
+    def _grow(array, capacity):
+        grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS POINTCLOUDLOADER **
+# =====================================================================================================================================
+class PointCloudLoader(QThread):
+    """Read a point cloud file into a PointStore in a worker thread (see PointStoreReader).
+
+    chunk_loaded carries growing prefixes of the store so the viewer can show the cloud
+    while it is still being read.
+    """
+    progress = pyqtSignal(int, str)             # percent, message
+    chunk_loaded = pyqtSignal(object)           # PointStore over the points read so far
+    loaded = pyqtSignal(object)                 # PointStore
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, file_path, parent=None, chunk_interval=0.5, cache=None, corridor=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.corridor = corridor
+        self.cache = cache
+        self.reader = PointStoreReader(file_path, cache, corridor, chunk_interval,
+                                       progress=self.progress.emit, preview=self.chunk_loaded.emit,
+                                       is_cancelled=self.is_cancel_requested)
+        self._cancel_requested = False
+
+    @property
+    def from_cache(self):
+        return self.reader.from_cache
+
+    @property
+    def octree(self):
+        return self.reader.octree
+
+    def cancel(self):
+        """Ask the worker to stop at the next chunk boundary"""
+        self._cancel_requested = True
+
+    def is_cancel_requested(self):
+        return self._cancel_requested
+
+    def run(self):
+        try:
+            store = self.reader.read()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if store is None or self._cancel_requested:
+            self.cancelled.emit()
+            return
+        self.loaded.emit(store)
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS TILESETLOADER **
+# =====================================================================================================================================
+class TileSetLoader(QThread):
+    """Read several tile files in a thread pool and merge them into a TileSet.
+
+    Tiles whose known bounds (LAS header or cache entry) miss the corridor are skipped
+    without being opened; the others are cropped while streaming like single files.
+    With base_set the new tiles are appended to an existing TileSet; preloaded
+    [(file_path, PointStore)] are merged in as tiles without being read again.
+    """
+    progress = pyqtSignal(int, str)
+    loaded = pyqtSignal(object)                 # TileSet
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, file_paths, parent=None, cache=None, corridor=None, base_set=None,
+                 preloaded=(), max_workers=MAX_TILE_WORKERS):
+        super().__init__(parent)
+        self.file_paths = list(file_paths)
+        self.file_path = self.file_paths[0] if self.file_paths else None
+        self.cache = cache
+        self.corridor = corridor
+        self.base_set = base_set or TileSet()
+        self.preloaded = list(preloaded)
+        self.max_workers = max_workers
+        self.skipped = []                       # files outside the corridor
+        self.errors = []                        # (file_path, message)
+        self.from_cache = False
+        self.octree = None
+        self._fractions = {}
+        self._lock = threading.Lock()
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def is_cancel_requested(self):
+        return self._cancel_requested
+
+    def run(self):
+        try:
+            paths = [p for p in self.file_paths if self._tile_needed(p)]
+            if not paths:
+                raise ValueError("None of the selected tiles overlaps the zero line corridor.")
+            sizes = {p: max(os.path.getsize(p), 1) for p in paths}
+            self._fractions = {p: 0.0 for p in paths}
+            total_size = sum(sizes.values())
+
+            def read_tile(path):
+                def tile_progress(value, message):
+                    fraction = (value - READ_PROGRESS_START) / float(READ_PROGRESS_END - READ_PROGRESS_START)
+                    with self._lock:
+                        self._fractions[path] = min(max(fraction, 0.0), 1.0)
+                        done = sum(self._fractions[p] * sizes[p] for p in paths) / total_size
+                    value = READ_PROGRESS_START + int(done * (READ_PROGRESS_END - READ_PROGRESS_START))
+                    self.progress.emit(value, f"Reading {len(paths)} tiles... ({os.path.basename(path)})")
+                reader = PointStoreReader(path, self.cache, self.corridor, progress=tile_progress,
+                                          is_cancelled=self.is_cancel_requested, allow_empty=True)
+                return reader.read()
+
+            results = list(self.preloaded)
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+                futures = {path: pool.submit(read_tile, path) for path in paths}
+                for path, future in futures.items():
+                    try:
+                        store = future.result()
+                    except Exception as e:
+                        self.errors.append((path, str(e)))
+                        continue
+                    if store is not None and store.has_points():
+                        results.append((path, store))
+                    elif store is not None:
+                        self.skipped.append(path)
+
+            if self._cancel_requested:
+                self.cancelled.emit()
+                return
+            if not results:
+                raise ValueError("No points were read from the selected tiles." +
+                                 "".join(f"\n{os.path.basename(p)}: {e}" for p, e in self.errors))
+            self.progress.emit(READ_PROGRESS_END, f"Merging {len(results)} tiles...")
+            tile_set = self.base_set.with_tiles(results)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if self._cancel_requested:
+            self.cancelled.emit()
+            return
+        self.loaded.emit(tile_set)
+
+    def _tile_needed(self, path):
+        """False for a tile whose known bounds lie outside the corridor"""
+        if self.corridor is None:
+            return True
+        bounds = self.cache.cached_bounds(path) if self.cache is not None else None
+        if bounds is None and os.path.splitext(path)[1].lower() in LAS_EXTENSIONS:
+            try:
+                bounds = read_las_header(path)['bounds']
+            except Exception:
+                bounds = None
+        if bounds is not None and not self.corridor.intersects_bounds(bounds):
+            self.skipped.append(path)
+            return False
+        return True
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS POINTOCTREEBUILDER **
+# =====================================================================================================================================
+class PointOctreeBuilder(QThread):
+    """Write the level-of-detail octree for a loaded cloud next to its source file"""
+    progress = pyqtSignal(int, str)
+    built = pyqtSignal(object)                  # PointOctree
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, store, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.store = store
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        out_dir = octree_dir_for(self.file_path)
+        try:
+            hierarchy = build_point_octree(self.store, out_dir, self.file_path,
+                                           progress=self.progress.emit,
+                                           is_cancelled=lambda: self._cancel_requested)
+            if hierarchy is None:
+                return
+            octree = PointOctree.open(out_dir, self.file_path)
+            if octree is None:
+                raise ValueError(f"Written octree could not be opened: {out_dir}")
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(octree)
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS SPATIALINDEXBUILDER **
+# =====================================================================================================================================
+class SpatialIndexBuilder(QThread):
+    """Build the SpatialIndex of a loaded cloud off the UI thread"""
+    built = pyqtSignal(object)                  # SpatialIndex
+    failed = pyqtSignal(str)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def run(self):
+        try:
+            index = SpatialIndex(self.store)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(index)
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS STATIONINDEXBUILDER **
+# =====================================================================================================================================
+class StationIndexBuilder(QThread):
+    """Load the StationIndex of a cloud + alignment from the worksheet cache, or build and save it"""
+    built = pyqtSignal(object)                  # StationIndex
+    failed = pyqtSignal(str)
+
+    def __init__(self, store, vertices, signature, cache_dir=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.vertices = vertices
+        self.signature = signature
+        self.cache_dir = cache_dir
+        self.from_cache = False
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            index = StationIndex.load(self.cache_dir, self.store, self.signature) if self.cache_dir else None
+            self.from_cache = index is not None
+            if index is None:
+                index = StationIndex.build(self.store, self.vertices, self.signature,
+                                           is_cancelled=lambda: self._cancel_requested)
+                if index is None:
+                    return
+                if self.cache_dir:
+                    try:
+                        index.save(self.cache_dir)
+                    except OSError as e:
+                        print(f"Could not save station index to {self.cache_dir}: {e}")
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(index)
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS GROUNDPROFILEEXTRACTOR **
+# =====================================================================================================================================
+class GroundProfileExtractor(QThread):
+    """Extract the ground profile along the zero line from a StationIndex off the UI thread"""
+    progress = pyqtSignal(int, str)
+    extracted = pyqtSignal(object)              # list of graph polylines
+    failed = pyqtSignal(str)
+
+    def __init__(self, station_index, reference_z, start, end, interval, band, percentile, parent=None):
+        super().__init__(parent)
+        self.station_index = station_index
+        self.reference_z = reference_z
+        self.start_chainage = start
+        self.end_chainage = end
+        self.interval = interval
+        self.band = band
+        self.percentile = percentile
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            polylines = extract_ground_profile(
+                self.station_index, self.reference_z, self.start_chainage, self.end_chainage,
+                interval=self.interval, band=self.band, percentile=self.percentile,
+                progress=lambda percent: self.progress.emit(percent, f"Extracting ground profile... {percent}%"),
+                is_cancelled=lambda: self._cancel_requested)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if polylines is not None:
+            self.extracted.emit(polylines)
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS CROSSSECTIONBUILDER **
+# =====================================================================================================================================
+class CrossSectionBuilder(QThread):
+    """Load the cross sections of a cloud + alignment from the worksheet cache, or compute and save them"""
+    progress = pyqtSignal(int, str)
+    built = pyqtSignal(object)                  # CrossSectionSet
+    failed = pyqtSignal(str)
+
+    def __init__(self, station_index, stations, reference_z, params, signature, cache_dir=None, parent=None):
+        super().__init__(parent)
+        self.station_index = station_index
+        self.stations = stations
+        self.reference_z = reference_z
+        self.params = params                    # dict of CrossSectionSet.compute keyword arguments
+        self.signature = signature
+        self.cache_dir = cache_dir
+        self.from_cache = False
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            sections = CrossSectionSet.load(self.cache_dir, self.signature) if self.cache_dir else None
+            self.from_cache = sections is not None
+            if sections is None:
+                sections = CrossSectionSet.compute(
+                    self.station_index, self.stations, self.reference_z, signature=self.signature,
+                    progress=lambda percent: self.progress.emit(percent, f"Computing cross sections... {percent}%"),
+                    is_cancelled=lambda: self._cancel_requested, **self.params)
+                if sections is None:
+                    return
+                if self.cache_dir:
+                    try:
+                        sections.save(self.cache_dir)
+                    except OSError as e:
+                        print(f"Could not save cross sections to {self.cache_dir}: {e}")
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(sections)
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS DTMBUILDER **
+# =====================================================================================================================================
+class DTMBuilder(QThread):
+    """Load the DTM of a cloud from the worksheet cache, or rasterize it (into that cache) off the UI thread"""
+    progress = pyqtSignal(int, str)
+    built = pyqtSignal(object)                  # DTMGrid
+    failed = pyqtSignal(str)
+
+    def __init__(self, store, signature, cache_dir=None, parent=None, **settings):
+        super().__init__(parent)
+        self.store = store
+        self.signature = signature
+        self.cache_dir = cache_dir
+        self.settings = settings                # cell_size / statistic / max_fill for DTMGrid.build
+        self.from_cache = False
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            grid = DTMGrid.load(self.cache_dir, self.signature) if self.cache_dir else None
+            self.from_cache = grid is not None
+            if grid is None:
+                grid = DTMGrid.build(self.store, signature=self.signature, out_dir=self.cache_dir,
+                                     progress=lambda percent: self.progress.emit(percent, f"Building DTM... {percent}%"),
+                                     is_cancelled=lambda: self._cancel_requested, **self.settings)
+                if grid is None:
+                    return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(grid)
+
+
+# =====================================================================================================================================
+#                                                     ** CLASS DEVIATIONBUILDER **
+# =====================================================================================================================================
+class DeviationBuilder(QThread):
+    """Load the as-built deviations of a cloud from the worksheet cache, or compute them against a design baseline"""
+    progress = pyqtSignal(int, str)
+    built = pyqtSignal(object)                  # DeviationField
+    failed = pyqtSignal(str)
+
+    def __init__(self, station_index, baseline_key, baseline_data, reference_z, width, signature, cache_dir=None,
+                 parent=None):
+        super().__init__(parent)
+        self.station_index = station_index
+        self.baseline_key = baseline_key
+        self.baseline_data = baseline_data      # *_baseline.json dict of the design
+        self.reference_z = reference_z
+        self.width = width
+        self.signature = signature
+        self.cache_dir = cache_dir
+        self.from_cache = False
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            field = DeviationField.load(self.cache_dir, self.signature) if self.cache_dir else None
+            self.from_cache = field is not None
+            if field is None:
+                field = DeviationField.compute(
+                    self.station_index, self.baseline_data, self.reference_z, self.width, self.signature,
+                    self.baseline_key, out_dir=self.cache_dir,
+                    progress=lambda percent: self.progress.emit(percent, f"Computing deviations... {percent}%"),
+                    is_cancelled=lambda: self._cancel_requested)
+                if field is None:
+                    return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.built.emit(field)
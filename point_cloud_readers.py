@@ -0,0 +1,468 @@
+# point_cloud_readers.py
+import os
+import warnings
+from collections import namedtuple
+import struct
+import numpy as np
+
+# Optional: LAZ decompression (pip install laspy[lazrs])
+try:
+    import laspy
+except ImportError:
+    laspy = None
+
+# PLY scalar type names -> numpy type codes
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8',
+}
+
+DEFAULT_CHUNK_POINTS = 1_000_000
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Extensions read by the ASCII reader
+ASCII_EXTENSIONS = ('.xyz', '.txt', '.csv', '.pts')
+LAS_EXTENSIONS = ('.las', '.laz')
+
+# One block of points produced by a streaming reader
+# points: float64 (n, 3); colors: uint8 (n, 3) or None; intensity: float32 (n,) or None;
+# classification: uint8 (n,) or None
+PointChunk = namedtuple('PointChunk', ['points', 'colors', 'intensity', 'bytes_read', 'classification'],
+                        defaults=(None,))
+
+
+# =====================================================================================================================================
+#                                                       ** PLY READER **
+# =====================================================================================================================================
+def read_ply_header(file_path):
+    """Parse the header of a PLY file.
+    Returns a dict with 'format', 'vertex_count', 'vertex_dtype' (None if the vertex
+    element can't be read as fixed-size records), 'data_offset' and 'property_names'.
+    """
+    with open(file_path, 'rb') as f:
+        magic = f.readline().strip()
+        if magic != b'ply':
+            raise ValueError("Not a PLY file")
+
+        fmt = None
+        elements = []          # [(name, count, [(prop_name, type_code or None)])]
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("Unexpected end of PLY header")
+            tokens = line.decode('ascii', errors='replace').split()
+            if not tokens:
+                continue
+            keyword = tokens[0]
+            if keyword == 'format':
+                fmt = tokens[1]
+            elif keyword == 'element':
+                elements.append((tokens[1], int(tokens[2]), []))
+            elif keyword == 'property' and elements:
+                if tokens[1] == 'list':
+                    elements[-1][2].append((tokens[-1], None))   # variable-size record
+                else:
+                    elements[-1][2].append((tokens[2], PLY_TYPES.get(tokens[1])))
+            elif keyword == 'end_header':
+                break
+        data_offset = f.tell()
+
+    vertex = next((e for e in elements if e[0] == 'vertex'), None)
+    if vertex is None:
+        raise ValueError("PLY file has no vertex element")
+
+    endian = {'binary_little_endian': '<', 'binary_big_endian': '>'}.get(fmt)
+    vertex_dtype = None
+    preceding_fixed = True
+    offset = data_offset
+    for name, count, props in elements:
+        if name == 'vertex':
+            break
+        # Elements stored before the vertex block shift the data offset
+        if not endian or any(t is None for _, t in props):
+            preceding_fixed = False
+            break
+        offset += count * np.dtype([(p, endian + t) for p, t in props]).itemsize
+
+    if endian and preceding_fixed and all(t is not None for _, t in vertex[2]):
+        vertex_dtype = np.dtype([(p, endian + t) for p, t in vertex[2]])
+
+    return {
+        'format': fmt,
+        'vertex_count': vertex[1],
+        'vertex_dtype': vertex_dtype,
+        'data_offset': offset,
+        'property_names': [p for p, _ in vertex[2]],
+    }
+
+
+def _colors_from_record(records, names):
+    """Extract uint8 RGB from structured vertex records, or None if the file has no colors"""
+    for keys in (('red', 'green', 'blue'), ('r', 'g', 'b'), ('diffuse_red', 'diffuse_green', 'diffuse_blue')):
+        if all(k in names for k in keys):
+            rgb = np.empty((len(records), 3), dtype=np.uint8)
+            for i, k in enumerate(keys):
+                channel = records[k]
+                if channel.dtype.kind == 'f':
+                    rgb[:, i] = np.clip(channel * 255.0, 0, 255)
+                elif channel.dtype.itemsize > 1:
+                    rgb[:, i] = channel >> (8 * (channel.dtype.itemsize - 1))
+                else:
+                    rgb[:, i] = channel
+            return rgb
+    return None
+
+
+def iter_ply_chunks(file_path, header=None, chunk_points=DEFAULT_CHUNK_POINTS):
+    """Yield PointChunk blocks from a binary PLY file"""
+    header = header or read_ply_header(file_path)
+    dtype = header['vertex_dtype']
+    if dtype is None:
+        raise ValueError("PLY vertex layout can't be streamed (ASCII or list properties)")
+
+    names = dtype.names
+    remaining = header['vertex_count']
+    with open(file_path, 'rb') as f:
+        f.seek(header['data_offset'])
+        while remaining > 0:
+            count = min(chunk_points, remaining)
+            records = np.fromfile(f, dtype=dtype, count=count)
+            if len(records) == 0:
+                break
+            remaining -= len(records)
+            points = np.empty((len(records), 3), dtype=np.float64)
+            points[:, 0] = records['x']
+            points[:, 1] = records['y']
+            points[:, 2] = records['z']
+            intensity = records['intensity'].astype(np.float32) if 'intensity' in names else None
+            yield PointChunk(points, _colors_from_record(records, names), intensity, f.tell())
+
+
+# =====================================================================================================================================
+#                                                   ** ASCII (XYZ / TXT / CSV) READER **
+# =====================================================================================================================================
+def _delimiter_table(delimiter=None):
+    """Translation table mapping the delimiter (and common separators) to spaces"""
+    separators = b',;\t\r'
+    if delimiter:
+        separators += delimiter.encode('ascii')
+    return bytes.maketrans(separators, b' ' * len(separators))
+
+
+def detect_ascii_layout(file_path, delimiter=None, max_probe_bytes=64 * 1024):
+    """Find where numeric data starts and how many columns it has.
+    Header lines (PTS point counts, column names, comments) are skipped.
+    Returns (data_offset, column_count).
+    """
+    table = _delimiter_table(delimiter)
+    with open(file_path, 'rb') as f:
+        probe = f.read(max_probe_bytes)
+    offset = 0
+    for line in probe.split(b'\n'):
+        tokens = line.translate(table).split()
+        if len(tokens) >= 3:
+            try:
+                [float(t) for t in tokens]
+                return offset, len(tokens)
+            except ValueError:
+                pass
+        offset += len(line) + 1
+    raise ValueError("No numeric XYZ rows found in the file.")
+
+
+def _parse_ascii_block(block, column_count, table):
+    """Parse complete lines into a float64 (n, column_count) array"""
+    block = block.translate(table)
+    line_count = block.count(b'\n')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            # Vectorized C parse of the whole block
+            values = np.fromstring(block, dtype=np.float64, sep=' ')
+            if values.size == line_count * column_count:
+                return values.reshape(-1, column_count)
+        except (ValueError, DeprecationWarning):
+            pass
+
+    # Blank, short or non-numeric lines somewhere in the block: tolerant per-line parse
+    rows = []
+    for line in block.split(b'\n'):
+        tokens = line.split()
+        if len(tokens) < column_count:
+            continue
+        try:
+            rows.append([float(t) for t in tokens[:column_count]])
+        except ValueError:
+            continue
+    return np.array(rows, dtype=np.float64).reshape(-1, column_count)
+
+
+def ascii_column_roles(column_count, keep_colors=True, keep_intensity=False):
+    """Default column layout: XYZ, XYZI, XYZRGB or XYZIRGB"""
+    rgb_columns = None
+    intensity_column = None
+    if column_count in (4, 7) and keep_intensity:
+        intensity_column = 3
+    if column_count >= 6 and keep_colors:
+        rgb_columns = (column_count - 3, column_count - 2, column_count - 1)
+    return rgb_columns, intensity_column
+
+
+def iter_ascii_chunks(file_path, delimiter=None, keep_colors=True, keep_intensity=False,
+                      rgb_columns=None, intensity_column=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Yield PointChunk blocks from a delimited ASCII point file read in fixed-size byte chunks.
+    Columns 0-2 are XYZ; RGB/intensity columns are auto-detected unless given explicitly.
+    """
+    data_offset, column_count = detect_ascii_layout(file_path, delimiter)
+    if rgb_columns is None and intensity_column is None:
+        rgb_columns, intensity_column = ascii_column_roles(column_count, keep_colors, keep_intensity)
+    table = _delimiter_table(delimiter)
+    rgb_is_unit = None          # decided on the first chunk: 0-1 floats or 0-255 integers
+
+    with open(file_path, 'rb') as f:
+        f.seek(data_offset)
+        remainder = b''
+        while True:
+            data = f.read(chunk_bytes)
+            at_end = not data
+            block = remainder + data
+            if at_end:
+                if not block.strip():
+                    break
+                block += b'\n'
+                remainder = b''
+            else:
+                cut = block.rfind(b'\n')
+                if cut < 0:
+                    remainder = block
+                    continue
+                remainder = block[cut + 1:]
+                block = block[:cut + 1]
+
+            values = _parse_ascii_block(block, column_count, table)
+            if len(values):
+                points = np.ascontiguousarray(values[:, :3])
+                colors = None
+                if rgb_columns is not None:
+                    rgb = values[:, list(rgb_columns)]
+                    if rgb_is_unit is None:
+                        rgb_is_unit = bool(rgb.max(initial=0.0) <= 1.0)
+                    colors = np.clip(rgb * 255.0 if rgb_is_unit else rgb, 0, 255).astype(np.uint8)
+                intensity = values[:, intensity_column].astype(np.float32) if intensity_column is not None else None
+                yield PointChunk(points, colors, intensity, f.tell())
+            if at_end:
+                break
+
+
+def estimate_ascii_point_count(file_path, delimiter=None, probe_bytes=1024 * 1024):
+    """Estimate the number of rows from the average line length of the first block"""
+    data_offset, _ = detect_ascii_layout(file_path, delimiter)
+    size = os.path.getsize(file_path) - data_offset
+    with open(file_path, 'rb') as f:
+        f.seek(data_offset)
+        probe = f.read(probe_bytes)
+    lines = max(probe.count(b'\n'), 1)
+    return int(size / (len(probe) / lines) * 1.05) + 1
+
+
+# =====================================================================================================================================
+#                                                       ** LAS / LAZ READER **
+# =====================================================================================================================================
+# Byte offsets of the optional attributes inside a point record, per point data format
+LAS_RGB_OFFSETS = {2: 20, 3: 28, 5: 28, 7: 30, 8: 30, 10: 30}
+LAS_ATTRIBUTES = ('rgb', 'intensity', 'classification')
+
+
+def read_las_header(file_path):
+    """Read the LAS/LAZ public header block only (no point data is touched).
+    Returns a dict with version, point_format, point_count, record_length, point_data_offset,
+    scale, offset, bounds [xmin, xmax, ymin, ymax, zmin, zmax] and compressed flag.
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read(375)
+    if len(raw) < 227 or raw[:4] != b'LASF':
+        raise ValueError("Not a LAS/LAZ file")
+
+    version = (raw[24], raw[25])
+    point_data_offset, = struct.unpack_from('<I', raw, 96)
+    format_byte, record_length = struct.unpack_from('<BH', raw, 104)
+    point_count, = struct.unpack_from('<I', raw, 107)
+    if version >= (1, 4) and len(raw) >= 255:
+        # 64-bit count; the legacy field is 0 for formats 6-10 or > 4G points
+        point_count = struct.unpack_from('<Q', raw, 247)[0] or point_count
+    scale = np.array(struct.unpack_from('<3d', raw, 131))
+    offset = np.array(struct.unpack_from('<3d', raw, 155))
+    max_x, min_x, max_y, min_y, max_z, min_z = struct.unpack_from('<6d', raw, 179)
+
+    return {
+        'version': f"{version[0]}.{version[1]}",
+        'point_format': format_byte & 0x3F,
+        'compressed': bool(format_byte & 0xC0),      # LAZ sets bit 7 (or 6) of the format id
+        'point_count': int(point_count),
+        'record_length': record_length,
+        'point_data_offset': point_data_offset,
+        'scale': scale,
+        'offset': offset,
+        'bounds': [min_x, max_x, min_y, max_y, min_z, max_z],
+    }
+
+
+def _las_record_dtype(header, attributes):
+    """Structured dtype covering only the requested fields of a point record"""
+    fmt = header['point_format']
+    names, formats, offsets = ['X', 'Y', 'Z'], ['<i4', '<i4', '<i4'], [0, 4, 8]
+    if 'intensity' in attributes:
+        names.append('intensity'); formats.append('<u2'); offsets.append(12)
+    if 'classification' in attributes:
+        names.append('classification'); formats.append('u1'); offsets.append(16 if fmt >= 6 else 15)
+    if 'rgb' in attributes and fmt in LAS_RGB_OFFSETS:
+        base = LAS_RGB_OFFSETS[fmt]
+        names += ['red', 'green', 'blue']
+        formats += ['<u2', '<u2', '<u2']
+        offsets += [base, base + 2, base + 4]
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                     'itemsize': header['record_length']})
+
+
+def las_local_origin(header, origin):
+    """Snap the requested origin to the integer grid of the file so offsets stay exact"""
+    scale, offset = header['scale'], header['offset']
+    origin_raw = np.round((np.asarray(origin, dtype=np.float64) - offset) / scale).astype(np.int64)
+    return origin_raw, offset + origin_raw * scale
+
+
+class _LasColorScaler:
+    """Map 16-bit LAS colors to uint8; files storing 0-255 in 16-bit fields are detected once"""
+    def __init__(self):
+        self.shift = None
+
+    def __call__(self, red, green, blue):
+        rgb = np.stack([red, green, blue], axis=1)
+        if self.shift is None:
+            self.shift = 8 if rgb.max(initial=0) > 255 else 0
+        return (rgb >> self.shift).astype(np.uint8)
+
+
+def _iter_las_blocks(file_path, header, attributes, chunk_points):
+    """Yield (start, records) blocks with fields X/Y/Z (raw ints) and the requested attributes"""
+    if header['compressed']:
+        if laspy is None:
+            raise ValueError("Reading .laz files requires the 'laspy' package with a LAZ backend "
+                             "(pip install laspy[lazrs])")
+        start = 0
+        with laspy.open(file_path) as reader:
+            for points in reader.chunk_iterator(chunk_points):
+                block = {'X': np.asarray(points.X), 'Y': np.asarray(points.Y), 'Z': np.asarray(points.Z)}
+                if 'intensity' in attributes:
+                    block['intensity'] = np.asarray(points.intensity)
+                if 'classification' in attributes:
+                    block['classification'] = np.asarray(points.classification)
+                if 'rgb' in attributes and header['point_format'] in LAS_RGB_OFFSETS:
+                    block['red'] = np.asarray(points.red)
+                    block['green'] = np.asarray(points.green)
+                    block['blue'] = np.asarray(points.blue)
+                yield start, block
+                start += len(block['X'])
+        return
+
+    dtype = _las_record_dtype(header, attributes)
+    count = header['point_count']
+    # Map the point block; only the requested fields of each chunk are ever converted
+    records = np.memmap(file_path, dtype=dtype, mode='r', offset=header['point_data_offset'], shape=(count,))
+    for start in range(0, count, chunk_points):
+        yield start, records[start:start + chunk_points]
+
+
+def iter_las_chunks(file_path, header=None, attributes=('rgb',), origin=None,
+                    chunk_points=DEFAULT_CHUNK_POINTS):
+    """Yield PointChunk blocks from a LAS/LAZ file.
+    attributes: subset of ('rgb', 'intensity', 'classification') to decode besides XYZ.
+    Without origin the points are float64 world coordinates; with origin they are float32
+    offsets from the (grid-snapped) origin.
+    """
+    header = header or read_las_header(file_path)
+    scale, offset = header['scale'], header['offset']
+    if origin is not None:
+        origin_raw, _ = las_local_origin(header, origin)
+    colors_of = _LasColorScaler()
+
+    for start, block in _iter_las_blocks(file_path, header, attributes, chunk_points):
+        n = len(block['X'])
+        if origin is None:
+            points = np.empty((n, 3), dtype=np.float64)
+            for axis, key in enumerate('XYZ'):
+                np.multiply(block[key], scale[axis], out=points[:, axis])
+                points[:, axis] += offset[axis]
+        else:
+            points = np.empty((n, 3), dtype=np.float32)
+            for axis, key in enumerate('XYZ'):
+                np.multiply(block[key] - origin_raw[axis], scale[axis], out=points[:, axis], casting='unsafe')
+        names = block.dtype.names if hasattr(block, 'dtype') else tuple(block.keys())
+        colors = colors_of(block['red'], block['green'], block['blue']) if 'red' in names else None
+        intensity = np.asarray(block['intensity'], dtype=np.float32) if 'intensity' in names else None
+        classification = (np.asarray(block['classification'], dtype=np.uint8) & (0x1F if header['point_format'] < 6 else 0xFF)
+                          if 'classification' in names else None)
+        bytes_read = header['point_data_offset'] + (start + n) * header['record_length']
+        yield PointChunk(points, colors, intensity, bytes_read, classification)
+
+
+def read_las(file_path, attributes=('rgb',), origin=None, chunk_points=DEFAULT_CHUNK_POINTS, progress_callback=None):
+    """Read a whole LAS/LAZ file into a compact local-origin store.
+    Returns a dict with 'origin' (float64), 'points' (float32 offsets) and the requested
+    attributes ('colors', 'intensity', 'classification'); progress_callback(fraction) is optional.
+    """
+    header = read_las_header(file_path)
+    if origin is None:
+        b = header['bounds']
+        origin = np.floor([(b[0] + b[1]) / 2.0, (b[2] + b[3]) / 2.0, (b[4] + b[5]) / 2.0])
+    _, snapped_origin = las_local_origin(header, origin)
+
+    count = header['point_count']
+    result = {'origin': snapped_origin, 'points': np.empty((count, 3), dtype=np.float32), 'header': header}
+    filled = 0
+    for chunk in iter_las_chunks(file_path, header, attributes, origin, chunk_points):
+        n = len(chunk.points)
+        result['points'][filled:filled + n] = chunk.points
+        for key, values, shape, dtype in (('colors', chunk.colors, (count, 3), np.uint8),
+                                           ('intensity', chunk.intensity, (count,), np.float32),
+                                           ('classification', chunk.classification, (count,), np.uint8)):
+            if values is not None:
+                if key not in result:
+                    result[key] = np.zeros(shape, dtype=dtype)
+                result[key][filled:filled + n] = values
+        filled += n
+        if progress_callback:
+            progress_callback(filled / max(count, 1))
+    result['points'] = result['points'][:filled]
+    return result
+
+
+# =====================================================================================================================================
+#                                                       ** FILE SUMMARY **
+# =====================================================================================================================================
+def point_cloud_file_summary(file_path):
+    """One-line description (size, and point count / extent when the header has it) without reading points"""
+    size = os.path.getsize(file_path)
+    if size < 1024 ** 3:
+        size_str = f"{size / (1024 * 1024):.1f} MB"
+    else:
+        size_str = f"{size / (1024 ** 3):.2f} GB"
+
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext in LAS_EXTENSIONS:
+            header = read_las_header(file_path)
+            b = header['bounds']
+            return (f"{size_str}, {header['point_count']:,} points (LAS {header['version']}, "
+                    f"format {header['point_format']}), extent {b[1] - b[0]:.0f} x {b[3] - b[2]:.0f} m")
+        if ext == '.ply':
+            return f"{size_str}, {read_ply_header(file_path)['vertex_count']:,} points"
+    except (OSError, ValueError):
+        pass
+    return size_str
@@ -0,0 +1,336 @@
+# point_octree.py
+import os
+import json
+import heapq
+import math
+import time
+import numpy as np
+import vtk
+
+from vtk_utils import build_point_polydata, set_point_scalars
+from point_store import PointStore
+from point_cloud_cache import file_fingerprint
+
+OCTREE_DIR_SUFFIX = ".octree"
+OCTREE_FORMAT_VERSION = 1
+DEFAULT_GRID_SIZE = 128             # sampling grid per node and axis (one point per grid cell)
+DEFAULT_MAX_DEPTH = 12
+DEFAULT_POINT_BUDGET = 5_000_000    # points drawn at most
+DEFAULT_MIN_NODE_PIXELS = 80        # nodes projected smaller than this are not refined further
+LOD_POINT_THRESHOLD = 10_000_000    # clouds above this size are drawn through the octree
+
+
+def octree_dir_for(source_path):
+    """Directory holding the octree written next to a source file"""
+    return source_path + OCTREE_DIR_SUFFIX
+
+
+def build_point_octree(store, out_dir, source_path=None, grid_size=DEFAULT_GRID_SIZE,
+                       max_depth=DEFAULT_MAX_DEPTH, progress=None, is_cancelled=None):
+    """Write a level-of-detail octree for a PointStore to out_dir.
+
+    Level l divides the root cube into 2^l nodes per axis, each sampled on a grid_size^3 grid.
+    Every level keeps one point per grid cell from the points the coarser levels left over,
+    so a node plus its ancestors is a progressively denser subsample. Points are written
+    sorted by (level, node) so every node is one contiguous range of points.npy.
+    progress(percent, message) and is_cancelled() are optional callbacks.
+    Returns the hierarchy dict, or None when cancelled.
+    """
+    local = store.local_points
+    count = len(local)
+    if count == 0:
+        raise ValueError("Cannot build an octree for an empty point cloud.")
+    grid_bits = int(math.log2(grid_size))
+    if 2 ** grid_bits != grid_size:
+        raise ValueError("grid_size must be a power of two")
+    max_depth = min(max_depth, 21 - grid_bits)      # cell coordinates must fit 21 bits per axis
+
+    mins = local.min(axis=0).astype(np.float64)
+    maxs = local.max(axis=0).astype(np.float64)
+    size = float(max(maxs - mins)) * (1 + 1e-6) or 1.0
+
+    # Random priority decides which point represents a grid cell on the coarse levels
+    rng = np.random.default_rng(0)
+    remaining = rng.permutation(count).astype(np.int64)
+    levels = np.full(count, -1, dtype=np.int8)
+    node_codes = np.zeros(count, dtype=np.int64)
+
+    for level in range(max_depth + 1):
+        if is_cancelled and is_cancelled():
+            return None
+        if progress:
+            progress(int(80 * level / (max_depth + 1)), f"Building octree level {level}...")
+        cells_per_axis = grid_size << level
+        cells = ((local[remaining] - mins) * (cells_per_axis / size)).astype(np.int64)
+        np.clip(cells, 0, cells_per_axis - 1, out=cells)
+        nodes = cells >> grid_bits
+        node_code = (nodes[:, 0] << 42) | (nodes[:, 1] << 21) | nodes[:, 2]
+        if level == max_depth:
+            picked = np.arange(len(remaining))
+        else:
+            cell_code = (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+            _, picked = np.unique(cell_code, return_index=True)
+        levels[remaining[picked]] = level
+        node_codes[remaining[picked]] = node_code[picked]
+        keep = np.ones(len(remaining), dtype=bool)
+        keep[picked] = False
+        remaining = remaining[keep]
+        if len(remaining) == 0:
+            break
+
+    if progress:
+        progress(85, "Sorting octree nodes...")
+    order = np.lexsort((node_codes, levels))
+    sorted_levels = levels[order]
+    sorted_codes = node_codes[order]
+    boundaries = np.flatnonzero((np.diff(sorted_levels) != 0) | (np.diff(sorted_codes) != 0)) + 1
+    starts = np.concatenate(([0], boundaries))
+    counts = np.diff(np.concatenate((starts, [count])))
+
+    nodes = []
+    mask21 = (1 << 21) - 1
+    for start, n in zip(starts.tolist(), counts.tolist()):
+        code = int(sorted_codes[start])
+        nodes.append({
+            "level": int(sorted_levels[start]),
+            "key": [(code >> 42) & mask21, (code >> 21) & mask21, code & mask21],
+            "start": start,
+            "count": n,
+        })
+
+    if is_cancelled and is_cancelled():
+        return None
+    if progress:
+        progress(90, "Writing octree files...")
+    os.makedirs(out_dir, exist_ok=True)
+    _save_npy(os.path.join(out_dir, "points.npy"), np.asarray(local)[order])
+    if store.has_colors():
+        _save_npy(os.path.join(out_dir, "colors.npy"), np.asarray(store.colors)[order])
+
+    hierarchy = {
+        "version": OCTREE_FORMAT_VERSION,
+        "source_path": os.path.abspath(source_path) if source_path else None,
+        "source_fingerprint": file_fingerprint(source_path) if source_path else None,
+        "origin": store.origin.tolist(),
+        "cube_min": mins.tolist(),                  # local coordinates
+        "cube_size": size,
+        "grid_size": grid_size,
+        "point_count": int(count),
+        "has_colors": store.has_colors(),
+        "created_at": time.time(),
+        "nodes": nodes,
+    }
+    tmp_path = os.path.join(out_dir, "hierarchy.json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hierarchy, f)
+    os.replace(tmp_path, os.path.join(out_dir, "hierarchy.json"))  # last: octree is complete
+    if progress:
+        progress(100, "Octree ready")
+    return hierarchy
+
+
+def _save_npy(path, array):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS POINTOCTREE **
+# =====================================================================================================================================
+class PointOctree:
+    """Read-only octree written by build_point_octree; point data stays memory-mapped"""
+    def __init__(self, octree_dir, hierarchy, store):
+        self.octree_dir = octree_dir
+        self.hierarchy = hierarchy
+        self.store = store                      # PointStore over the reordered, mapped points
+        self.cube_min = np.asarray(hierarchy["cube_min"], dtype=np.float64)
+        self.cube_size = float(hierarchy["cube_size"])
+        self.nodes = hierarchy["nodes"]
+        index = {(n["level"], tuple(n["key"])): i for i, n in enumerate(self.nodes)}
+        self.children = [[] for _ in self.nodes]
+        self.roots = []
+        for i, n in enumerate(self.nodes):
+            parent = index.get((n["level"] - 1, tuple(k >> 1 for k in n["key"])))
+            if parent is None:
+                self.roots.append(i)
+            else:
+                self.children[parent].append(i)
+
+    @classmethod
+    def open(cls, octree_dir, source_path=None):
+        """Open an octree; returns None if it is missing, unreadable or older than source_path"""
+        hierarchy_path = os.path.join(octree_dir, "hierarchy.json")
+        if not os.path.exists(hierarchy_path):
+            return None
+        try:
+            with open(hierarchy_path, 'r', encoding='utf-8') as f:
+                hierarchy = json.load(f)
+            if hierarchy.get("version") != OCTREE_FORMAT_VERSION:
+                return None
+            if source_path and hierarchy.get("source_fingerprint") != file_fingerprint(source_path):
+                return None
+            points = np.load(os.path.join(octree_dir, "points.npy"), mmap_mode='r')
+            colors = (np.load(os.path.join(octree_dir, "colors.npy"), mmap_mode='r')
+                      if hierarchy.get("has_colors") else None)
+        except Exception as e:
+            print(f"Ignoring unreadable octree {octree_dir}: {e}")
+            return None
+        return cls(octree_dir, hierarchy, PointStore(points, hierarchy["origin"], colors))
+
+    @classmethod
+    def open_for_source(cls, source_path):
+        return cls.open(octree_dir_for(source_path), source_path)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def node_bounds(self, index):
+        """World bounds [xmin, xmax, ymin, ymax, zmin, zmax] of a node cube"""
+        node = self.nodes[index]
+        node_size = self.cube_size / (1 << node["level"])
+        low = self.cube_min + np.asarray(node["key"]) * node_size + self.store.origin
+        return [low[0], low[0] + node_size, low[1], low[1] + node_size, low[2], low[2] + node_size]
+
+    def node_store(self, index):
+        """PointStore slice (zero-copy view of the mapped file) for one node"""
+        node = self.nodes[index]
+        start, end = node["start"], node["start"] + node["count"]
+        colors = self.store.colors[start:end] if self.store.colors is not None else None
+        return PointStore(self.store.local_points[start:end], self.store.origin, colors)
+
+    def select_nodes(self, camera, aspect, viewport_height, point_budget=DEFAULT_POINT_BUDGET,
+                     min_node_pixels=DEFAULT_MIN_NODE_PIXELS):
+        """Return node indices to draw for a camera: largest on-screen nodes first, until the budget.
+        Nodes outside the view frustum or projected smaller than min_node_pixels are not descended into.
+        """
+        planes = [0.0] * 24
+        camera.GetFrustumPlanes(aspect, planes)
+        planes = np.asarray(planes).reshape(6, 4)
+        eye = np.asarray(camera.GetPosition())
+        parallel = camera.GetParallelProjection()
+        if parallel:
+            pixels_per_unit = viewport_height / (2.0 * camera.GetParallelScale())
+        else:
+            pixels_per_unit = viewport_height / (2.0 * math.tan(math.radians(camera.GetViewAngle()) / 2.0))
+
+        def projected_size(index):
+            b = self.node_bounds(index)
+            centre = np.array([(b[0] + b[1]) / 2, (b[2] + b[3]) / 2, (b[4] + b[5]) / 2])
+            radius = (b[1] - b[0]) * 0.8660254           # half the cube diagonal
+            # Frustum test: the bounding sphere must not lie fully behind any plane
+            if np.any(planes[:, :3] @ centre + planes[:, 3] < -radius):
+                return None
+            if parallel:
+                return 2 * radius * pixels_per_unit
+            distance = max(np.linalg.norm(centre - eye) - radius, 1e-6)
+            return 2 * radius / distance * pixels_per_unit
+
+        selected = []
+        total = 0
+        heap = []
+        for root in self.roots:
+            size = projected_size(root)
+            if size is not None:
+                heapq.heappush(heap, (-size, root))
+        while heap:
+            neg_size, index = heapq.heappop(heap)
+            count = self.nodes[index]["count"]
+            if selected and total + count > point_budget:
+                break
+            selected.append(index)
+            total += count
+            if -neg_size < min_node_pixels:
+                continue
+            for child in self.children[index]:
+                size = projected_size(child)
+                if size is not None:
+                    heapq.heappush(heap, (-size, child))
+        return selected
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS OCTREERENDERER **
+# =====================================================================================================================================
+class OctreeRenderer:
+    """Draw a PointOctree as one actor per visible node, grouped in a vtkAssembly.
+
+    The assembly takes the place of the single point cloud actor (bounds, visibility, picking).
+    Node actors are kept for reuse; actors of nodes that left the view are dropped
+    once more than max_cached_nodes are held.
+    """
+    def __init__(self, octree, colors, point_budget=DEFAULT_POINT_BUDGET,
+                 min_node_pixels=DEFAULT_MIN_NODE_PIXELS, max_cached_nodes=2000):
+        self.octree = octree
+        self.colors = colors                    # vtkNamedColors of the viewer
+        self.point_budget = point_budget
+        self.min_node_pixels = min_node_pixels
+        self.max_cached_nodes = max_cached_nodes
+        self.assembly = vtk.vtkAssembly()
+        self.assembly.SetPosition(*octree.store.origin)
+        self.node_actors = {}                   # node index -> actor
+        self.visible_nodes = set()
+        self.point_size = 2
+        self.scalars = None                     # (values over the octree store, lookup table, array name)
+        self.scalar_name = None
+        # Coarsest level first so the assembly has bounds before the first camera update
+        for index in octree.roots:
+            self.assembly.AddPart(self._node_actor(index))
+            self.visible_nodes.add(index)
+
+    def _node_actor(self, index):
+        actor = self.node_actors.get(index)
+        if actor is None:
+            node = self.octree.node_store(index)
+            mapper = vtk.vtkPolyDataMapper()
+            mapper.SetInputData(build_point_polydata(node.local_points, node.colors))
+            actor = vtk.vtkActor()
+            actor.SetMapper(mapper)
+            actor.GetProperty().SetPointSize(self.point_size)
+            if not node.has_colors():
+                actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
+            self.node_actors[index] = actor
+            if self.scalars is not None:
+                self._apply_scalars(index, actor)
+        return actor
+
+    def set_scalars(self, values=None, lookup_table=None, name="Scalars"):
+        """Colour all nodes, drawn now or later, by a float array over the octree store (None: RGB again)"""
+        if values is None and self.scalar_name is None:
+            return
+        self.scalars = None if values is None else (values, lookup_table, name)
+        for index, actor in self.node_actors.items():
+            self._apply_scalars(index, actor)
+        self.scalar_name = None if values is None else name
+
+    def _apply_scalars(self, index, actor):
+        if self.scalars is None:
+            set_point_scalars(actor.GetMapper(), None, name=self.scalar_name)
+            return
+        values, lookup_table, name = self.scalars
+        node = self.octree.nodes[index]
+        set_point_scalars(actor.GetMapper(), values[node["start"]:node["start"] + node["count"]], lookup_table, name)
+
+    def update(self, renderer):
+        """Refine / coarsen for the renderer's camera; returns True if the drawn nodes changed"""
+        width, height = renderer.GetSize()
+        if width <= 0 or height <= 0:
+            return False
+        wanted = set(self.octree.select_nodes(renderer.GetActiveCamera(), width / height, height,
+                                              self.point_budget, self.min_node_pixels))
+        if wanted == self.visible_nodes:
+            return False
+        for index in self.visible_nodes - wanted:
+            self.assembly.RemovePart(self.node_actors[index])
+        for index in wanted - self.visible_nodes:
+            self.assembly.AddPart(self._node_actor(index))
+        self.visible_nodes = wanted
+
+        if len(self.node_actors) > self.max_cached_nodes:
+            for index in [i for i in self.node_actors if i not in wanted]:
+                del self.node_actors[index]
+                if len(self.node_actors) <= self.max_cached_nodes:
+                    break
+        return True
+
+    def drawn_point_count(self):
+        return sum(self.octree.nodes[i]["count"] for i in self.visible_nodes)
@@ -0,0 +1,80 @@
+# point_store.py
+import numpy as np
+
+
+def choose_origin(points):
+    """Integer origin near the centre of a block of world points (keeps float32 offsets small)"""
+    points = np.asarray(points)
+    if len(points) == 0:
+        return np.zeros(3)
+    return np.floor((points.min(axis=0).astype(np.float64) + points.max(axis=0)) / 2.0)
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS POINTSTORE **
+# =====================================================================================================================================
+class PointStore:
+    """Compact point cloud: float32 XYZ offsets from a float64 origin, optional uint8 RGB.
+
+    15 bytes per coloured point instead of 48 for Open3D's float64 points + colors. float32
+    offsets keep sub-millimetre precision within a few kilometres of the origin; world
+    coordinates are only produced at API boundaries (picking, zero line points, exports).
+    """
+    def __init__(self, local_points, origin, colors=None, tile_ids=None):
+        self.local_points = local_points                        # (N, 3) float32, may be a memmap
+        self.origin = np.asarray(origin, dtype=np.float64)      # (3,) world coordinates
+        self.colors = colors                                    # (N, 3) uint8 or None
+        self.tile_ids = tile_ids                                # (N,) uint16 source tile per point, or None
+
+    @classmethod
+    def from_world(cls, points, colors=None, origin=None):
+        """Build a store from float64 world points (and 0-255 uint8 or 0-1 float colors)"""
+        points = np.asarray(points)
+        origin = choose_origin(points) if origin is None else np.asarray(origin, dtype=np.float64)
+        local = (points - origin).astype(np.float32)
+        if colors is not None:
+            colors = np.asarray(colors)
+            if colors.dtype != np.uint8:
+                colors = np.clip(colors * 255.0, 0, 255).astype(np.uint8)
+        return cls(local, origin, colors)
+
+    def __len__(self):
+        return len(self.local_points)
+
+    def has_points(self):
+        return len(self.local_points) > 0
+
+    def has_colors(self):
+        return self.colors is not None
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.local_points, self.colors, self.tile_ids) if a is not None)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def world_point(self, index):
+        """World (float64) coordinates of one point"""
+        return self.local_points[index].astype(np.float64) + self.origin
+
+    def world_points(self, indices=None):
+        """World (float64) coordinates of all points, or of the given indices / mask"""
+        local = self.local_points if indices is None else self.local_points[indices]
+        return local.astype(np.float64) + self.origin
+
+    def to_local(self, world_points):
+        """Convert world coordinates into this store's local float32 frame"""
+        return (np.asarray(world_points, dtype=np.float64) - self.origin).astype(np.float32)
+
+    def bounds(self):
+        """World bounds [xmin, xmax, ymin, ymax, zmin, zmax]"""
+        if not self.has_points():
+            return None
+        mins = self.local_points.min(axis=0).astype(np.float64) + self.origin
+        maxs = self.local_points.max(axis=0).astype(np.float64) + self.origin
+        return [mins[0], maxs[0], mins[1], maxs[1], mins[2], maxs[2]]
+
+    def subset(self, indices):
+        """New store holding only the given indices / mask (same origin)"""
+        colors = self.colors[indices] if self.colors is not None else None
+        tile_ids = self.tile_ids[indices] if self.tile_ids is not None else None
+        return PointStore(np.ascontiguousarray(self.local_points[indices]), self.origin, colors, tile_ids)
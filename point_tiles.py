@@ -0,0 +1,87 @@
+# point_tiles.py
+import os
+import numpy as np
+
+from point_store import PointStore, choose_origin
+
+TILE_ID_DTYPE = np.uint16
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS TILESET **
+# =====================================================================================================================================
+class TileSet:
+    """Point cloud tiles merged into one compact PointStore with a per-point tile id.
+
+    Tiles can be added or removed later without re-reading the others: adding appends the new
+    points to the merged buffer, removing compacts it with a tile-id mask. Both return a new
+    TileSet so the merge can run in a worker thread while the old set stays on screen.
+    """
+    def __init__(self, store=None, tiles=None, next_id=0):
+        self.store = store                      # merged PointStore (tile_ids set) or None
+        self.tiles = tiles or {}                # tile id -> {'file_path', 'point_count', 'bounds'}
+        self.next_id = next_id
+
+    def __len__(self):
+        return len(self.store) if self.store is not None else 0
+
+    def file_paths(self):
+        return [tile['file_path'] for tile in self.tiles.values()]
+
+    def tile_id_for_path(self, file_path):
+        target = os.path.normcase(os.path.abspath(file_path))
+        for tile_id, tile in self.tiles.items():
+            if os.path.normcase(os.path.abspath(tile['file_path'])) == target:
+                return tile_id
+        return None
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def with_tiles(self, items):
+        """Return a new TileSet with [(file_path, PointStore)] appended in one concatenation"""
+        items = [(path, store) for path, store in items if store is not None and store.has_points()]
+        if not items:
+            return self
+        parts = ([self.store] if self.store is not None else []) + [store for _, store in items]
+        if self.store is not None:
+            origin = self.store.origin
+        else:
+            # Integer origin at the centre of all tiles keeps every tile's float32 offsets small
+            corners = np.array([b for store in parts for b in np.reshape(store.bounds(), (3, 2)).T])
+            origin = choose_origin(corners)
+
+        total = sum(len(store) for store in parts)
+        local = np.empty((total, 3), dtype=np.float32)
+        has_colors = any(store.has_colors() for store in parts)
+        colors = np.zeros((total, 3), dtype=np.uint8) if has_colors else None
+        tile_ids = np.empty(total, dtype=TILE_ID_DTYPE)
+
+        tiles = dict(self.tiles)
+        next_id = self.next_id
+        filled = 0
+        for index, store in enumerate(parts):
+            n = len(store)
+            shift = store.origin - origin
+            np.add(store.local_points, shift, out=local[filled:filled + n], casting='unsafe')
+            if colors is not None and store.has_colors():
+                colors[filled:filled + n] = store.colors
+            if store is self.store:
+                tile_ids[filled:filled + n] = store.tile_ids
+            else:
+                if next_id > np.iinfo(TILE_ID_DTYPE).max:
+                    raise ValueError("Too many point cloud tiles in one set.")
+                path = items[index - (1 if self.store is not None else 0)][0]
+                tile_ids[filled:filled + n] = next_id
+                tiles[next_id] = {'file_path': path, 'point_count': n, 'bounds': store.bounds()}
+                next_id += 1
+            filled += n
+        return TileSet(PointStore(local, origin, colors, tile_ids), tiles, next_id)
+
+    def without_tile(self, tile_id):
+        """Return a new TileSet without one tile (the other tiles' points are kept as they are)"""
+        if tile_id not in self.tiles:
+            return self
+        tiles = {k: v for k, v in self.tiles.items() if k != tile_id}
+        if not tiles:
+            return TileSet(None, {}, self.next_id)
+        keep = self.store.tile_ids != tile_id
+        return TileSet(self.store.subset(keep), tiles, self.next_id)
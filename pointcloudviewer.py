@@ -7,9 +7,9 @@ import json
 
 from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QWidget, QPushButton, QFileDialog, QMessageBox, QDialog, QApplication,
-    QCheckBox
+    QCheckBox, QInputDialog
 )
-from PyQt5.QtCore import Qt, QByteArray, QSize, QRectF, QTimer, QEvent
+from PyQt5.QtCore import Qt, QByteArray, QSize, QRectF, QTimer, QEvent, QThread
 from PyQt5.QtGui import QPixmap, QPainter, QIcon
 from PyQt5.QtSvg import QSvgRenderer
 
@@ -25,11 +25,36 @@ from vtkmodules.vtkFiltersSources import vtkPlaneSource
 from datetime import datetime
 from math import sqrt, degrees
 
-from utils import find_best_fitting_plane
+from measurement_geometry import polygon_metrics
+from vtk_utils import build_point_polydata, make_diverging_lookup_table, set_point_scalars
+from point_cloud_loader import (PointCloudLoader, PointOctreeBuilder, TileSetLoader, SpatialIndexBuilder,
+                                StationIndexBuilder, GroundProfileExtractor, CrossSectionBuilder,
+                                DTMBuilder, DeviationBuilder)
+from point_octree import OctreeRenderer, DEFAULT_POINT_BUDGET, LOD_POINT_THRESHOLD
+from point_cloud_cache import (PointCloudCache, DEFAULT_CACHE_DIR_NAME, CORRIDOR_CACHE_DIR_NAME,
+                               CORRIDOR_MAX_CACHE_BYTES)
+from alignment import Corridor, alignment_vertices, curves_from_labels
+from station_index import (StationIndex, STATION_CACHE_DIR_NAME, alignment_signature, cloud_signature,
+                           station_coordinates)
+from screen_picker import ScreenPicker
+from render_scheduler import RenderScheduler
+from measurement_overlay import MeasurementOverlay, OverlayItem, label_font_size
+from measurement_store import MeasurementStore, MEASUREMENT_LAYER_FILE
+from slider_scrubber import SliderScrubber
+from section_window import SectionWindowRenderer
+from ground_profile import DEFAULT_PROFILE_INTERVAL, DEFAULT_PROFILE_BAND, DEFAULT_GROUND_PERCENTILE
+from cross_sections import (SECTION_CACHE_DIR_NAME, DEFAULT_SECTION_SLAB, DEFAULT_SECTION_REACH, DEFAULT_OFFSET_BIN,
+                            DEFAULT_SECTION_PERCENTILE, section_stations, section_signature, load_design_baselines)
+from dtm import DTM_CACHE_DIR_NAME, dtm_signature
+from earthwork import EARTHWORK_RESOLUTION, baseline_profile, segment_volumes, earthwork_operations
+from polygon_volume import polygon_volume
+from deviation import DEVIATION_CACHE_DIR_NAME, DEFAULT_DEVIATION_RANGE, DEVIATION_BASELINES, deviation_signature
+from point_cloud_readers import point_cloud_file_summary
 from application_ui import ApplicationUI
 from dialogs import (ConstructionConfigDialog, CurveDialog, ZeroLineDialog, MaterialLineDialog, MeasurementDialog,
                     DesignNewDialog, WorksheetNewDialog, HelpDialog, ConstructionNewDialog, CreateProjectDialog, ExistingWorksheetDialog,
-                    RoadPlaneWidthDialog, MaterialSegmentDialog, NewMaterialLineDialog)
+                    RoadPlaneWidthDialog, MaterialSegmentDialog, NewMaterialLineDialog, GroundProfileDialog,
+                    CrossSectionDialog)
 
 # ===================================================================================================================================================================   
 #                                                                   ** CLASS POINTCLOUDVIEWER **
@@ -107,6 +132,9 @@ class PointCloudViewer(ApplicationUI):
         # === ADD THIS: Projects base directory ===
         self.PROJECTS_BASE_DIR = r"E:\3D_Tool\projects"
         os.makedirs(self.PROJECTS_BASE_DIR, exist_ok=True)
+
+        # Binary sidecar cache of parsed clouds, shared (and LRU-capped) across all projects
+        self.point_cloud_cache = PointCloudCache(os.path.join(self.PROJECTS_BASE_DIR, DEFAULT_CACHE_DIR_NAME))
         
         # Initialize specific attributes that need different values
         self.start_point = np.array([387211.43846649484, 2061092.3144329898, 598.9991744523196])
@@ -137,6 +165,62 @@ class PointCloudViewer(ApplicationUI):
         self.material_polylines      = {}
         
         self.baseline_widths = {}  # Add this in your __init__
+
+        # All scene renders go through one scheduler (one render per event-loop tick / frame budget)
+        self.render_scheduler = RenderScheduler(self.vtk_widget.GetRenderWindow(), self)
+        # Measurement markers, lines and labels share three batched props (items are OverlayItems)
+        self.measurement_overlay = MeasurementOverlay(self.renderer)
+        # Measurement values in metres; labels are written from them (and rewritten on a unit switch)
+        self.measurement_store = MeasurementStore(self.measurement_overlay)
+        self.measurement_layers = {}        # layer name -> MeasurementStore (drawn when first shown)
+        self.measurement_layer_checkboxes = {}  # layer name -> its show / hide checkbox in the 3D layer panel
+        # Slider scrubbing: one 2D update per frame, camera eased towards the (predicted) chainage
+        self.slider_scrubber = SliderScrubber(self.update_slider_markers, self.slider_camera_target,
+                                              self.apply_slider_camera, self.current_slider_camera, self)
+
+        # Background point cloud loading
+        self.point_cloud_loader = None           # PointCloudLoader currently running (if any)
+        self.loading_preview_actor = None        # Partial cloud shown while the loader streams chunks
+        # Multi-file (tiled) clouds
+        self.point_tiles = None                  # TileSet when the cloud was merged from several files
+        self.point_tiles_corridor = None         # (corridor, cache) the tiles were loaded with
+        # KD-tree over the displayed cloud (snapping, radius / k-nearest queries)
+        self.spatial_index = None                # SpatialIndex for self.point_cloud once built
+        self.spatial_index_builder = None        # SpatialIndexBuilder currently running (if any)
+        self.screen_picker = ScreenPicker()      # screen-space picking (projections cached per camera)
+        # Points sorted by chainage along the zero line (station slicing)
+        self.station_index = None                # StationIndex for self.point_cloud + zero line once ready
+        self.station_index_builder = None        # StationIndexBuilder currently running (if any)
+        self.station_cloud_signature = None      # (store, cloud_signature) of the last stationed cloud
+        self.section_window = None               # SectionWindowRenderer while the section window view is on
+        self.ground_profile_extractor = None     # GroundProfileExtractor currently running (if any)
+        self.ground_profile_params = (DEFAULT_PROFILE_INTERVAL, DEFAULT_PROFILE_BAND, DEFAULT_GROUND_PERCENTILE)
+        self.ground_profile_pending = False      # extract as soon as the chainage index is ready
+        # Cross sections at every zero line interval
+        self.cross_sections = None               # CrossSectionSet of the current cloud + zero line
+        self.cross_section_builder = None        # CrossSectionBuilder currently running (if any)
+        self.cross_section_dialog = None         # CrossSectionDialog browsing self.cross_sections
+        self.cross_sections_pending = False      # compute as soon as the chainage index is ready
+        # Gridded ground surface (terrain elevation at any XY without scanning the cloud)
+        self.dtm = None                          # DTMGrid of self.point_cloud once built / loaded
+        self.dtm_builder = None                  # DTMBuilder currently running (if any)
+        self.earthwork_pending = None            # operation_config.json request waiting for the DTM
+        # As-built vs design deviation heatmap
+        self.deviation = None                    # DeviationField of the current cloud + design baseline
+        self.deviation_builder = None            # DeviationBuilder currently running (if any)
+        self.deviation_request = None            # (baseline key, baseline dict) to compare the cloud with
+        self.deviation_pending = False           # compute as soon as the chainage index is ready
+        self.deviation_scalar_bar = None         # colour legend while the heatmap is shown
+        self.deviation_table = None              # lookup table of the shown heatmap (None: RGB colours)
+        # Level-of-detail display of very large clouds
+        self.point_octree = None                 # PointOctree of the loaded cloud (if one exists)
+        self.octree_renderer = None              # OctreeRenderer drawing it
+        self.octree_builder = None               # PointOctreeBuilder currently running (if any)
+        self.lod_point_budget = DEFAULT_POINT_BUDGET
+        self.lod_refresh_timer = QTimer(self)
+        self.lod_refresh_timer.setSingleShot(True)
+        self.lod_refresh_timer.setInterval(150)  # refine once the camera has settled
+        self.lod_refresh_timer.timeout.connect(self.refresh_point_cloud_lod)
         # Connect signals
         self.connect_signals()
 
@@ -222,7 +306,7 @@ class PointCloudViewer(ApplicationUI):
                 self.canvas.draw_idle()
 
 # ================================================================= Function to scroll graph with slider =============================================================
-    def scroll_graph_with_slider(self, value):
+    def scroll_graph_with_slider(self, value, update_marker=True):
         """Scroll the graph canvas based on slider position"""
         if not hasattr(self, 'graph_horizontal_scrollbar') or not self.graph_horizontal_scrollbar:
             return
@@ -240,7 +324,8 @@ class PointCloudViewer(ApplicationUI):
             self.graph_horizontal_scrollbar.setValue(scroll_position)
             
             # Update the visual marker on the main graph
-            self.update_main_graph_marker(value)
+            if update_marker:
+                self.update_main_graph_marker(value)
         
 # ================================================================= Function to handle hover events for points
     # HOVER HANDLER FOR POINTS
@@ -550,6 +635,11 @@ class PointCloudViewer(ApplicationUI):
             QMessageBox.critical(self, "Save Failed", f"Could not save worksheet config:\n{str(e)}")
             return
 
+        # Measurement layers of the previous worksheet are saved there before switching
+        if self.measurement_layers:
+            self.save_measurement_session()
+            self.close_measurement_layers()
+
         # Update app state
         self.current_worksheet_name = worksheet_name
         self.current_project_name = project_name
@@ -560,6 +650,8 @@ class PointCloudViewer(ApplicationUI):
             self.add_layer_to_panel(initial_layer_name, dimension)
 
         self.current_layer_name = initial_layer_name
+        if dimension == "3D":
+            self.activate_measurement_layer(initial_layer_name or "default")
 
         # UI visibility logic (same as before)
         if dimension == "3D":
@@ -603,13 +695,13 @@ class PointCloudViewer(ApplicationUI):
 
         self.canvas.draw()
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         # Auto-load point cloud
         if point_cloud_file and os.path.exists(point_cloud_file):
             self.message_text.append("Auto-loading selected point cloud...")
             success = self.load_point_cloud_from_path(point_cloud_file)
-            self.message_text.append("Point cloud loaded successfully!" if success else "Failed to auto-load point cloud.")
+            self.message_text.append("Point cloud loading in background..." if success else "Failed to auto-load point cloud.")
 
         # Final message
         QMessageBox.information(self, "Success",
@@ -773,7 +865,7 @@ class PointCloudViewer(ApplicationUI):
 
             self.canvas.draw()
             if hasattr(self, 'vtk_widget'):
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
 # =======================================================================================================================================
     def open_measurement_dialog(self):
         """Open the Measurement Configuration Dialog when New is clicked"""
@@ -784,6 +876,7 @@ class PointCloudViewer(ApplicationUI):
             # Apply units
             idx = ["Meter", "Centimeter", "Millimeter"].index(config["units"].capitalize())
             self.metrics_combo.setCurrentIndex(idx)
+            self.update_measurement_metrics()
 
             # Reset previous measurement state
             self.reset_measurement_tools()
@@ -805,7 +898,8 @@ class PointCloudViewer(ApplicationUI):
                 self.current_measurement = "polygon"
             elif config["measurement_type"] == "stockpile":
                 self.current_measurement = "polygon"
-                self.message_text.append("Stockpile mode: Draw polygon → Complete → then click a height point")
+                self.message_text.append("Stockpile mode: Draw polygon around the base → Complete → volume from the point cloud")
+            self.stockpile_measurement = config["measurement_type"] == "stockpile"
 
             self.measurement_active = True
             self.plotting_active = False  # Disable graph drawing during measurement
@@ -1590,10 +1684,22 @@ class PointCloudViewer(ApplicationUI):
         # Worksheet root folder (one level above designs/construction)
         worksheet_root = os.path.dirname(os.path.dirname(full_layer_path))
 
+        # Corridor width changed in the dialog (None = ask on the next load, 0 = full cloud)
+        if "corridor_buffer_m" in data and data["corridor_buffer_m"] != config.get("corridor_buffer_m"):
+            if data["corridor_buffer_m"] is None:
+                config.pop("corridor_buffer_m", None)
+            else:
+                config["corridor_buffer_m"] = data["corridor_buffer_m"]
+            self.save_worksheet_config(config, worksheet_root)
+
         if not os.path.exists(full_layer_path):
             QMessageBox.critical(self, "Path Error", f"Layer folder not found:\n{full_layer_path}")
             return
 
+        if self.measurement_layers:
+            self.save_measurement_session()
+            self.close_measurement_layers()
+
         # Update state
         self.current_worksheet_name = worksheet_name
         self.current_project_name = config.get("project_name")
@@ -1627,6 +1733,74 @@ class PointCloudViewer(ApplicationUI):
             design_layer_path = os.path.join(worksheet_root, "designs", referenced_design_layer)
             design_layer_path = os.path.normpath(design_layer_path)
 
+        # ===============================================================
+        # ROBUST POINT CLOUD LOADING — CHECKS ALL POSSIBLE SOURCES
+        # Started first: the cloud is read in the background while the
+        # baselines / zero line / materials below are parsed.
+        # ===============================================================
+        # The file is resolved first: the corridor is only asked for when a cloud will actually load
+        pc_path = None
+        pc_source = None
+        # 1. Try worksheet config (full path)
+        pc_file = config.get("point_cloud_file")
+        if pc_file and os.path.exists(pc_file):
+            pc_path, pc_source = pc_file, "worksheet config"
+
+        # 2. If not → try layer config (may be relative or full)
+        if pc_path is None:
+            layer_pc = layer_config.get("point_cloud_file")
+            if layer_pc:
+                # Try as full path first
+                if os.path.exists(layer_pc):
+                    candidate = layer_pc
+                else:
+                    # Try relative to worksheet root
+                    candidate = os.path.join(worksheet_root, layer_pc)
+                    candidate = os.path.normpath(candidate)
+
+                if os.path.exists(candidate):
+                    pc_path, pc_source = candidate, "layer config"
+
+        # 3. Final fallback: ask user
+        if pc_path is None:
+            self.message_text.append("No valid point cloud file found in config.")
+            reply = QMessageBox.question(
+                self,
+                "Point Cloud Not Found",
+                "The point cloud file for this worksheet could not be found.\n\n"
+                "Would you like to select it manually now?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes
+            )
+            if reply == QMessageBox.Yes:
+                file_path, _ = QFileDialog.getOpenFileName(
+                    self,
+                    "Select Point Cloud File",
+                    worksheet_root,
+                    "Point Cloud Files (*.las *.laz *.ply *.pcd *.xyz *.txt *.csv *.pts)"
+                )
+                if file_path and os.path.exists(file_path):
+                    pc_path, pc_source = file_path, "manual selection"
+                    # Update worksheet config
+                    config["point_cloud_file"] = file_path
+                    self.current_worksheet_data["point_cloud_file"] = file_path
+                    self.message_text.append(f"Point cloud manually selected: {file_path}")
+                    self.message_text.append(f"   → {point_cloud_file_summary(file_path)}")
+                else:
+                    self.message_text.append("Point cloud loading cancelled.")
+            else:
+                self.message_text.append("Point cloud skipped.")
+
+        if pc_path is not None:
+            # Road worksheets only need a band around the zero line: crop while streaming (cached per worksheet)
+            corridor, corridor_cache = self.get_worksheet_corridor(config, worksheet_root,
+                                                                   [full_layer_path, design_layer_path])
+            try:
+                self.load_point_cloud_from_path(pc_path, corridor, corridor_cache)
+                self.message_text.append(f"Point cloud loading from {pc_source}: {pc_path}")
+            except Exception as e:
+                self.message_text.append(f"Error loading point cloud from {pc_source}: {str(e)}")
+
         zero_loaded = False
         design_points_loaded = False
         loaded_baselines = {}
@@ -1667,6 +1841,9 @@ class PointCloudViewer(ApplicationUI):
             zero_loaded = self.load_zero_line_from_layer(full_layer_path)
             self.message_text.append(f"Design layer loaded: {len(loaded_baselines)} baselines (solid lines)")
 
+        elif subfolder_type == "measurements":
+            self.load_measurement_session(layer_name)
+
         elif subfolder_type == "construction":
             # ... [your existing construction mode code unchanged] ...
             # (kept exactly as you had it — no changes here)
@@ -1784,74 +1961,6 @@ class PointCloudViewer(ApplicationUI):
                 self.message_text.append(f"Total 3D planes generated: {planes_generated}")
                 self.message_text.append(f"Widths loaded:\n{width_list}")
 
-        # ===============================================================
-        # ROBUST POINT CLOUD LOADING — CHECKS ALL POSSIBLE SOURCES
-        # ===============================================================
-        pc_loaded = False
-
-        # 1. Try worksheet config (full path)
-        pc_file = config.get("point_cloud_file")
-        if pc_file and os.path.exists(pc_file):
-            try:
-                self.load_point_cloud_from_path(pc_file)
-                pc_loaded = True
-                self.message_text.append(f"Point cloud loaded from worksheet config: {pc_file}")
-            except Exception as e:
-                self.message_text.append(f"Error loading point cloud from worksheet path: {str(e)}")
-
-        # 2. If not → try layer config (may be relative or full)
-        if not pc_loaded:
-            layer_pc = layer_config.get("point_cloud_file")
-            if layer_pc:
-                # Try as full path first
-                if os.path.exists(layer_pc):
-                    candidate = layer_pc
-                else:
-                    # Try relative to worksheet root
-                    candidate = os.path.join(worksheet_root, layer_pc)
-                    candidate = os.path.normpath(candidate)
-
-                if os.path.exists(candidate):
-                    try:
-                        self.load_point_cloud_from_path(candidate)
-                        pc_loaded = True
-                        self.message_text.append(f"Point cloud loaded from layer config: {candidate}")
-                    except Exception as e:
-                        self.message_text.append(f"Error loading point cloud from layer path: {str(e)}")
-
-        # 3. Final fallback: ask user
-        if not pc_loaded:
-            self.message_text.append("No valid point cloud file found in config.")
-            reply = QMessageBox.question(
-                self,
-                "Point Cloud Not Found",
-                "The point cloud file for this worksheet could not be found.\n\n"
-                "Would you like to select it manually now?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.Yes
-            )
-            if reply == QMessageBox.Yes:
-                file_path, _ = QFileDialog.getOpenFileName(
-                    self,
-                    "Select Point Cloud File",
-                    worksheet_root,
-                    "Point Cloud Files (*.las *.laz *.ply *.bin)"
-                )
-                if file_path and os.path.exists(file_path):
-                    try:
-                        self.load_point_cloud_from_path(file_path)
-                        pc_loaded = True
-                        # Update worksheet config
-                        config["point_cloud_file"] = file_path
-                        self.current_worksheet_data["point_cloud_file"] = file_path
-                        self.message_text.append(f"Point cloud manually loaded: {file_path}")
-                    except Exception as e:
-                        self.message_text.append(f"Failed to load selected point cloud: {str(e)}")
-                else:
-                    self.message_text.append("Point cloud loading cancelled.")
-            else:
-                self.message_text.append("Point cloud skipped.")
-
         # ===============================================================
         # UI setup & final messages
         # ===============================================================
@@ -1883,7 +1992,7 @@ class PointCloudViewer(ApplicationUI):
         self.message_text.append(f"   • 3D Planes: {len(loaded_baselines)}")
         self.message_text.append(f"   • Zero Line: {'Loaded' if zero_loaded else 'Not loaded'}")
         self.message_text.append(f"   • Curve Labels: {len(self.curve_labels)} recreated")
-        self.message_text.append(f"   • Point Cloud: {'Loaded' if pc_loaded else 'Not loaded'}")
+        self.message_text.append(f"   • Point Cloud: {'Loading in background' if pc_loaded else 'Not loaded'}")
 
         QMessageBox.information(self, "Worksheet Opened",
                                 f"<b>{worksheet_name}</b> → {layer_name}\n\n"
@@ -1891,12 +2000,12 @@ class PointCloudViewer(ApplicationUI):
                                 f"Baselines: {'All loaded' if subfolder_type == 'designs' else f'{dotted_lines_drawn} reference(s)'}\n"
                                 f"3D Planes: {len(loaded_baselines)}\n"
                                 f"Curves: {len(self.curve_labels)} labels\n"
-                                f"Point Cloud: {'Yes' if pc_loaded else 'No'}\n"
+                                f"Point Cloud: {'Loading...' if pc_loaded else 'No'}\n"
                                 f"Zero Line: {'Yes' if zero_loaded else 'No'}")
 
         self.canvas.draw_idle()
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # ==========================================================================================================================================================
     def load_json_files_to_3d_pointcloud(self, folder_path):
@@ -1942,27 +2051,15 @@ class PointCloudViewer(ApplicationUI):
                     # self.message_text.append(f"No 'points' key found in {filename} (skipped)")
                     continue
 
-                # Convert list of [x,y,z] to numpy array
-                points_array = np.array(points_list, dtype=np.float32)
+                # Convert list of [x,y,z] to numpy array (float64 keeps UTM precision)
+                points_array = np.asarray(points_list, dtype=np.float64).reshape(-1, 3)
 
-                # Create VTK points
-                vtk_points = vtk.vtkPoints()
-                vtk_points.SetNumberOfPoints(len(points_array))
-
-                for i, pt in enumerate(points_array):
-                    vtk_points.SetPoint(i, pt[0], pt[1], pt[2])
-
-                # Create polydata
-                polydata = vtk.vtkPolyData()
-                polydata.SetPoints(vtk_points)
-
-                # Create vertex glyph for points
-                vertex_filter = vtk.vtkVertexGlyphFilter()
-                vertex_filter.SetInputData(polydata)
+                # Create polydata with vertex cells in one step
+                polydata = build_point_polydata(points_array)
 
                 # Mapper
                 mapper = vtk.vtkPolyDataMapper()
-                mapper.SetInputConnection(vertex_filter.GetOutputPort())
+                mapper.SetInputData(polydata)
 
                 # Actor
                 actor = vtk.vtkActor()
@@ -1981,7 +2078,7 @@ class PointCloudViewer(ApplicationUI):
                 self.message_text.append(f"Failed to load {filename} as point cloud: {str(e)}")
 
         if loaded_any:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
         return loaded_any
 # ==========================================================================================================================================================
@@ -2004,7 +2101,7 @@ class PointCloudViewer(ApplicationUI):
             for actor in actors:
                 if actor.GetUserData() and "source" in actor.GetUserData():
                     renderer.RemoveActor(actor)
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
     
 # ===========================================================================================================================================================
@@ -2532,6 +2629,11 @@ class PointCloudViewer(ApplicationUI):
         if not hasattr(self, 'current_worksheet_name') or not self.current_worksheet_name:
             QMessageBox.warning(self, "No Worksheet", "No active worksheet.")
             return
+        # Measurement worksheets save their measurement session instead
+        if (getattr(self, 'current_worksheet_data', None) or {}).get("dimension") == "3D":
+            if self.save_measurement_session() is None:
+                QMessageBox.warning(self, "Save Failed", "Could not save measurements (no measurements folder).")
+            return
         if not hasattr(self, 'current_layer_name') or not self.current_layer_name:
             QMessageBox.warning(self, "No Layer", "No active design layer.")
             return
@@ -2728,139 +2830,27 @@ class PointCloudViewer(ApplicationUI):
                 self.message_text.append(f"Warning: Could not update road surface json: {e}")
 
             # 2. Create realistic earthwork operation_config.json
-
-            operations = []
-
-            if road_surface_data.get("polylines"):
-                main_poly = road_surface_data["polylines"][0]  # assuming single main alignment
-                points = main_poly["points"]
-
-                TOL_BALANCED = 0.20   # meters - adjust if needed
-                TOL_SURF_ROAD = 0.04  # old small tolerance - can keep or merge with above
-
+            request = {
+                "layer_folder": layer_folder,
+                "road_surface": road_surface_data,
+                "construction": construction_data,
+                "surface": surface_data,
+                "ref_z": float(ref_z),
+                "zero_length": float(zero_length),
+                "vertices": self.current_alignment_vertices(),
+                "zero_line": (self.zero_start_point.tolist(), self.zero_end_point.tolist()),
                 # Get widths once
-                w_construction = self.baseline_widths.get("construction", 20.0)
-                w_road_surface = self.baseline_widths.get("road_surface", 12.0)
-
-                for i in range(len(points) - 1):
-                    p1 = points[i]
-                    p2 = points[i + 1]
-
-                    ch1 = p1["chainage_m"]
-                    ch2 = p2["chainage_m"]
-                    str1 = p1["chainage_str"]
-                    str2 = p2["chainage_str"]
-
-                    length = ch2 - ch1
-                    if length <= 0:
-                        continue
-
-                    def get_abs_elev(baseline_data, chainage, ref_z):
-                        min_d = float('inf')
-                        rel_elev = None
-                        for poly in baseline_data.get("polylines", []):
-                            for pt in poly["points"]:
-                                d = abs(pt["chainage_m"] - chainage)
-                                if d < min_d:
-                                    min_d = d
-                                    rel_elev = pt["relative_elevation_m"]
-                        if rel_elev is not None and min_d < 10.0:
-                            return ref_z + rel_elev
-                        return None
-
-                    surf_z1   = get_abs_elev(surface_data,   ch1, ref_z)
-                    surf_z2   = get_abs_elev(surface_data,   ch2, ref_z)
-                    road_z1   = get_abs_elev(road_surface_data, ch1, ref_z)
-                    road_z2   = get_abs_elev(road_surface_data, ch2, ref_z)
-                    const_z1  = get_abs_elev(construction_data, ch1, ref_z) if construction_data else None
-                    const_z2  = get_abs_elev(construction_data, ch2, ref_z) if construction_data else None
-
-                    segment = {
-                        "from_chainage_str": str1,
-                        "to_chainage_str": str2,
-                        "operation_type": "data_missing",
-                        "cut_volume_ref_construction_m3": 0.0,
-                        "cut_volume_ref_road_surface_m3": 0.0,
-                        "digging_volume_m3": 0.0,
-                        "width_construction_m": round(w_construction, 1),
-                        "width_road_surface_m": round(w_road_surface, 1)
-                    }
-
-                    if surf_z1 is None or surf_z2 is None or road_z1 is None or road_z2 is None:
-                        operations.append(segment)
-                        continue
-
-                    avg_surf = (surf_z1 + surf_z2) / 2
-                    avg_road = (road_z1 + road_z2) / 2
-                    height_surf_road = avg_surf - avg_road
-
-                    # ── New priority: check construction closeness first ────────
-                    is_balanced_by_construction = False
-
-                    if const_z1 is not None and const_z2 is not None:
-                        avg_const = (const_z1 + const_z2) / 2
-                        height_surf_const = avg_surf - avg_const
-                        if abs(height_surf_const) <= TOL_BALANCED:
-                            is_balanced_by_construction = True
-
-                    cut_vol_constr = 0.0
-                    cut_vol_road   = 0.0
-                    digging_vol    = 0.0
-
-                    if is_balanced_by_construction:
-                        operation = "balanced"
-                    elif height_surf_road > TOL_SURF_ROAD:
-                        operation = "cutting"
-
-                        # Cut to construction (if available)
-                        if const_z1 is not None and const_z2 is not None:
-                            avg_const = (const_z1 + const_z2) / 2
-                            h_constr = avg_surf - avg_const
-                            if h_constr > 0:
-                                cut_vol_constr = round(h_constr * w_construction * length, 2)
-
-                        # Cut to road surface
-                        h_road = height_surf_road
-                        cut_vol_road = round(h_road * w_road_surface * length, 2)
-
-                    elif height_surf_road < -TOL_SURF_ROAD:
-                        operation = "digging"
-                        h_dig = -height_surf_road
-                        digging_vol = round(h_dig * w_road_surface * length, 2)
-                    else:
-                        operation = "balanced"
-
-                    segment["operation_type"] = operation
-
-                    if operation == "cutting":
-                        segment["cut_volume_ref_construction_m3"] = cut_vol_constr
-                        segment["cut_volume_ref_road_surface_m3"] = cut_vol_road
-                    elif operation == "digging":
-                        segment["digging_volume_m3"] = digging_vol
-                    # balanced → all volumes stay 0.0
-
-                    operations.append(segment)
-
-            # Sort segments by chainage string
-            operations.sort(key=lambda x: x["from_chainage_str"])
-
-            config_data = {
-                "zero_line_start": self.zero_start_point.tolist(),
-                "zero_line_end": self.zero_end_point.tolist(),
-                "zero_start_elevation": float(ref_z),
-                "total_chainage_length": float(zero_length),
-                "volume_method": "Average End Area (Trapezoidal)",
-                "segments": operations
+                "w_construction": self.baseline_widths.get("construction", 20.0),
+                "w_road_surface": self.baseline_widths.get("road_surface", 12.0),
             }
-
-            config_path = os.path.join(layer_folder, "operation_config.json")
-            try:
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config_data, f, indent=4, ensure_ascii=False)
+            # Volumes are taken against the ground DTM of the cloud: with a cloud loaded, wait for it
+            # rather than mixing methods between saves
+            dtm = self.get_dtm()
+            if dtm is None and (self.point_cloud or self.point_cloud_loader is not None):
+                self.earthwork_pending = request
+                self.message_text.append("Ground DTM still building: operation_config.json is written when it is ready")
+            elif self.write_operation_config(request, dtm):
                 saved_files.append("operation_config.json")
-                self.message_text.append("Created earthwork operation_config.json")
-            except Exception as e:
-                self.message_text.append(f"Warning: Could not create operation_config.json: {e}")
                 
         # ── Final feedback ───────────────────────────────────────────────────
         if saved_count > 0:
@@ -3013,8 +3003,7 @@ class PointCloudViewer(ApplicationUI):
                 planes_generated += 1
 
         # Render
-        rw = (self.vtk_widget if hasattr(self, 'vtk_widget') else self.vtkWidget).GetRenderWindow()
-        rw.Render()
+        self.request_render()
 
         if planes_generated > 0:
             width_list = "\n".join(width_summary)
@@ -3232,85 +3221,102 @@ class PointCloudViewer(ApplicationUI):
         QApplication.processEvents()
 
 # =======================================================================================================================================
-    def load_point_cloud_files(self, file_list):
-        """Load multiple point cloud files (merge or first one) - currently loads first file with progress bar"""
+    def load_point_cloud_files(self, file_list, corridor=None, cache=None):
+        """Load one point cloud file, or merge several tile files into one cloud with a per-point tile id"""
         if not file_list:
             return
+        if len(file_list) == 1:
+            self.start_point_cloud_loading(file_list[0], corridor, cache)
+            return
+        self.start_tile_set_loading(file_list, corridor=corridor, cache=cache)
+
+    def start_tile_set_loading(self, file_paths, base_set=None, preloaded=(), corridor=None, cache=None):
+        """Read tile files in the background thread pool and merge them (optionally into base_set)"""
+        self.cancel_point_cloud_loading()
+        self.cancel_octree_build()
+
+        self.show_progress_bar(file_paths[0], cancellable=True)
+        self.update_progress(0, f"Loading {len(file_paths)} tiles...")
+
+        loader = TileSetLoader(file_paths, self, cache=cache or self.point_cloud_cache, corridor=corridor,
+                               base_set=base_set, preloaded=preloaded)
+        loader.progress.connect(self.on_point_cloud_load_progress)
+        loader.loaded.connect(self.on_tile_set_loaded)
+        loader.failed.connect(self.on_point_cloud_load_failed)
+        loader.cancelled.connect(self.on_point_cloud_load_cancelled)
+        loader.finished.connect(loader.deleteLater)
+        self.point_cloud_loader = loader
+        loader.start()
+        self.message_text.append(f"Loading {len(file_paths)} point cloud tiles in background...")
+
+    def add_point_cloud_tiles(self, file_paths):
+        """Merge more tiles into the loaded cloud without re-reading the loaded ones"""
+        base_set, preloaded = self.point_tiles, ()
+        if base_set is None and self.point_cloud is not None and self.loaded_file_path:
+            # A single loaded file becomes the first tile of the set
+            preloaded = [(self.loaded_file_path, self.point_cloud)]
+        loaded_paths = base_set.file_paths() if base_set else [p for p, _ in preloaded]
+        loaded_paths = {os.path.normcase(os.path.abspath(p)) for p in loaded_paths}
+        new_paths = [p for p in file_paths if os.path.normcase(os.path.abspath(p)) not in loaded_paths]
+        if not new_paths:
+            self.message_text.append("Selected tiles are already loaded.")
+            return
+        corridor, cache = self.point_tiles_corridor or (None, None)
+        self.start_tile_set_loading(new_paths, base_set, preloaded, corridor, cache)
 
-        # For simplicity, load first file
-        first_file = file_list[0]
-        file_path = first_file  # For consistency with the single-load method
-
-        # Store the loaded file path and name (same as single load)
-        self.loaded_file_path = file_path
-        self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-        try:
-            # Show progress bar with file info
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-
-            self.update_progress(30, "Loading point cloud data...")
-            self.point_cloud = o3d.io.read_point_cloud(file_path)
-
-            if self.point_cloud.is_empty():
-                raise ValueError("Point cloud is empty!")
-
-            self.update_progress(50, "Converting to VTK format...")
-
-            # Display in VTK
-            points = np.asarray(self.point_cloud.points)
-            colors = np.asarray(self.point_cloud.colors) if self.point_cloud.has_colors() else None
-
-            poly_data = vtk.vtkPolyData()
-            vtk_points = vtk.vtkPoints()
-            vertices = vtk.vtkCellArray()
-
-            for i, pt in enumerate(points):
-                vtk_points.InsertNextPoint(pt)
-                vertex = vtk.vtkVertex()
-                vertex.GetPointIds().SetId(0, i)
-                vertices.InsertNextCell(vertex)
-
-            poly_data.SetPoints(vtk_points)
-            poly_data.SetVerts(vertices)
-
-            if colors is not None:
-                self.update_progress(70, "Processing colors...")
-                vtk_colors = vtk.vtkUnsignedCharArray()
-                vtk_colors.SetNumberOfComponents(3)
-                vtk_colors.SetName("Colors")
-                for c in (colors * 255).astype(np.uint8):
-                    vtk_colors.InsertNextTuple(c)
-                poly_data.GetPointData().SetScalars(vtk_colors)
-            else:
-                self.update_progress(70, "Preparing visualization...")
-
-            mapper = vtk.vtkPolyDataMapper()
-            mapper.SetInputData(poly_data)
-
-            self.update_progress(90, "Creating visualization...")
-
+    def remove_point_cloud_tile(self, tile_id):
+        """Drop one tile from the merged cloud; the other tiles stay in memory as they are"""
+        if self.point_tiles is None or tile_id not in self.point_tiles.tiles:
+            return
+        tile = self.point_tiles.tiles[tile_id]
+        self.point_tiles = self.point_tiles.without_tile(tile_id)
+        self.point_cloud = self.point_tiles.store
+        if self.point_cloud is None:
+            self.point_tiles = None
             if self.point_cloud_actor:
                 self.renderer.RemoveActor(self.point_cloud_actor)
-
-            self.point_cloud_actor = vtk.vtkActor()
-            self.point_cloud_actor.SetMapper(mapper)
-            self.point_cloud_actor.GetProperty().SetPointSize(2)
-
-            self.renderer.AddActor(self.point_cloud_actor)
-            self.renderer.ResetCamera()
-            self.vtk_widget.GetRenderWindow().Render()
-
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(500, self.hide_progress_bar)
-
-            self.message_text.append(f"Successfully loaded point cloud: {os.path.basename(file_path)}")
-
-        except Exception as e:
+                self.point_cloud_actor = None
+            self.request_render()
+        else:
+            self.display_point_cloud(reset_camera=False)
             self.hide_progress_bar()
-            self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {str(e)}")
-            QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {str(e)}")
+        self.message_text.append(f"Removed tile {os.path.basename(tile['file_path'])} "
+                                 f"({tile['point_count']:,} points)")
+
+    def remove_point_cloud_tile_dialog(self):
+        if not self.point_tiles:
+            return
+        ids = sorted(self.point_tiles.tiles)
+        names = [f"{os.path.basename(self.point_tiles.tiles[i]['file_path'])} "
+                 f"({self.point_tiles.tiles[i]['point_count']:,} points)" for i in ids]
+        name, ok = QInputDialog.getItem(self, "Remove Tile", "Tile to remove:", names, 0, False)
+        if ok and name in names:
+            self.remove_point_cloud_tile(ids[names.index(name)])
+
+    def on_tile_set_loaded(self, tile_set):
+        loader = self.sender()
+        if loader is not self.point_cloud_loader:
+            return
+        self.point_cloud_loader = None
+        first_load = not loader.base_set.tiles and not loader.preloaded
+
+        self.point_tiles = tile_set
+        self.point_tiles_corridor = (loader.corridor, loader.cache)
+        self.point_octree = None
+        self.point_cloud = tile_set.store
+        if first_load:
+            self.loaded_file_path = loader.file_path
+            self.loaded_file_name = os.path.splitext(os.path.basename(loader.file_path))[0]
+        self.update_progress(90, "Creating visualization...", process_events=False)
+        self.display_point_cloud(reset_camera=first_load)
+        self.update_progress(100, "Loading complete!", process_events=False)
+        QTimer.singleShot(500, self.hide_progress_bar)
+
+        self.message_text.append(f"Point cloud tiles loaded: {len(tile_set.tiles)} tile(s), {len(tile_set):,} points")
+        if loader.skipped:
+            self.message_text.append(f"   → Skipped {len(loader.skipped)} tile(s) outside the zero line corridor")
+        for path, error in loader.errors:
+            self.message_text.append(f"   → Failed to load {os.path.basename(path)}: {error}")
 
 # =======================================================================================================================================
     def show_help_dialog(self):
@@ -3558,11 +3564,11 @@ class PointCloudViewer(ApplicationUI):
                 # Zero line handling remains the same
                 if self.zero_line_set:
                     if self.zero_start_actor:
-                        self.zero_start_actor.SetVisibility(True)
+                        self.measurement_overlay.set_visible(self.zero_start_actor, True)
                     if self.zero_end_actor:
-                        self.zero_end_actor.SetVisibility(True)
+                        self.measurement_overlay.set_visible(self.zero_end_actor, True)
                     if self.zero_line_actor:
-                        self.zero_line_actor.SetVisibility(True)
+                        self.measurement_overlay.set_visible(self.zero_line_actor, True)
                     self.total_distance = self.zero_physical_dist
                     self.ax.set_xlim(0, self.total_distance)
                     self.update_chainage_ticks()
@@ -3618,11 +3624,11 @@ class PointCloudViewer(ApplicationUI):
             if line_type == 'zero':
                 if self.zero_line_set:
                     if self.zero_start_actor:
-                        self.zero_start_actor.SetVisibility(False)
+                        self.measurement_overlay.set_visible(self.zero_start_actor, False)
                     if self.zero_end_actor:
-                        self.zero_end_actor.SetVisibility(False)
+                        self.measurement_overlay.set_visible(self.zero_end_actor, False)
                     if self.zero_line_actor:
-                        self.zero_line_actor.SetVisibility(False)
+                        self.measurement_overlay.set_visible(self.zero_line_actor, False)
                     if self.zero_graph_line:
                         self.zero_graph_line.set_visible(False)
                             
@@ -3760,13 +3766,14 @@ class PointCloudViewer(ApplicationUI):
 
 # =======================================================================================================================================
 # UPDATE SCALE MARKER BASED ON SLIDER
-    def update_scale_marker(self):
+    def update_scale_marker(self, value=None):
         """Update red marker and chainage label when volume slider moves.
         Now snaps to nearest sub-interval (half of main interval) for better alignment."""
         if not self.zero_line_set or not hasattr(self, 'scale_ax'):
             return
 
-        value = self.volume_slider.value()
+        if value is None:
+            value = self.volume_slider.value()
         pos = value / 100.0 * self.total_distance
 
         interval = self.zero_interval
@@ -3788,21 +3795,24 @@ class PointCloudViewer(ApplicationUI):
 
         marker_label = f"Chainage: {start_km + km_offset}+{chainage_m:03d}"
 
-        # Remove old label
-        if hasattr(self, 'scale_marker_label'):
-            try:
-                self.scale_marker_label.remove()
-            except:
-                pass
-
-        # Add new label
-        self.scale_marker_label = self.scale_ax.text(
-            snapped_pos, 1.1, marker_label,
-            color='red', fontsize=10, fontweight='bold',
-            ha='center', va='bottom',
-            bbox=dict(boxstyle="round,pad=0.3", facecolor="white",
-                      edgecolor="red", alpha=0.9, linewidth=1)
-        )
+        # Move the existing label (it is only recreated when the scale axes were cleared)
+        label = getattr(self, 'scale_marker_label', None)
+        if label is not None and label.axes is self.scale_ax:
+            label.set_position((snapped_pos, 1.1))
+            label.set_text(marker_label)
+        else:
+            if label is not None:
+                try:
+                    label.remove()
+                except:
+                    pass
+            self.scale_marker_label = self.scale_ax.text(
+                snapped_pos, 1.1, marker_label,
+                color='red', fontsize=10, fontweight='bold',
+                ha='center', va='bottom',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="white",
+                          edgecolor="red", alpha=0.9, linewidth=1)
+            )
 
         # Update bottom indicator line
         if not hasattr(self, 'scale_marker_bottom'):
@@ -3810,7 +3820,8 @@ class PointCloudViewer(ApplicationUI):
         else:
             self.scale_marker_bottom.set_data([snapped_pos, snapped_pos], [0, 0.1])
 
-        self.scale_canvas.draw()
+        # draw_idle: repeated slider moves collapse into one repaint of the scale
+        self.scale_canvas.draw_idle()
 # =======================================================================================================================================
     def update_main_graph_marker(self, slider_value):
         """Update orange vertical marker on main 2D graph"""
@@ -3905,17 +3916,11 @@ class PointCloudViewer(ApplicationUI):
             return
         # Remove old actors
         if self.zero_start_actor:
-            self.renderer.RemoveActor(self.zero_start_actor)
-            if self.zero_start_actor in self.measurement_actors:
-                self.measurement_actors.remove(self.zero_start_actor)
+            self.remove_measurement_actor(self.zero_start_actor)
         if self.zero_end_actor:
-            self.renderer.RemoveActor(self.zero_end_actor)
-            if self.zero_end_actor in self.measurement_actors:
-                self.measurement_actors.remove(self.zero_end_actor)
+            self.remove_measurement_actor(self.zero_end_actor)
         if self.zero_line_actor:
-            self.renderer.RemoveActor(self.zero_line_actor)
-            if self.zero_line_actor in self.measurement_actors:
-                self.measurement_actors.remove(self.zero_line_actor)
+            self.remove_measurement_actor(self.zero_line_actor)
         
         # Recreate actors
         self.zero_start_actor = self.add_sphere_marker(self.zero_start_point, "Start", color="purple")
@@ -3945,7 +3950,7 @@ class PointCloudViewer(ApplicationUI):
         self.scale_canvas.draw()
         self.canvas.draw()
         self.figure.tight_layout()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
 # =======================================================================================================================================
 # In the update_scale_ticks method, improve the tick labels:
@@ -4854,100 +4859,819 @@ class PointCloudViewer(ApplicationUI):
 
 # ===========================================================================================================================================================
     def load_point_cloud(self):
+        if self.point_cloud is not None and self.point_cloud_loader is None:
+            box = QMessageBox(self)
+            box.setWindowTitle("Point Cloud")
+            box.setText("A point cloud is already loaded.")
+            add_button = box.addButton("Add Tiles...", QMessageBox.AcceptRole)
+            remove_button = box.addButton("Remove Tile...", QMessageBox.ActionRole) if self.point_tiles else None
+            replace_button = box.addButton("Replace...", QMessageBox.DestructiveRole)
+            box.addButton(QMessageBox.Cancel)
+            box.exec_()
+            clicked = box.clickedButton()
+            if clicked is remove_button and remove_button is not None:
+                self.remove_point_cloud_tile_dialog()
+                return
+            if clicked not in (add_button, replace_button):
+                return
+            adding = clicked is add_button
+        else:
+            adding = False
+
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(
-            self, "Open Point Cloud File", "",
-            "Point Cloud Files (*.ply *.pcd *.xyz);;All Files (*)")
-        if not file_path:
+        file_paths, _ = file_dialog.getOpenFileNames(
+            self, "Open Point Cloud File(s)", "",
+            "Point Cloud Files (*.las *.laz *.ply *.pcd *.xyz *.txt *.csv *.pts);;All Files (*)")
+        if not file_paths:
             return
-        try:
-            # --- Store the loaded file path and name for later use ---
-            self.loaded_file_path = file_path
-            self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-            # Show progress bar with file name
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-            # Read the file directly without intermediate processing steps
-            if file_path.endswith('.ply') or file_path.endswith('.pcd'):
-                self.update_progress(30, "Loading point cloud data...")
-                self.point_cloud = o3d.io.read_point_cloud(file_path)
-  
-            elif file_path.endswith('.xyz'):
-                self.update_progress(30, "Loading XYZ data...")
-                # For XYZ files, use numpy's faster loading
-                data = np.loadtxt(file_path, usecols=(0, 1, 2)) # Only load XYZ columns
-                self.point_cloud = o3d.geometry.PointCloud()
-                self.point_cloud.points = o3d.utility.Vector3dVector(data[:, :3])
-            if not self.point_cloud.has_points():
-                raise ValueError("No points found in the file.")
-            # Skip color processing if not needed for faster loading
-            if self.point_cloud.has_colors():
-                self.update_progress(70, "Processing colors...")
-            else:
-                self.update_progress(70, "Preparing visualization...")
-            # Directly convert to VTK format without intermediate steps
-            self.update_progress(90, "Creating visualization...")
-            self.display_point_cloud()
-            # Final update before hiding
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(100, self.hide_progress_bar)
-        except Exception as e:
-            self.hide_progress_bar()
+        # Reading and conversion happen in the background loader
+        if adding:
+            self.add_point_cloud_tiles(file_paths)
+        else:
+            # Inside a worksheet with a zero line, files and tiles are cropped to its corridor too
+            corridor, corridor_cache = self.get_current_worksheet_corridor()
+            self.load_point_cloud_files(file_paths, corridor, corridor_cache)
 
 
 # =======================================================================================================================================
-    def display_point_cloud(self):
+    def display_point_cloud(self, reset_camera=True):
         if not self.point_cloud:
             return
         # Clear previous point cloud if any
         if self.point_cloud_actor:
             self.renderer.RemoveActor(self.point_cloud_actor)
         self.update_progress(92, "Converting to VTK format...")
-        # Convert Open3D point cloud to VTK format
-        points = np.asarray(self.point_cloud.points)
-        # Create VTK points
-        vtk_points = vtk.vtkPoints()
-        for i, point in enumerate(points):
-            vtk_points.InsertNextPoint(point[0], point[1], point[2])
-            # Update progress every 1000 points
-            if i % 1000 == 0:
-                progress = 92 + int(6 * (i / len(points)))
-                self.update_progress(min(progress, 98), f"Processing points: {i}/{len(points)}")
-        # Create VTK polydata
-        polydata = vtk.vtkPolyData()
-        polydata.SetPoints(vtk_points)
-        # Create vertex cells
-        vertices = vtk.vtkCellArray()
-        for i in range(points.shape[0]):
-            vertices.InsertNextCell(1)
-            vertices.InsertCellPoint(i)
-        polydata.SetVerts(vertices)
-        # Add color information if available
         if self.point_cloud.has_colors():
             self.update_progress(95, "Processing colors...")
-            colors = np.asarray(self.point_cloud.colors) * 255 # Convert from 0-1 to 0-255
-            vtk_colors = vtk.vtkUnsignedCharArray()
-            vtk_colors.SetNumberOfComponents(3)
-            vtk_colors.SetName("Colors")
-            for color in colors:
-                vtk_colors.InsertNextTuple3(color[0], color[1], color[2])
-            polydata.GetPointData().SetScalars(vtk_colors)
         # Create mapper and actor
         self.update_progress(97, "Creating visualization...")
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputData(polydata)
-        self.point_cloud_actor = vtk.vtkActor()
-        self.point_cloud_actor.SetMapper(mapper)
-        self.point_cloud_actor.GetProperty().SetPointSize(2)
-        # Only set color if no vertex colors are present
-        if not self.point_cloud.has_colors():
-            self.point_cloud_actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
+        if self.point_octree is not None:
+            # Huge clouds: only the octree nodes the camera needs, under the point budget
+            self.octree_renderer = OctreeRenderer(self.point_octree, self.colors, self.lod_point_budget)
+            self.point_cloud_actor = self.octree_renderer.assembly
+        else:
+            self.octree_renderer = None
+            self.point_cloud_actor = self.create_point_cloud_actor(self.point_cloud)
         self.renderer.AddActor(self.point_cloud_actor)
-        self.renderer.ResetCamera()
+        if reset_camera:
+            self.renderer.ResetCamera()
+        self.refresh_point_cloud_lod(render=False)
+        # The cloud changed: snapping queries and chainage slicing need new indexes for it
+        self.rebuild_spatial_index()
+        self.rebuild_station_index()
+        self.rebuild_dtm()
+        self.reset_deviation()
         self.update_progress(99, "Finalizing...")
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         self.update_progress(100, "Ready!")
 
+    def create_point_cloud_actor(self, store):
+        """Create an actor for a PointStore.
+        The float32 offsets are wrapped as they are; the actor position carries the origin,
+        so picks and WorldToDisplay still work in world coordinates.
+        """
+        polydata = build_point_polydata(store.local_points, store.colors)
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputData(polydata)
+        actor = vtk.vtkActor()
+        actor.SetMapper(mapper)
+        actor.SetPosition(*store.origin)
+        actor.GetProperty().SetPointSize(2)
+        # Only set color if no vertex colors are present
+        if not store.has_colors():
+            actor.GetProperty().SetColor(self.colors.GetColor3d("Black"))
+        return actor
+
+    def snap_to_nearest_cloud_point(self, world_point):
+        """Return the world coordinates of the cloud point closest to world_point (or None)"""
+        if not self.point_cloud:
+            return None
+        index = self.get_spatial_index()
+        if index is not None:
+            return index.nearest_point(world_point)
+        # Index still building: one pass in the local float32 frame
+        local = self.point_cloud.local_points
+        distances = np.sum((local - self.point_cloud.to_local(world_point)) ** 2, axis=1)
+        return self.point_cloud.world_point(int(np.argmin(distances)))
+
+    def request_render(self):
+        """Schedule a render of the 3D view; many requests in one event-loop tick give one render"""
+        scheduler = getattr(self, 'render_scheduler', None)
+        if scheduler is None:
+            self.vtk_widget.GetRenderWindow().Render()
+        else:
+            scheduler.request()
+
+    def get_spatial_index(self):
+        """SpatialIndex of the current cloud, or None while it is (re)built in the background.
+        Measurement tools use it for snapping, radius and k-nearest queries.
+        """
+        if self.spatial_index is not None and self.spatial_index.is_for(self.point_cloud):
+            return self.spatial_index
+        return None
+
+    def rebuild_spatial_index(self):
+        """Drop the index of the previous cloud and build one for self.point_cloud in the background"""
+        self.spatial_index = None
+        self.spatial_index_builder = None      # a running build finishes but its result is ignored
+        if not self.point_cloud:
+            return
+        builder = SpatialIndexBuilder(self.point_cloud, self)
+        builder.built.connect(self.on_spatial_index_built)
+        builder.failed.connect(self.on_spatial_index_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.spatial_index_builder = builder
+        builder.start()
+
+    def on_spatial_index_built(self, index):
+        if self.sender() is not self.spatial_index_builder or not index.is_for(self.point_cloud):
+            return
+        self.spatial_index_builder = None
+        self.spatial_index = index
+        self.message_text.append(f"Point snapping index ready ({len(index):,} points)")
+
+    def on_spatial_index_failed(self, error):
+        if self.sender() is not self.spatial_index_builder:
+            return
+        self.spatial_index_builder = None
+        self.message_text.append(f"Could not build point snapping index: {error}")
+
+    def current_alignment_vertices(self):
+        """Plan polyline of the zero line with its curves, or None without a zero line"""
+        if not self.zero_line_set or self.zero_start_point is None or self.zero_end_point is None:
+            return None
+        return alignment_vertices(self.zero_start_point, self.zero_end_point, self.total_distance,
+                                  curves_from_labels(self.curve_labels))
+
+    def station_index_cache_dir(self):
+        if not self.current_worksheet_name:
+            return None
+        return os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, STATION_CACHE_DIR_NAME)
+
+    def current_cloud_signature(self):
+        """Fingerprint of self.point_cloud (source files + point sample), computed once per cloud"""
+        if self.station_cloud_signature is None or self.station_cloud_signature[0] is not self.point_cloud:
+            sources = self.point_tiles.file_paths() if self.point_tiles is not None else [getattr(self, 'loaded_file_path', None)]
+            self.station_cloud_signature = (self.point_cloud, cloud_signature(self.point_cloud, [p for p in sources if p]))
+        return self.station_cloud_signature[1]
+
+    def station_index_signature(self, vertices):
+        return alignment_signature(vertices) + self.current_cloud_signature()
+
+    def get_station_index(self):
+        """StationIndex of the current cloud and zero line, or None while it is loaded / built.
+        A stale index (other cloud or zero line) starts a rebuild in the background.
+        """
+        vertices = self.current_alignment_vertices()
+        if vertices is None or not self.point_cloud:
+            return None
+        signature = self.station_index_signature(vertices)
+        if self.station_index is not None and self.station_index.is_for(self.point_cloud, signature):
+            return self.station_index
+        builder = self.station_index_builder
+        if builder is None or builder.signature != signature or builder.store is not self.point_cloud:
+            self.rebuild_station_index(vertices, signature)
+        return None
+
+    def rebuild_station_index(self, vertices=None, signature=None):
+        """Load (worksheet cache) or build the chainage index of self.point_cloud in the background"""
+        self.cancel_station_index_build()
+        self.station_index = None
+        # The section window is reopened on the new index (see on_station_index_built)
+        self.close_section_window()
+        if vertices is None:
+            vertices = self.current_alignment_vertices()
+        if vertices is None or not self.point_cloud:
+            return
+        if signature is None:
+            signature = self.station_index_signature(vertices)
+        builder = StationIndexBuilder(self.point_cloud, vertices, signature, self.station_index_cache_dir(), self)
+        builder.built.connect(self.on_station_index_built)
+        builder.failed.connect(self.on_station_index_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.station_index_builder = builder
+        builder.start()
+
+    def cancel_station_index_build(self):
+        if self.station_index_builder is not None:
+            self.station_index_builder.cancel()
+            self.station_index_builder = None
+
+    def invalidate_station_index(self):
+        """The zero line changed: delete the saved index and restation the cloud"""
+        cache_dir = self.station_index_cache_dir()
+        self.cancel_station_index_build()
+        if cache_dir:
+            StationIndex.remove(cache_dir)
+        self.rebuild_station_index()
+
+    def on_station_index_built(self, index):
+        builder = self.sender()
+        if builder is not self.station_index_builder or index.store is not self.point_cloud:
+            return
+        self.station_index_builder = None
+        self.station_index = index
+        source = "loaded from worksheet cache" if builder.from_cache else "built"
+        self.message_text.append(f"Chainage index {source} ({len(index):,} points)")
+        if self.section_window_checkbox.isChecked() and self.section_window is None:
+            self.open_section_window()
+        if self.ground_profile_pending:
+            self.ground_profile_pending = False
+            self.start_ground_profile_extraction(index)
+        if self.cross_sections_pending:
+            self.cross_sections_pending = False
+            self.start_cross_section_build(index)
+        if self.deviation_pending:
+            self.deviation_pending = False
+            self.start_deviation_build(index)
+
+    def on_station_index_failed(self, error):
+        if self.sender() is not self.station_index_builder:
+            return
+        self.station_index_builder = None
+        self.ground_profile_pending = False
+        self.cross_sections_pending = False
+        self.deviation_pending = False
+        self.message_text.append(f"Could not build chainage index: {error}")
+
+    def write_operation_config(self, request, dtm):
+        """Write operation_config.json of a saved road surface (request from save_current_design_layer).
+        Volumes are taken against the ground DTM, or against the surface baseline when there is no cloud.
+        """
+        operations = []
+        if dtm is not None:
+            volume_method = f"Point Cloud DTM Grid ({EARTHWORK_RESOLUTION:.2f} m)"
+        else:
+            volume_method = f"Surface Baseline Grid ({EARTHWORK_RESOLUTION:.2f} m)"
+        road_surface_data = request["road_surface"]
+        if road_surface_data.get("polylines"):
+            points = road_surface_data["polylines"][0]["points"]  # assuming single main alignment
+            # Design levels swept along the alignment at their widths against the ground
+            volumes = segment_volumes(
+                [p["chainage_m"] for p in points], request["vertices"],
+                dtm.elevation_at if dtm is not None else None,
+                baseline_profile(road_surface_data), baseline_profile(request["construction"]), request["ref_z"],
+                request["w_road_surface"], request["w_construction"],
+                surface_profile=baseline_profile(request["surface"]))
+            operations = earthwork_operations(points, volumes, request["w_road_surface"], request["w_construction"])
+
+        # Sort segments by chainage string
+        operations.sort(key=lambda x: x["from_chainage_str"])
+
+        zero_line_start, zero_line_end = request["zero_line"]
+        config_data = {
+            "zero_line_start": zero_line_start,
+            "zero_line_end": zero_line_end,
+            "zero_start_elevation": request["ref_z"],
+            "total_chainage_length": request["zero_length"],
+            "volume_method": volume_method,
+            "segments": operations
+        }
+
+        config_path = os.path.join(request["layer_folder"], "operation_config.json")
+        try:
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            self.message_text.append(f"Created earthwork operation_config.json ({volume_method})")
+            return True
+        except Exception as e:
+            self.message_text.append(f"Warning: Could not create operation_config.json: {e}")
+            return False
+
+    def get_dtm(self):
+        """DTMGrid of the current cloud, or None while it is loaded / built in the background.
+        A cloud without a DTM (e.g. after a failed build) starts a build.
+        """
+        if self.dtm is None and self.dtm_builder is None and self.point_cloud:
+            self.rebuild_dtm()
+        return self.dtm
+
+    def rebuild_dtm(self):
+        """Load (worksheet cache, if the cloud fingerprint matches) or rasterize the DTM of self.point_cloud"""
+        self.cancel_dtm_build()
+        self.dtm = None
+        if not self.point_cloud:
+            return
+        cache_dir = None
+        if self.current_worksheet_name:
+            cache_dir = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, DTM_CACHE_DIR_NAME)
+        builder = DTMBuilder(self.point_cloud, dtm_signature(self.current_cloud_signature()), cache_dir, self)
+        builder.built.connect(self.on_dtm_built)
+        builder.failed.connect(self.on_dtm_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.dtm_builder = builder
+        builder.start()
+
+    def cancel_dtm_build(self):
+        if self.dtm_builder is not None:
+            self.dtm_builder.cancel()
+            self.dtm_builder = None
+
+    def on_dtm_built(self, grid):
+        builder = self.sender()
+        if builder is not self.dtm_builder or builder.store is not self.point_cloud:
+            return
+        self.dtm_builder = None
+        self.dtm = grid
+        rows, cols = grid.shape
+        source = "loaded from worksheet cache" if builder.from_cache else "built"
+        self.message_text.append(f"Ground DTM {source} ({cols} x {rows} nodes, {grid.cell_size:.2f} m)")
+        if self.earthwork_pending is not None:
+            request, self.earthwork_pending = self.earthwork_pending, None
+            self.write_operation_config(request, grid)
+
+    def on_dtm_failed(self, error):
+        if self.sender() is not self.dtm_builder:
+            return
+        self.dtm_builder = None
+        self.message_text.append(f"Could not build ground DTM: {error}")
+        if self.earthwork_pending is not None:
+            request, self.earthwork_pending = self.earthwork_pending, None
+            self.message_text.append("Earthwork volumes taken against the surface baseline instead")
+            self.write_operation_config(request, None)
+
+    def point_indices_near_chainage(self, chainage, half_width, max_offset=None):
+        """Indices into self.point_cloud of the points within half_width metres (along the zero line)
+        of a chainage and optionally within max_offset of it. Binary search in the chainage index
+        once it is ready, otherwise a one-off vectorised pass over the cloud.
+        """
+        index = self.get_station_index()
+        if index is not None:
+            return index.near(chainage, half_width, max_offset)
+        vertices = self.current_alignment_vertices()
+        if vertices is None or not self.point_cloud:
+            return np.empty(0, dtype=np.int64)
+        store = self.point_cloud
+        point_chainage, offset = station_coordinates(vertices[:, :2] - store.origin[:2], store.local_points)
+        mask = np.abs(point_chainage - chainage) <= half_width
+        if max_offset is not None:
+            mask &= np.abs(offset) <= max_offset
+        return np.flatnonzero(mask)
+
+    def toggle_section_window(self, checked):
+        if checked:
+            self.open_section_window()
+        else:
+            self.close_section_window()
+            self.request_render()
+
+    def open_section_window(self):
+        """Swap the full cloud for the points around the slider chainage (needs the chainage index)"""
+        if not self.zero_line_set or not self.point_cloud:
+            self.message_text.append("Section window needs a loaded point cloud and a zero line.")
+            self.section_window_checkbox.setChecked(False)
+            return
+        index = self.get_station_index()
+        if index is None:
+            # Opened from on_station_index_built once the index is ready
+            self.message_text.append("Section window: waiting for the chainage index...")
+            return
+        self.close_section_window()
+        self.section_window = SectionWindowRenderer(index, self.colors, self.section_window_spin.value(),
+                                                    self.section_context_checkbox.isChecked())
+        for actor in self.section_window.actors():
+            self.renderer.AddActor(actor)
+        if self.deviation_table is not None and self.deviation is not None and len(self.deviation) == len(index):
+            self.section_window.set_scalars(self.deviation.values, self.deviation_table, "Deviation")
+        if self.point_cloud_actor:
+            self.point_cloud_actor.SetVisibility(False)
+        self.update_section_window(self.volume_slider.value())
+        self.message_text.append(f"Section window on: ±{self.section_window.half_width:.1f} m around the slider chainage")
+
+    def close_section_window(self):
+        """Back to drawing the full cloud"""
+        if self.section_window is None:
+            return
+        for actor in self.section_window.actors():
+            self.renderer.RemoveActor(actor)
+        self.section_window = None
+        if self.point_cloud_actor:
+            self.point_cloud_actor.SetVisibility(True)
+            self.refresh_point_cloud_lod(render=False)
+
+    def update_section_window(self, slider_value):
+        """Move the section window to the slider chainage (only the drawn index range changes)"""
+        if self.section_window is None or not self.zero_line_set:
+            return
+        if self.section_window.set_chainage(slider_value / 100.0 * self.total_distance):
+            self.request_render()
+
+    def on_section_window_width_changed(self, half_width):
+        if self.section_window is not None and self.section_window.set_half_width(half_width):
+            self.request_render()
+
+    def on_section_context_toggled(self, checked):
+        if self.section_window is not None:
+            self.section_window.set_context_visible(checked)
+            self.request_render()
+
+    def extract_ground_profile(self):
+        """Auto button of the Surface Line: fit the surface line to the cloud along the zero line"""
+        if not self.zero_line_set:
+            QMessageBox.warning(self, "Zero Line Required", "Set the zero line before extracting the ground profile.")
+            return
+        if not self.point_cloud:
+            QMessageBox.warning(self, "No Point Cloud", "Load a point cloud before extracting the ground profile.")
+            return
+        if self.ground_profile_extractor is not None:
+            self.message_text.append("Ground profile extraction is already running")
+            return
+        interval, band, percentile = self.ground_profile_params
+        dialog = GroundProfileDialog(interval, band, percentile, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.ground_profile_params = dialog.get_values()
+
+        if self.line_types['surface']['polylines']:
+            reply = QMessageBox.question(self, "Replace Surface Line",
+                                         "Replace the existing surface line with the extracted profile?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            self.clear_line_type('surface')
+            self.road_lines_data.pop('surface', None)
+
+        index = self.get_station_index()
+        if index is None:
+            # The chainage index is still loading / building: extract as soon as it is ready
+            self.ground_profile_pending = True
+            self.message_text.append("Waiting for the chainage index before extracting the ground profile...")
+            return
+        self.start_ground_profile_extraction(index)
+
+    def start_ground_profile_extraction(self, index):
+        interval, band, percentile = self.ground_profile_params
+        extractor = GroundProfileExtractor(index, self.zero_start_z, 0.0, self.total_distance,
+                                           interval, band, percentile, self)
+        extractor.progress.connect(self.on_ground_profile_progress)
+        extractor.extracted.connect(self.on_ground_profile_extracted)
+        extractor.failed.connect(self.on_ground_profile_failed)
+        extractor.finished.connect(extractor.deleteLater)
+        self.ground_profile_extractor = extractor
+        self.show_progress_bar(cancellable=True)
+        self.update_progress(0, "Extracting ground profile...", process_events=False)
+        extractor.start()
+
+    def cancel_ground_profile_extraction(self):
+        self.ground_profile_pending = False
+        extractor = self.ground_profile_extractor
+        if extractor is None:
+            return
+        self.ground_profile_extractor = None
+        extractor.cancel()
+        self.hide_progress_bar()
+        self.message_text.append("Ground profile extraction cancelled")
+
+    def on_ground_profile_progress(self, value, message):
+        if self.sender() is self.ground_profile_extractor:
+            self.update_progress(value, message, process_events=False)
+
+    def on_ground_profile_extracted(self, polylines):
+        if self.sender() is not self.ground_profile_extractor:
+            return
+        self.ground_profile_extractor = None
+        self.hide_progress_bar()
+        if not polylines:
+            self.message_text.append("No ground points found along the zero line: widen the band or the interval")
+            return
+
+        # Same bookkeeping as a surface line drawn by hand (see finish_current_polyline)
+        color = self.line_types['surface']['color']
+        for points in polylines:
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            line_artist, = self.ax.plot(xs, ys, color=color, linewidth=2, marker='o', markersize=2)
+            self.line_types['surface']['artists'].append(line_artist)
+            self.line_types['surface']['polylines'].append(points)
+            if self.current_mode == 'road':
+                self.road_lines_data.setdefault('surface', {'polylines': [], 'artists': []})['polylines'].append(list(points))
+            length = float(np.sum(np.hypot(np.diff(xs), np.diff(ys))))
+            ann = self.ax.annotate(f'{length:.2f}m', xy=points[-1], xytext=(5, 5),
+                                   textcoords='offset points',
+                                   bbox=dict(boxstyle='round,pad=0.3', fc='white', alpha=0.7),
+                                   arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+            self.all_graph_lines.append(('surface', points, line_artist, ann))
+        self.canvas.draw_idle()
+
+        point_count = sum(len(points) for points in polylines)
+        gaps = f", {len(polylines) - 1} gap(s) without ground points" if len(polylines) > 1 else ""
+        self.message_text.append(f"Surface line extracted from the point cloud: {point_count} points{gaps}")
+
+    def on_ground_profile_failed(self, error):
+        if self.sender() is not self.ground_profile_extractor:
+            return
+        self.ground_profile_extractor = None
+        self.hide_progress_bar()
+        self.message_text.append(f"Could not extract ground profile: {error}")
+
+    def cross_section_stations(self):
+        interval = self.zero_interval if self.zero_interval and self.zero_interval > 0 else 20.0
+        return section_stations(self.total_distance, interval)
+
+    def open_cross_sections(self):
+        """Cross Sections button: browse the sections at every zero line interval (computed once, then cached)"""
+        if not self.zero_line_set:
+            QMessageBox.warning(self, "Zero Line Required", "Set the zero line before generating cross sections.")
+            return
+        if not self.point_cloud:
+            QMessageBox.warning(self, "No Point Cloud", "Load a point cloud before generating cross sections.")
+            return
+        if self.cross_section_builder is not None:
+            self.message_text.append("Cross sections are already being computed")
+            return
+        index = self.get_station_index()
+        if index is None:
+            self.cross_sections_pending = True
+            self.message_text.append("Waiting for the chainage index before computing cross sections...")
+            return
+        self.start_cross_section_build(index)
+
+    def start_cross_section_build(self, index):
+        stations = self.cross_section_stations()
+        params = {"slab": DEFAULT_SECTION_SLAB, "reach": DEFAULT_SECTION_REACH,
+                  "bin_width": DEFAULT_OFFSET_BIN, "percentile": DEFAULT_SECTION_PERCENTILE}
+        signature = section_signature(index.signature, stations, **params)
+        if self.cross_sections is not None and self.cross_sections.signature == signature:
+            self.show_cross_section_dialog()
+            return
+        cache_dir = None
+        if self.current_worksheet_name:
+            cache_dir = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, SECTION_CACHE_DIR_NAME)
+        builder = CrossSectionBuilder(index, stations, self.zero_start_z, params, signature, cache_dir, self)
+        builder.progress.connect(self.on_cross_section_progress)
+        builder.built.connect(self.on_cross_sections_built)
+        builder.failed.connect(self.on_cross_sections_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.cross_section_builder = builder
+        self.show_progress_bar(cancellable=True)
+        self.update_progress(0, "Computing cross sections...", process_events=False)
+        builder.start()
+
+    def cancel_cross_section_build(self):
+        self.cross_sections_pending = False
+        builder = self.cross_section_builder
+        if builder is None:
+            return
+        self.cross_section_builder = None
+        builder.cancel()
+        self.hide_progress_bar()
+        self.message_text.append("Cross section computation cancelled")
+
+    def on_cross_section_progress(self, value, message):
+        if self.sender() is self.cross_section_builder:
+            self.update_progress(value, message, process_events=False)
+
+    def on_cross_sections_built(self, sections):
+        builder = self.sender()
+        if builder is not self.cross_section_builder:
+            return
+        self.cross_section_builder = None
+        self.hide_progress_bar()
+        self.cross_sections = sections
+        source = "loaded from worksheet cache" if builder.from_cache else "computed"
+        self.message_text.append(f"{len(sections)} cross section(s) {source}")
+        self.show_cross_section_dialog()
+
+    def on_cross_sections_failed(self, error):
+        if self.sender() is not self.cross_section_builder:
+            return
+        self.cross_section_builder = None
+        self.hide_progress_bar()
+        self.message_text.append(f"Could not compute cross sections: {error}")
+
+    def show_cross_section_dialog(self):
+        """(Re)open the browser on self.cross_sections with the baselines of the current design layer"""
+        layer_folder = None
+        if self.current_worksheet_name and getattr(self, 'current_layer_name', None):
+            layer_folder = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name,
+                                        "designs", self.current_layer_name)
+        if self.cross_section_dialog is not None:
+            self.cross_section_dialog.close()
+        self.cross_section_dialog = CrossSectionDialog(self.cross_sections, load_design_baselines(layer_folder),
+                                                       lambda x: self.format_chainage(x, for_dialog=True), self)
+        self.cross_section_dialog.show_chainage(self.volume_slider.value() / 100.0 * self.total_distance)
+        self.cross_section_dialog.show()
+
+    def design_baselines_for_deviation(self):
+        """{key: baseline dict} of the current design layer's road_surface / construction with a width"""
+        baselines = {}
+        if not self.current_worksheet_name or not getattr(self, 'current_layer_name', None):
+            return baselines
+        layer_folder = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name,
+                                    "designs", self.current_layer_name)
+        for key in DEVIATION_BASELINES:
+            path = os.path.join(layer_folder, f"{key}_baseline.json")
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                self.message_text.append(f"Could not read {path}: {str(e)}")
+                continue
+            width = data.get("width_meters") or self.baseline_widths.get(key, 0.0)
+            if data.get("polylines") and width and width > 0:
+                data["width_meters"] = float(width)
+                baselines[key] = data
+        return baselines
+
+    def toggle_deviation_heatmap(self, checked):
+        """Deviation button: colour the cloud by its signed vertical distance to a saved design baseline"""
+        if not checked:
+            self.cancel_deviation_build()
+            self.show_deviation(None)
+            return
+        if not self.zero_line_set or not self.point_cloud:
+            QMessageBox.warning(self, "Deviation", "Load a point cloud and set the zero line first.")
+            self.deviation_button.setChecked(False)
+            return
+        baselines = self.design_baselines_for_deviation()
+        if not baselines:
+            QMessageBox.warning(self, "Deviation", "Save a road surface or construction baseline (with its width) "
+                                                   "in the current design layer first.")
+            self.deviation_button.setChecked(False)
+            return
+        keys = list(baselines)
+        key = keys[0]
+        if len(keys) > 1:
+            key, ok = QInputDialog.getItem(self, "Deviation", "Compare the point cloud with:", keys, 0, False)
+            if not ok:
+                self.deviation_button.setChecked(False)
+                return
+        self.deviation_request = (key, baselines[key])
+        index = self.get_station_index()
+        if index is None:
+            self.deviation_pending = True
+            self.message_text.append("Waiting for the chainage index before computing deviations...")
+            return
+        self.start_deviation_build(index)
+
+    def start_deviation_build(self, index):
+        key, data = self.deviation_request
+        width = data["width_meters"]
+        signature = deviation_signature(index.signature, data, self.zero_start_z, width)
+        if self.deviation is not None and self.deviation.signature == signature:
+            self.show_deviation(self.deviation)
+            return
+        cache_dir = None
+        if self.current_worksheet_name:
+            cache_dir = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, DEVIATION_CACHE_DIR_NAME, key)
+        builder = DeviationBuilder(index, key, data, self.zero_start_z, width, signature, cache_dir, self)
+        builder.progress.connect(self.on_deviation_progress)
+        builder.built.connect(self.on_deviation_built)
+        builder.failed.connect(self.on_deviation_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.deviation_builder = builder
+        self.show_progress_bar(cancellable=True)
+        self.update_progress(0, "Computing deviations...", process_events=False)
+        builder.start()
+
+    def cancel_deviation_build(self):
+        self.deviation_pending = False
+        builder = self.deviation_builder
+        if builder is None:
+            return
+        self.deviation_builder = None
+        builder.cancel()
+        self.hide_progress_bar()
+        self.message_text.append("Deviation computation cancelled")
+        self.deviation_button.setChecked(False)
+
+    def reset_deviation(self):
+        """The cloud changed: drop its deviations (the worksheet cache still has them)"""
+        self.cancel_deviation_build()
+        self.deviation = None
+        self.deviation_button.setChecked(False)
+        self.show_deviation(None)
+
+    def restore_deviation_heatmap(self, request):
+        """Turn the heatmap back on for the current cloud after it was reset (same design baseline)"""
+        self.deviation_request = request
+        self.deviation_button.blockSignals(True)
+        self.deviation_button.setChecked(True)
+        self.deviation_button.blockSignals(False)
+        index = self.get_station_index()
+        if index is None:
+            self.deviation_pending = True
+            return
+        self.start_deviation_build(index)
+
+    def on_deviation_progress(self, value, message):
+        if self.sender() is self.deviation_builder:
+            self.update_progress(value, message, process_events=False)
+
+    def on_deviation_built(self, field):
+        builder = self.sender()
+        if builder is not self.deviation_builder:
+            return
+        self.deviation_builder = None
+        self.hide_progress_bar()
+        if builder.station_index.store is not self.point_cloud:
+            return
+        self.deviation = field
+        stats = field.summary()
+        source = "loaded from worksheet cache" if builder.from_cache else "computed"
+        if stats["count"] == 0:
+            self.message_text.append(f"No cloud points within the {field.baseline_key} width: nothing to compare")
+        else:
+            self.message_text.append(
+                f"Deviation from {field.baseline_key} {source}: {stats['count']:,} points, "
+                f"mean {stats['mean'] * 1000:+.0f} mm, RMS {stats['rms'] * 1000:.0f} mm, "
+                f"range {stats['min'] * 1000:+.0f} / {stats['max'] * 1000:+.0f} mm")
+        if self.deviation_button.isChecked():
+            self.show_deviation(field)
+
+    def on_deviation_failed(self, error):
+        if self.sender() is not self.deviation_builder:
+            return
+        self.deviation_builder = None
+        self.hide_progress_bar()
+        self.deviation_button.setChecked(False)
+        self.message_text.append(f"Could not compute deviations: {error}")
+
+    def show_deviation(self, field):
+        """Colour the cloud actor by a DeviationField through a blue-white-red table (None: back to RGB)"""
+        values = field.values if field is not None else None
+        table = make_diverging_lookup_table(DEFAULT_DEVIATION_RANGE) if field is not None else None
+        self.deviation_table = table
+        if self.octree_renderer is not None:
+            self.octree_renderer.set_scalars(values, table, "Deviation")
+        elif self.point_cloud_actor is not None and self.point_cloud_actor.GetMapper() is not None:
+            set_point_scalars(self.point_cloud_actor.GetMapper(), values, table, "Deviation")
+        if self.section_window is not None:
+            self.section_window.set_scalars(values, table, "Deviation")
+        if self.deviation_scalar_bar is not None:
+            self.renderer.RemoveViewProp(self.deviation_scalar_bar)
+            self.deviation_scalar_bar = None
+        if field is not None:
+            bar = vtk.vtkScalarBarActor()
+            bar.SetLookupTable(table)
+            bar.SetTitle(f"{field.baseline_key} deviation (m)")
+            bar.SetNumberOfLabels(5)
+            bar.SetWidth(0.08)
+            bar.SetHeight(0.4)
+            bar.SetPosition(0.9, 0.05)
+            self.renderer.AddViewProp(bar)
+            self.deviation_scalar_bar = bar
+        self.request_render()
+
+    def refresh_point_cloud_lod(self, render=True):
+        """Load / drop octree nodes for the current camera; returns True if the drawn nodes changed"""
+        if self.octree_renderer is None or self.section_window is not None:
+            return False                        # nothing to refine while the section window replaces the cloud
+        changed = self.octree_renderer.update(self.renderer)
+        if changed and render:
+            self.request_render()
+        return changed
+
+    def on_camera_modified(self, obj, event):
+        if self.octree_renderer is not None:
+            self.lod_refresh_timer.start()
+
+    def start_octree_build(self, file_path, store):
+        """Write the level-of-detail octree for a loaded cloud in the background"""
+        self.cancel_octree_build()
+        builder = PointOctreeBuilder(file_path, store, self)
+        builder.built.connect(self.on_octree_built)
+        builder.failed.connect(self.on_octree_build_failed)
+        builder.finished.connect(builder.deleteLater)
+        self.octree_builder = builder
+        builder.start()
+        self.message_text.append(f"Building level-of-detail octree for {os.path.basename(file_path)} "
+                                 f"({len(store):,} points) in background...")
+
+    def cancel_octree_build(self):
+        builder = self.octree_builder
+        if builder is None:
+            return
+        self.octree_builder = None
+        builder.cancel()
+
+    def on_octree_built(self, octree):
+        builder = self.sender()
+        if builder is not self.octree_builder:
+            return
+        self.octree_builder = None
+        if builder.file_path != self.loaded_file_path:
+            return
+        # The octree holds the same points reordered by node; use its mapped copy from now on
+        heatmap = self.deviation_request if self.deviation_button.isChecked() else None
+        self.point_octree = octree
+        self.point_cloud = octree.store
+        self.display_point_cloud(reset_camera=False)
+        if heatmap is not None:
+            # Deviations are stored in point order: recompute (or load) them for the octree order
+            self.restore_deviation_heatmap(heatmap)
+        self.message_text.append(f"Level-of-detail octree ready: {octree.octree_dir}")
+
+    def on_octree_build_failed(self, error):
+        builder = self.sender()
+        if builder is not self.octree_builder:
+            return
+        self.octree_builder = None
+        self.message_text.append(f"Could not build level-of-detail octree "
+                                 f"for {os.path.basename(builder.file_path)}: {error}")
+
 # ========================================================================================================
 # Define function for the mesurement type:
     def set_measurement_type(self, m_type):
@@ -4991,35 +5715,133 @@ class PointCloudViewer(ApplicationUI):
 # =================================================================================================================================
 # Define the function for the update the mesurement metrics as per the selected metrics::
     def update_measurement_metrics(self):
-        """Update all measurements when the units change"""
-        if not hasattr(self, 'measurement_points') or not self.measurement_points:
+        """Rewrite all measurement labels in the current units (one batched label update)"""
+        units_suffix, _ = self.get_current_units()
+        stores = set(self.measurement_layers.values()) | {self.measurement_store}
+        if sum(store.relabel(units_suffix) for store in stores):
+            self.request_render()
+
+# ==================================================================================================================================
+    def record_measurement(self, kind, points, values, quantities=None, names="", color="Red", closed=False,
+                           outline=True):
+        """Keep a measurement's values (metres) in the measurement store; returns the record for its labels"""
+        rgb = self.colors.GetColor3d(color)
+        return self.measurement_store.add(kind, points, values, quantities, names, (rgb[0], rgb[1], rgb[2]),
+                                          closed, outline)
+
+    def measurement_layer_folder(self, layer_name):
+        """Folder of a measurement layer in the active worksheet, or None without a worksheet"""
+        if not getattr(self, 'current_worksheet_name', None):
+            return None
+        return os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name, "measurements",
+                            layer_name or "default")
+
+    def activate_measurement_layer(self, layer_name):
+        """Make a layer's store the one new measurements are recorded in (created if needed)"""
+        store = self.measurement_layers.get(layer_name)
+        if store is None:
+            if self.measurement_store.layer_name is None and self.measurement_store not in self.measurement_layers.values():
+                store = self.measurement_store          # measurements made before the layer was named
+                store.layer_name = layer_name
+            else:
+                store = MeasurementStore(self.measurement_overlay, self.measurement_store.units, layer_name)
+            self.measurement_layers[layer_name] = store
+            if self.current_worksheet_name:
+                self.add_measurement_layer_checkbox(layer_name, store.visible)
+        self.measurement_store = store
+        return store
+
+    def add_measurement_layer_checkbox(self, layer_name, checked):
+        """Show / hide checkbox of a measurement layer in the 3D layer panel (one per layer)"""
+        if layer_name in self.measurement_layer_checkboxes:
             return
-        # Get the current units suffix
-        units_suffix = self.get_units_suffix()
-        # Update all measurement labels
-        for actor in self.measurement_actors:
-            if isinstance(actor, vtk.vtkFollower):
+        self.measurement_layer_checkboxes[layer_name] = self.add_layer_to_panel(
+            layer_name, "3D", lambda visible: self.set_measurement_layer_visible(layer_name, visible), checked)
+
+    def save_measurement_session(self):
+        """Write every changed measurement layer (one measurements.npz each); returns the active layer's file"""
+        if self.measurement_store not in self.measurement_layers.values():
+            self.activate_measurement_layer(getattr(self, 'current_layer_name', None) or "default")
+        saved = None
+        for name, store in self.measurement_layers.items():
+            folder = self.measurement_layer_folder(name)
+            if folder is None or not os.path.isdir(os.path.dirname(folder)):
+                return None
+            if not store.dirty and os.path.exists(os.path.join(folder, MEASUREMENT_LAYER_FILE)):
+                path = os.path.join(folder, MEASUREMENT_LAYER_FILE)
+            else:
                 try:
-                    text_source = actor.GetMapper().GetInputConnection(0, 0).GetProducer()
-                    if isinstance(text_source, vtk.vtkVectorText):
-                        text = text_source.GetText()
-                        if text and any(x in text for x in ['m', 'ft', 'cm', 'mm']):
-                            # This is a measurement label - update it
-                            if '=' in text: # Angle label
-                                continue # Don't modify angle labels
-              
-                            # Extract the numeric value
-                            try:
-                                value_str = text.split('=')[-1].strip().rstrip('m').rstrip('cm').rstrip('mm')
-                                value_meters = float(value_str)
-                                converted_value = self.convert_to_current_units(value_meters)
-                                new_text = f"{converted_value:.2f}{units_suffix}"
-                                text_source.SetText(new_text)
-                            except:
-                                continue
-                except:
-                    continue
-        self.vtk_widget.GetRenderWindow().Render()
+                    path = store.save(folder)
+                except Exception as e:
+                    self.message_text.append(f"Could not save measurement layer '{name}': {str(e)}")
+                    return None
+                self.message_text.append(f"Saved {len(store)} measurements to {path}")
+            if store is self.measurement_store:
+                saved = path
+        return saved
+
+    def close_measurement_layers(self):
+        """Remove every measurement layer and its drawn items"""
+        removed = set()
+        for store in list(self.measurement_layers.values()) + [self.measurement_store]:
+            for item in store.items:
+                self.measurement_overlay.remove(item)
+                removed.add(id(item))
+            store.clear()
+        # One pass over measurement_actors, however many items the layers had
+        self.measurement_actors = [actor for actor in self.measurement_actors if id(actor) not in removed]
+        self.request_render()
+        for checkbox in self.measurement_layer_checkboxes.values():
+            checkbox.blockSignals(True)
+            checkbox.setParent(None)
+            checkbox.deleteLater()
+        self.measurement_layer_checkboxes = {}
+        self.measurement_layers = {}
+        self.measurement_store = MeasurementStore(self.measurement_overlay, self.measurement_store.units)
+
+    def load_measurement_session(self, shown_layer=None):
+        """Register the worksheet's saved measurement layers without drawing them; shown_layer is drawn
+        and becomes the active layer, the others are drawn the first time they are ticked in the panel
+        """
+        folder = self.measurement_layer_folder(None)
+        if folder is None:
+            return False
+        self.close_measurement_layers()
+        measurements_folder = os.path.dirname(folder)
+        names = sorted(name for name in os.listdir(measurements_folder)
+                       if os.path.isfile(os.path.join(measurements_folder, name, MEASUREMENT_LAYER_FILE))) \
+            if os.path.isdir(measurements_folder) else []
+        for name in names:
+            store = MeasurementStore(self.measurement_overlay, self.measurement_store.units, name)
+            if store.load(os.path.join(measurements_folder, name)):
+                self.measurement_layers[name] = store
+        self.activate_measurement_layer(shown_layer or "default")
+        for name in self.measurement_layers:
+            self.add_measurement_layer_checkbox(name, name == self.measurement_store.layer_name)
+        # Loaded layers are labelled in the selected units, whatever units they were saved in
+        self.update_measurement_metrics()
+        self.set_measurement_layer_visible(self.measurement_store.layer_name, True)
+        self.message_text.append(f"Found {len(self.measurement_layers)} measurement layers "
+                                 f"({len(self.measurement_store)} measurements in '{self.measurement_store.layer_name}')")
+        return True
+
+    def set_measurement_layer_visible(self, layer_name, visible):
+        """Show / hide a measurement layer; its overlay items are only created when it is first shown"""
+        store = self.measurement_layers.get(layer_name)
+        if store is None:
+            return
+        self.measurement_actors.extend(store.set_visible(visible))
+        self.request_render()
+
+    def undraw_measurement_layers(self):
+        """After the overlay was cleared: every layer is undrawn and unticked (drawn again when ticked)"""
+        for name, store in self.measurement_layers.items():
+            store.undraw()
+            checkbox = self.measurement_layer_checkboxes.get(name)
+            if checkbox is not None:
+                checkbox.blockSignals(True)
+                checkbox.setChecked(False)
+                checkbox.blockSignals(False)
 
 # ==================================================================================================================================
     def get_current_units(self):
@@ -5063,35 +5885,32 @@ class PointCloudViewer(ApplicationUI):
 # Define function to add sphere marker:
     def add_sphere_marker(self, point, label=None, radius = 0.07, color="Red"):
         """Add a sphere marker at the specified position with optional label"""
-        sphere = vtkSphereSource()
-        sphere.SetRadius(radius)
-        sphere.SetCenter(point[0], point[1], point[2])
-        mapper = vtkPolyDataMapper()
-        mapper.SetInputConnection(sphere.GetOutputPort())
-        actor = vtkActor()
-        actor.SetMapper(mapper)
-        actor.GetProperty().SetColor(self.colors.GetColor3d(color)) # Use specified color
+        overlay = self.measurement_overlay
+        marker = overlay.add_marker(point, radius, self.colors.GetColor3d(color)) # Use specified color
         if hasattr(self, 'measurement_points'):
-            actor.point_index = len(self.measurement_points) - 1 # Store reference
-        self.renderer.AddActor(actor)
-        self.measurement_actors.append(actor)
+            marker.point_index = len(self.measurement_points) - 1 # Store reference
+        self.measurement_actors.append(marker)
         # Add label if provided
         if label:
-            text = vtk.vtkVectorText()
-            text.SetText(label)
-            text_mapper = vtk.vtkPolyDataMapper()
-            text_mapper.SetInputConnection(text.GetOutputPort())
-            text_actor = vtk.vtkFollower()
-            text_actor.SetMapper(text_mapper)
-            text_actor.SetScale(0.1, 0.1, 0.1)
-            text_actor.AddPosition(point[0] + 0.15, point[1] + 0.15, point[2])
-            text_actor.GetProperty().SetColor(self.colors.GetColor3d("White"))
-            self.renderer.AddActor(text_actor)
-            text_actor.SetCamera(self.renderer.GetActiveCamera())
-            self.measurement_actors.append(text_actor)
-        self.vtk_widget.GetRenderWindow().Render()
-        return actor # Return the sphere actor
+            marker.label = overlay.add_label([point[0] + 0.15, point[1] + 0.15, point[2]], label,
+                                             self.colors.GetColor3d("White"), label_font_size(0.1))
+            self.measurement_actors.append(marker.label)
+        self.request_render()
+        return marker # Return the sphere marker
     
+# ==================================================================================================================================
+    def remove_measurement_actor(self, actor):
+        """Remove a measurement item (overlay item or plain VTK actor) from the scene and measurement_actors"""
+        if isinstance(actor, OverlayItem):
+            self.measurement_overlay.remove(actor)
+            if actor.label in self.measurement_actors:
+                self.measurement_actors.remove(actor.label)
+        else:
+            self.renderer.RemoveActor(actor)
+        if actor in self.measurement_actors:
+            self.measurement_actors.remove(actor)
+        self.request_render()
+
 # ==================================================================================================================================
     def find_nearest_point_in_neighborhood(self, click_pos, search_radius=4):
         """Find the nearest point in a neighborhood around the click position.
@@ -5103,54 +5922,22 @@ class PointCloudViewer(ApplicationUI):
         """
         if not hasattr(self, 'point_cloud') or not self.point_cloud:
             return None
-        points = np.asarray(self.point_cloud.points)
-        if len(points) == 0:
-            return None
-        # Convert all points to display coordinates
-        renderer = self.renderer
-        display_coords = []
-        for point in points:
-            try:
-                display_coord = renderer.WorldToDisplay(point[0], point[1], point[2])
-                display_coords.append(display_coord[:2]) # Only need x,y
-            except:
-                continue
-        if not display_coords:
-            return None
-        display_coords = np.array(display_coords)
-        # Calculate distances from click position
-        distances = np.sqrt(
-            (display_coords[:, 0] - click_pos[0])**2 +
-            (display_coords[:, 1] - click_pos[1])**2
-        )
-        # Find the closest point within radius
-        valid_indices = np.where(distances <= search_radius)[0]
-        if len(valid_indices) == 0:
-            return None
-        closest_idx = valid_indices[np.argmin(distances[valid_indices])]
-        return points[closest_idx]
+        # Batched projection with the camera matrix; only points near the pick ray once the index is ready
+        return self.screen_picker.pick(self.renderer, self.point_cloud, click_pos, search_radius,
+                                       index=self.get_spatial_index())
     
 # =========================================================================================================================================
 # Define function for connect two points:
     def add_line_between_points(self, p1, p2, color, label=None, show_label=True):
-        line = vtkLineSource()
-        line.SetPoint1(p1[0], p1[1], p1[2])
-        line.SetPoint2(p2[0], p2[1], p2[2])
-        mapper = vtkPolyDataMapper()
-        mapper.SetInputConnection(line.GetOutputPort())
-        actor = vtkActor()
-        actor.SetMapper(mapper)
-        actor.GetProperty().SetColor(self.colors.GetColor3d(color))
-        actor.GetProperty().SetLineWidth(2)
-        self.renderer.AddActor(actor)
-        self.measurement_actors.append(actor)
+        segment = self.measurement_overlay.add_segment(p1, p2, self.colors.GetColor3d(color))
+        self.measurement_actors.append(segment)
         if show_label:
-            # Calculate distance for label if not provided
+            # Without a label the segment length is shown, kept as a measurement of its own
+            record = None
             if label is None:
-                distance_meters = sqrt(sum((p1 - p2) ** 2))
-                units_suffix, conversion_factor = self.get_current_units()
-                distance = distance_meters * conversion_factor
-                label = f"{distance:.2f} "
+                record = self.record_measurement('segment', [p1, p2], {'length': sqrt(sum((p1 - p2) ** 2))},
+                                                 color=color)
+                label = ""
             # Calculate midpoint for label position
             midpoint = [(p1[0] + p2[0])/2,
                         (p1[1] + p2[1])/2,
@@ -5173,20 +5960,13 @@ class PointCloudViewer(ApplicationUI):
             else:
                 # Points are identical or very close
                 label_pos = midpoint
-            text = vtk.vtkVectorText()
-            text.SetText(label)
-            text_mapper = vtk.vtkPolyDataMapper()
-            text_mapper.SetInputConnection(text.GetOutputPort())
-            text_actor = vtk.vtkFollower()
-            text_actor.SetMapper(text_mapper)
-            text_actor.SetScale(0.5, 0.5, 0.5) # Increased size to 0.5
-            text_actor.AddPosition(label_pos[0], label_pos[1], label_pos[2])
-            text_actor.GetProperty().SetColor(self.colors.GetColor3d("Blue")) # Blue color
-            self.renderer.AddActor(text_actor)
-            text_actor.SetCamera(self.renderer.GetActiveCamera())
-            self.measurement_actors.append(text_actor)
-            self.vtk_widget.GetRenderWindow().Render()
-            return actor
+            segment.label = self.measurement_overlay.add_label(label_pos, label, self.colors.GetColor3d("Blue"),
+                                                                label_font_size(0.5)) # Blue color
+            self.measurement_actors.append(segment.label)
+            if record is not None:
+                self.measurement_store.attach_label(record, segment.label, "{length}")
+        self.request_render()
+        return segment
         
 # ==================================================================================================================================
 # Define function add angle label on point cloud data point:
@@ -5196,51 +5976,24 @@ class PointCloudViewer(ApplicationUI):
         direction = (a - b) + (c - b)
         direction = direction / np.linalg.norm(direction)
         position = b + direction * offset
-        text = vtk.vtkVectorText()
-        text.SetText(label)
-        text_mapper = vtk.vtkPolyDataMapper()
-        text_mapper.SetInputConnection(text.GetOutputPort())
-        text_actor = vtk.vtkFollower()
-        text_actor.SetMapper(text_mapper)
-        text_actor.SetScale(0.1, 0.1, 0.1)
-        text_actor.AddPosition(position[0], position[1], position[2])
-        text_actor.GetProperty().SetColor(self.colors.GetColor3d("White"))
-        self.renderer.AddActor(text_actor)
-        text_actor.SetCamera(self.renderer.GetActiveCamera())
-        self.measurement_actors.append(text_actor)
-        self.vtk_widget.GetRenderWindow().Render()
+        text_label = self.measurement_overlay.add_label(position, label, self.colors.GetColor3d("White"),
+                                                        label_font_size(0.1))
+        self.measurement_actors.append(text_label)
+        self.request_render()
+        return text_label
         
 # =========================================================================================================
     def add_text_label(self, position, text, color="Blue", scale=0.5, z_offset=0.0):
         """Add a text label at specified position"""
         try:
             pos = [position[0], position[1], position[2] + z_offset]
-            # If text contains non-ASCII (like °), use BillboardTextActor3D
-            if any(ord(c) > 127 for c in text):
-                text_actor = vtk.vtkBillboardTextActor3D()
-                text_actor.SetInput(text)
-                text_actor.SetPosition(pos)
-                text_actor.GetTextProperty().SetColor(self.colors.GetColor3d(color))
-                text_actor.GetTextProperty().SetFontSize(int(scale * 80))
-                # text_actor.GetTextProperty().BoldOn()
-                self.renderer.AddActor(text_actor)
-                self.measurement_actors.append(text_actor)
-            else:
-                # Default ASCII rendering using VectorText
-                text_source = vtk.vtkVectorText()
-                text_source.SetText(text)
-                text_mapper = vtk.vtkPolyDataMapper()
-                text_mapper.SetInputConnection(text_source.GetOutputPort())
-                text_actor = vtk.vtkFollower()
-                text_actor.SetMapper(text_mapper)
-                text_actor.SetScale(scale, scale, scale)
-                text_actor.AddPosition(position[0], position[1], position[2])
-                text_actor.GetProperty().SetColor(self.colors.GetColor3d(color))
-                text_actor.SetCamera(self.renderer.GetActiveCamera())
-                self.renderer.AddActor(text_actor)
-                self.measurement_actors.append(text_actor)
+            # Batched labels are drawn with FreeType, so non-ASCII text (like °) needs no special actor
+            text_label = self.measurement_overlay.add_label(pos, text, self.colors.GetColor3d(color),
+                                                            label_font_size(scale))
+            self.measurement_actors.append(text_label)
             # Render update
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
+            return text_label
         except Exception as e:
             print(f"Error adding text label: {e}")
             
@@ -5255,12 +6008,7 @@ class PointCloudViewer(ApplicationUI):
             cell_picker.Pick(pos[0], pos[1], 0, self.renderer)
             clicked_point = None
             if cell_picker.GetCellId() != -1:
-                clicked_point = np.array(cell_picker.GetPickPosition())
-                points = np.asarray(self.point_cloud.points)
-                if len(points) > 0:
-                    distances = np.sum((points - clicked_point)**2, axis=1)
-                    nearest_idx = np.argmin(distances)
-                    clicked_point = points[nearest_idx]
+                clicked_point = self.snap_to_nearest_cloud_point(np.array(cell_picker.GetPickPosition()))
             if clicked_point is None:
                 clicked_point = self.find_nearest_point_in_neighborhood(pos)
             if clicked_point is None:
@@ -5365,7 +6113,7 @@ class PointCloudViewer(ApplicationUI):
                     self.reset_zero_drawing()
                     self.message_text.append("Zero line configuration cancelled.")
 
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return  # Important: return early if we were drawing zero line
 #-------------------------------------
         if not self.measurement_active or not self.current_measurement or self.freeze_view or not self.plotting_active:
@@ -5379,13 +6127,8 @@ class PointCloudViewer(ApplicationUI):
         clicked_point = None
         if cell_picker.GetCellId() != -1:
             # Get the picked position in world coordinates
-            clicked_point = np.array(cell_picker.GetPickPosition())
             # Find the nearest actual point in the point cloud to our picked position
-            points = np.asarray(self.point_cloud.points)
-            if len(points) > 0:
-                distances = np.sum((points - clicked_point)**2, axis=1)
-                nearest_idx = np.argmin(distances)
-                clicked_point = points[nearest_idx]
+            clicked_point = self.snap_to_nearest_cloud_point(np.array(cell_picker.GetPickPosition()))
         # If still no point found, use the neighborhood search
         if clicked_point is None:
             clicked_point = self.find_nearest_point_in_neighborhood(pos)
@@ -5399,7 +6142,7 @@ class PointCloudViewer(ApplicationUI):
             # Visualize the point
             self.add_sphere_marker(clicked_point, point_label, color="Blue")
             self.process_vertical_line_measurement()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         # Handle horizontal line measurement
         if self.current_measurement == 'horizontal_line':
@@ -5408,7 +6151,7 @@ class PointCloudViewer(ApplicationUI):
             # Visualize point
             self.add_sphere_marker(clicked_point, color="Blue")
             self.process_horizontal_line_measurement()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         # Handle polygon measurement
         if self.current_measurement == 'polygon' :
@@ -5418,7 +6161,7 @@ class PointCloudViewer(ApplicationUI):
                 point_label = 'A' # First point is always A
                 self.add_sphere_marker(clicked_point, point_label)
   
-                self.vtk_widget.GetRenderWindow().Render()
+                self.request_render()
                 return
       
             # For regular clicks (adding points)
@@ -5432,14 +6175,12 @@ class PointCloudViewer(ApplicationUI):
                 self.add_line_between_points(p1, p2, "Purple")
                
         interactor = self.vtk_widget.GetRenderWindow().GetInteractor()
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # ===========================================================================================================================================================
     def reset_zero_drawing(self):
         for actor in self.temp_zero_actors:
-            self.renderer.RemoveActor(actor)
-            if actor in self.measurement_actors:
-                self.measurement_actors.remove(actor)
+            self.remove_measurement_actor(actor)
         self.temp_zero_actors = []
         self.zero_points = []
         
@@ -5487,6 +6228,16 @@ class PointCloudViewer(ApplicationUI):
         self.add_material_line_button.clicked.connect(self.open_material_line_dialog)
    
         self.volume_slider.valueChanged.connect(self.volume_changed)
+        self.section_window_checkbox.toggled.connect(self.toggle_section_window)
+        self.section_window_spin.valueChanged.connect(self.on_section_window_width_changed)
+        self.section_context_checkbox.toggled.connect(self.on_section_context_toggled)
+        self.progress_cancel_button.clicked.connect(self.cancel_point_cloud_loading)
+        self.progress_cancel_button.clicked.connect(self.cancel_ground_profile_extraction)
+        self.progress_cancel_button.clicked.connect(self.cancel_cross_section_build)
+        self.progress_cancel_button.clicked.connect(self.cancel_deviation_build)
+        self.deviation_button.toggled.connect(self.toggle_deviation_heatmap)
+        self.cross_sections_button.clicked.connect(self.open_cross_sections)
+        self.surface_auto_button.clicked.connect(self.extract_ground_profile)
 
         # Connect the Start/Stop button in the zoom toolbar to material drawing
         self.start_stop_button.toggled.connect(self.on_material_drawing_toggle)
@@ -5511,6 +6262,8 @@ class PointCloudViewer(ApplicationUI):
         # Add key press event (Space bar for freeze/unfreeze, Escape for plotting toggle)
         self.vtk_widget.GetRenderWindow().GetInteractor().AddObserver(
             "KeyPressEvent", self.on_key_press)
+        # Refine the level-of-detail cloud whenever the camera moves (mouse or code)
+        self.renderer.GetActiveCamera().AddObserver("ModifiedEvent", self.on_camera_modified)
 
 # ===========================================================================================================================================================
     def on_slider_changed(self, value):
@@ -5543,6 +6296,9 @@ class PointCloudViewer(ApplicationUI):
         height = self.vertical_height_meters * conversion_factor
         # Draw the vertical line and store the actor
         self.main_line_actor = self.add_line_between_points(point_a, point_b, "Red", f"AB={height:.2f}{units_suffix}")
+        record = self.record_measurement('vertical_line', [point_a, point_b], {'length': self.vertical_height_meters},
+                                         names="AB")
+        self.measurement_store.attach_label(record, self.main_line_actor.label, "AB={length}")
         # Store reference to the distance label actor (the last added actor)
         if self.measurement_actors:
             self.distance_label_actor = self.measurement_actors[-1]
@@ -5570,7 +6326,7 @@ class PointCloudViewer(ApplicationUI):
             },
             'on_baseline': on_baseline
         }
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # ==================================================================================================================================
     def process_horizontal_line_measurement(self):
@@ -5588,6 +6344,8 @@ class PointCloudViewer(ApplicationUI):
         distance = distance_meters * conversion_factor
         # Draw main horizontal line (red) and store reference
         self.horizontal_line_actor = self.add_line_between_points(point_p, point_q, "Red", f"PQ={distance:.2f}{units_suffix}")
+        record = self.record_measurement('horizontal_line', [point_p, point_q], {'length': distance_meters}, names="PQ")
+        self.measurement_store.attach_label(record, self.horizontal_line_actor.label, "PQ={length}")
         # Store reference to the distance label actor (the last added actor)
         if self.measurement_actors:
             self.horizontal_distance_label_actor = self.measurement_actors[-1]
@@ -5611,7 +6369,7 @@ class PointCloudViewer(ApplicationUI):
 # ===========================================================================================================================
 # Define function for the Polygon Measurements:
     def process_polygon_measurement(self):
-        """Process polygon measurement on any plane using triangulation for area calculation"""
+        """Process polygon measurement on its best-fit plane (shoelace area, works for concave outlines)"""
         if len(self.measurement_points) < 3:
             return
         # Store polygon points and actors for saving to JSON later
@@ -5619,80 +6377,14 @@ class PointCloudViewer(ApplicationUI):
         self.polygon_actors = list(self.measurement_actors)
         points = self.measurement_points
         n = len(points)
-        # Find the best fitting plane
-        centroid, normal = find_best_fitting_plane(points)
+        # Area, sides and angles in 2D coordinates on the best-fit plane
+        metrics = polygon_metrics(np.asarray(points, dtype=np.float64))
         # Get current units
         units_suffix, conversion_factor = self.get_current_units()
-        # Project points onto the best-fit plane
-        projected_points = []
-        for point in points:
-            v = point - centroid
-            dist = np.dot(v, normal)
-            projected = point - dist * normal
-            projected_points.append(projected)
-        projected_points = np.array(projected_points)
-        perimeter_meters = 0.0
-        # Calculate all side lengths
-        lengths = []
-        for i in range(n):
-            p1 = projected_points[i]
-            p2 = projected_points[(i+1)%n]
-            length_meters = np.linalg.norm(p2 - p1)
-            perimeter_meters += length_meters
-            length = length_meters * conversion_factor
-            label = f"{chr(65+i)}{chr(65+(i+1)%n)}"
-            lengths.append((label, length))
-        # Calculate all internal angles
-        angles = []
-        for i in range(n):
-            a = projected_points[i]
-            b = projected_points[(i+1)%n]
-            c = projected_points[(i+2)%n]
-            ba = a - b
-            bc = c - b
-            cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-            angle = degrees(np.arccos(cosine_angle))
-            label = chr(65 + (i+1)%n) # B, C, etc.
-            angles.append((label, angle))
-        # Calculate area using triangulation (Delaunay triangulation)
-        try:
-            from scipy.spatial import Delaunay
-            # Project points to 2D plane (using the two most significant dimensions)
-            abs_normal = np.abs(normal)
-            if abs_normal[0] > abs_normal[1] and abs_normal[0] > abs_normal[2]:
-                # Most aligned with YZ plane
-                coords = projected_points[:, [1, 2]] # Use Y and Z coordinates
-            elif abs_normal[1] > abs_normal[2]:
-                # Most aligned with XZ plane
-                coords = projected_points[:, [0, 2]] # Use X and Z coordinates
-            else:
-                # Most aligned with XY plane (default)
-                coords = projected_points[:, [0, 1]] # Use X and Y coordinates
-            # Perform Delaunay triangulation
-            tri = Delaunay(coords)
-            # Calculate area of each triangle and sum them up
-            area_meters = 0.0
-            for simplex in tri.simplices:
-                # Get the 3 points of the triangle
-                a, b, c = projected_points[simplex]
-                # Calculate area of triangle using cross product
-                area_meters += 0.5 * np.linalg.norm(np.cross(b - a, c - a))
-        except ImportError:
-            # Fallback to shoelace formula if scipy not available
-            self.message_text.append("Note: scipy not available, using shoelace formula instead")
-            x = projected_points[:,0]
-            y = projected_points[:,1]
-            z = projected_points[:,2]
-            # Find which plane we're most aligned with
-            if abs_normal[0] > abs_normal[1] and abs_normal[0] > abs_normal[2]:
-                # Most aligned with YZ plane
-                area_meters = 0.5 * np.abs(np.dot(y, np.roll(z,1)) - np.dot(z, np.roll(y,1)))
-            elif abs_normal[1] > abs_normal[2]:
-                # Most aligned with XZ plane
-                area_meters = 0.5 * np.abs(np.dot(x, np.roll(z,1)) - np.dot(z, np.roll(x,1)))
-            else:
-                # Most aligned with XY plane (default)
-                area_meters = 0.5 * np.abs(np.dot(x, np.roll(y,1)) - np.dot(y, np.roll(x,1)))
+        area_meters = metrics["area"]
+        perimeter_meters = metrics["perimeter"]
+        # Internal angles at B, C, ... (angle i is at vertex i+1)
+        angles = [(chr(65 + (i+1)%n), metrics["angles"][(i+1)%n]) for i in range(n)]
         # Convert area
         if units_suffix == "cm":
             area = area_meters * 10000
@@ -5709,19 +6401,64 @@ class PointCloudViewer(ApplicationUI):
             perimeter = perimeter_meters
             area_suffix = "square meter"
             perimeter_suffix = "m"
+        # The sides carry their own length records; the polygon keeps area, perimeter and angles
+        values = {'area': area_meters, 'perimeter': perimeter_meters}
+        values.update({f'angle_{(i+1)%n}': angles[i][1] for i in range(n)})
+        quantities = {'area': 'area'}
+        quantities.update({f'angle_{(i+1)%n}': 'angle' for i in range(n)})
+        record = self.record_measurement('polygon', points, values, quantities,
+                                         names="".join(chr(65 + i) for i in range(n)), color="Purple",
+                                         closed=True, outline=False)
         # Add angle labels to the 3D view
         for i in range(n):
             a = points[i]
             b = points[(i+1)%n]
             c = points[(i+2)%n]
             angle_label = angles[i][1]
-            self.add_angle_label(b, a, c, f"{angle_label:.1f}°", offset=0.8)
+            label = self.add_angle_label(b, a, c, f"{angle_label:.1f}°", offset=0.8)
+            self.measurement_store.attach_label(record, label, f"{{angle_{(i+1)%n}}}")
         # Output results
         self.polygon_area_meters = area_meters
         self.polygon_perimeter_meters = perimeter_meters
         self.message_text.append(f"Polygon Surface Area = {area:.2f} {area_suffix}")
         self.message_text.append(f"Polygon Perimeter = {perimeter:.2f} {perimeter_suffix}")
         
+# ==================================================================================================================================
+    def process_polygon_volume(self, base=None):
+        """Stockpile / pit volume of the cloud inside the picked polygon, against a base plane
+        (fitted through the polygon points unless base=(a, b, c) of z = a*x + b*y + c is given)
+        """
+        if not self.point_cloud or len(self.measurement_points) < 3:
+            return None
+        polygon = np.array(self.measurement_points, dtype=np.float64)
+        candidates = None
+        index = self.get_spatial_index()
+        if index is not None:
+            # Box around the outline, tall enough for piles / pits as deep as the polygon is wide
+            reach = float(np.max(np.ptp(polygon[:, :2], axis=0)))
+            candidates = index.box(polygon.min(axis=0) - [0, 0, reach], polygon.max(axis=0) + [0, 0, reach])
+        result = polygon_volume(self.point_cloud, polygon, candidates, base)
+        if result is None:
+            self.message_text.append("No point cloud points inside the polygon: volume not computed")
+            return None
+
+        units_suffix, conversion_factor = self.get_current_units()
+        volume_factor = conversion_factor ** 3
+        volume_suffix = {"cm": "cubic cm", "mm": "cubic mm"}.get(units_suffix, "cubic meter")
+        self.polygon_volume_meters = result["net_volume_m3"]
+        self.polygon_volume_result = result
+        self.record_measurement('polygon_volume', polygon,
+                                {'cut_volume': result['cut_volume_m3'], 'fill_volume': result['fill_volume_m3'],
+                                 'net_volume': result['net_volume_m3'], 'area': result['area_m2']},
+                                {'cut_volume': 'volume', 'fill_volume': 'volume', 'net_volume': 'volume',
+                                 'area': 'area'}, color="Green", closed=True, outline=False)
+        self.message_text.append(f"Stockpile Volume (above base) = {result['cut_volume_m3'] * volume_factor:.2f} {volume_suffix}")
+        self.message_text.append(f"Pit Volume (below base) = {result['fill_volume_m3'] * volume_factor:.2f} {volume_suffix}")
+        self.message_text.append(f"Net Volume = {result['net_volume_m3'] * volume_factor:.2f} {volume_suffix}")
+        self.message_text.append(f"   → {result['point_count']:,} points, {result['cell_size_m'] * 100:.1f} cm grid, "
+                                 f"{result['coverage'] * 100:.0f}% of cells measured")
+        return result
+
 # ==================================================================================================================================
     def complete_polygon(self):
         self.plotting_active = False
@@ -5736,9 +6473,8 @@ class PointCloudViewer(ApplicationUI):
         # Only add the line if it doesn't already exist
         line_exists = False
         for actor in self.measurement_actors:
-            if isinstance(actor.GetMapper().GetInput(), vtk.vtkLineSource):
-                pos1 = actor.GetMapper().GetInput().GetPoint(0)
-                pos2 = actor.GetMapper().GetInput().GetPoint(1)
+            if isinstance(actor, OverlayItem) and actor.kind == 'segment':
+                pos1, pos2 = actor.points
                 if (np.allclose(pos1, p1) and np.allclose(pos2, p2)) or \
                 (np.allclose(pos1, p2) and np.allclose(pos2, p1)):
                     line_exists = True
@@ -5751,10 +6487,12 @@ class PointCloudViewer(ApplicationUI):
         # Process the polygon measurement
         if self.current_measurement == 'polygon' :
             self.process_polygon_measurement()
+            if getattr(self, 'stockpile_measurement', False):
+                self.process_polygon_volume()
         # Hide the Complete Polygon button after completing
         self.complete_polygon_button.setVisible(False)
         self.complete_polygon_button.setStyleSheet("") # Reset to default style
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         
 # ==================================================================================================================================
 #Define the function for the handle the Presized button action:
@@ -5820,15 +6558,25 @@ class PointCloudViewer(ApplicationUI):
                     centroid = (point_p + point_r) / 2
   
                 # Add labels for volume and outer surface
-                self.add_text_label(centroid + np.array([0, 3, 2]), f"Polygon Volume = {volume:.2f} {volume_suffix}, "f"Polygon Outer Surface = {outer_surface:.2f} {area_suffix}", "Green")
-                self.add_text_label(centroid + np.array([0, 3, 1]), f"Polygon Area = {surface_area:.2f} {area_suffix}, "f"Polygon Perimeter = {perimeter:.2f} {perimeter_suffix}", "Green")
+                volume_label = self.add_text_label(centroid + np.array([0, 3, 2]), f"Polygon Volume = {volume:.2f} {volume_suffix}, "f"Polygon Outer Surface = {outer_surface:.2f} {area_suffix}", "Green")
+                area_label = self.add_text_label(centroid + np.array([0, 3, 1]), f"Polygon Area = {surface_area:.2f} {area_suffix}, "f"Polygon Perimeter = {perimeter:.2f} {perimeter_suffix}", "Green")
+                record = self.record_measurement('round_pillar_volume', [point_p, point_r],
+                                                 {'volume': volume_meters, 'outer_surface': outer_surface_meters,
+                                                  'area': surface_area_meters, 'perimeter': perimeter_meters,
+                                                  'height': distance_meters},
+                                                 {'volume': 'volume', 'outer_surface': 'area', 'area': 'area'},
+                                                 color="Green", outline=False)
+                self.measurement_store.attach_label(record, volume_label,
+                                                    "Polygon Volume = {volume}, Polygon Outer Surface = {outer_surface}")
+                self.measurement_store.attach_label(record, area_label,
+                                                    "Polygon Area = {area}, Polygon Perimeter = {perimeter}")
                 # Output results
                 self.message_text.append(f"Surface Area of Polygon = {surface_area:.2f} {area_suffix}\n")
                 self.message_text.append(f"Volume of Polygon = {volume:.2f} {volume_suffix}\n")
                 self.message_text.append(f"Outer Surface Area of Polygon= {outer_surface:.2f} {area_suffix}")
             except Exception as e:
                 self.message_text.append(f"Error creating presized polygon volume measurements")
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return
         if (hasattr(self, 'current_measurement') and self.current_measurement == 'vertical_line' and \
             hasattr(self, 'measurement_points') and len(self.measurement_points) >= 2):
@@ -5879,29 +6627,25 @@ class PointCloudViewer(ApplicationUI):
             distance = distance_meters * conversion_factor
             # 1. Change horizontal line color from Red to LightGrey
             if self.horizontal_line_actor is not None:
-                self.horizontal_line_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.horizontal_line_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Horizontal line color changed to LightGrey")
             # 2. Change point Q sphere color to LightGrey
             if hasattr(self, 'point_q_actor') and self.point_q_actor is not None:
-                self.point_q_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.point_q_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Point Q sphere color changed to LightGrey")
             # 3. Change point Q label color to LightGrey
-            for actor in self.measurement_actors:
-                if isinstance(actor, vtk.vtkFollower):
-                    try:
-                        text_source = actor.GetMapper().GetInputConnection(0, 0).GetProducer()
-                        if isinstance(text_source, vtk.vtkVectorText) and text_source.GetText() == "Q":
-                            actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
-                            # self.output_list.addItem("Point Q label color changed to LightGrey")
-                            break
-                    except:
-                        continue
+            if getattr(self, 'point_q_actor', None) is not None:
+                self.measurement_overlay.set_color(self.point_q_actor.label, self.colors.GetColor3d("LightGrey"))
+                # self.output_list.addItem("Point Q label color changed to LightGrey")
             # 4. Change distance label color to LightGrey and reposition it above the original PQ line
             if hasattr(self, 'horizontal_distance_label_actor') and self.horizontal_distance_label_actor is not None:
-                self.horizontal_distance_label_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.horizontal_distance_label_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Horizontal distance label color changed to LightGrey and repositioned")
             # Draw the new straight horizontal line from P to R in red
             self.presized_horizontal_line_actor = self.add_line_between_points(point_p, point_r, "Red", f"PR={distance:.2f}{units_suffix}")
+            record = self.record_measurement('presized_horizontal_line', [point_p, point_r], {'length': distance_meters},
+                                             names=" R")
+            self.measurement_store.attach_label(record, self.presized_horizontal_line_actor.label, "PR={length}")
             # Add point R marker with label
             self.point_r_actor = self.add_sphere_marker(point_r, "R", color="Red")
             return distance_meters
@@ -5936,33 +6680,29 @@ class PointCloudViewer(ApplicationUI):
             })
             # 1. Change original AB line color from Red to LightGrey
             if hasattr(self, 'main_line_actor') and self.main_line_actor is not None:
-                self.main_line_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.main_line_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Vertical line AB color changed to LightGrey")
             # 2. Change point B sphere color to LightGrey
             if hasattr(self, 'point_b_actor') and self.point_b_actor is not None:
-                self.point_b_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.point_b_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Point B sphere color changed to LightGrey")
             # 3. Change point B label color to LightGrey
-            for actor in self.measurement_actors:
-                if isinstance(actor, vtk.vtkFollower):
-                    try:
-                        text_source = actor.GetMapper().GetInputConnection(0, 0).GetProducer()
-                        if isinstance(text_source, vtk.vtkVectorText) and text_source.GetText() == "B":
-                            actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
-                            # self.output_list.addItem("Point B label color changed to LightGrey")
-                            break
-                    except:
-                        continue
+            if getattr(self, 'point_b_actor', None) is not None:
+                self.measurement_overlay.set_color(self.point_b_actor.label, self.colors.GetColor3d("LightGrey"))
+                # self.output_list.addItem("Point B label color changed to LightGrey")
             # 4. Change distance label color to LightGrey
             if hasattr(self, 'distance_label_actor') and self.distance_label_actor is not None:
-                self.distance_label_actor.GetProperty().SetColor(self.colors.GetColor3d("LightGrey"))
+                self.measurement_overlay.set_color(self.distance_label_actor, self.colors.GetColor3d("LightGrey"))
                 # self.output_list.addItem("Vertical distance label color changed to LightGrey and repositioned")
             # Draw the new vertical line from A to C in red
             self.presized_line_actor = self.add_line_between_points(point_a, point_c, "Red",f"AC={distance:.2f}{units_suffix}")
+            record = self.record_measurement('presized_vertical_line', [point_a, point_c], {'length': distance_meters},
+                                             names=" C")
+            self.measurement_store.attach_label(record, self.presized_line_actor.label, "AC={length}")
             # Add point C marker with label
             self.point_c_actor = self.add_sphere_marker(point_c, "C", color="Red")
             self.message_text.append(f"Presized Vertical Height AC: {distance:.2f} {units_suffix}")
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
             return distance_meters
         except Exception as e:
             self.message_text.append(f"Error creating presized vertical line: {str(e)}")
@@ -5997,7 +6737,7 @@ class PointCloudViewer(ApplicationUI):
                 style = vtkInteractorStyleTrackballCamera()
                 interactor.SetInteractorStyle(style)
                 # self.output_list.addItem("View unfrozen")
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # ============================================================================================================================
 # RESET ACTION (Modified)
@@ -6156,9 +6896,14 @@ class PointCloudViewer(ApplicationUI):
             while actor:
                 self.renderer.RemoveActor(actor)
                 actor = actors.GetNextItem()
+            # Measurement labels are a 2D prop (not in GetActors); drop all measurement items with the scene
+            self.measurement_overlay.clear()
+            self.measurement_actors = []
+            self.undraw_measurement_layers()
+            self.measurement_store.clear()
             self.renderer.ResetCamera()
         if hasattr(self, 'vtk_widget') and self.vtk_widget:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
         
 
 # Clear baseline planes and other 3D actors
@@ -6454,14 +7199,29 @@ class PointCloudViewer(ApplicationUI):
         for actor in self.measurement_actors:
             actors_to_remove.append(actor)
         for actor in actors_to_remove:
-            self.renderer.RemoveActor(actor)
-            if actor in self.measurement_actors:
-                self.measurement_actors.remove(actor)
+            self.remove_measurement_actor(actor)
+        self.measurement_overlay.clear()
+        self.undraw_measurement_layers()
+        self.measurement_store.clear()
         # Reset point cloud
+        self.cancel_point_cloud_loading()
+        self.cancel_octree_build()
         if self.point_cloud_actor:
             self.renderer.RemoveActor(self.point_cloud_actor)
             self.point_cloud_actor = None
             self.point_cloud = None
+        self.point_octree = None
+        self.octree_renderer = None
+        self.point_tiles = None
+        self.spatial_index = None
+        self.spatial_index_builder = None
+        self.cancel_station_index_build()
+        self.cancel_dtm_build()
+        self.dtm = None
+        self.earthwork_pending = None
+        self.reset_deviation()
+        self.station_cloud_signature = None
+        self.close_section_window()
         # Reset UI state
         self.measurement_active = True
 
@@ -6471,7 +7231,7 @@ class PointCloudViewer(ApplicationUI):
 
         # Render the VTK window
         if hasattr(self, 'vtk_widget'):
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 
         # Clear all curve labels
@@ -6558,7 +7318,7 @@ class PointCloudViewer(ApplicationUI):
                         points_3d.append(pos_3d)
                     for i in range(len(points_3d) - 1):
                         self.add_preview_line(points_3d[i], points_3d[i + 1], color)
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
         self.message_text.append("Preview lines mapped on 3D point cloud.")
 
 # ===========================================================================================================================================================
@@ -6745,8 +7505,7 @@ class PointCloudViewer(ApplicationUI):
                         plane_count_this_time += 1
 
         # Render
-        rw = (self.vtk_widget if hasattr(self, 'vtk_widget') else self.vtkWidget).GetRenderWindow()
-        rw.Render()
+        self.request_render()
 
         # Summary
         width_list = "\n".join(width_summary)
@@ -6834,7 +7593,7 @@ class PointCloudViewer(ApplicationUI):
                     self.renderer.RemoveActor(actor)
         self.baseline_plane_actors = []
         if hasattr(self, 'vtk_widget') and self.vtk_widget:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # ============================================================================================================================================================
 
@@ -6846,7 +7605,7 @@ class PointCloudViewer(ApplicationUI):
                 if self.point_cloud and self.renderer:
                     self.renderer.ResetCamera()
                     if self.vtk_widget:
-                        self.vtk_widget.GetRenderWindow().Render()
+                        self.request_render()
             elif state == Qt.WindowMinimized:
                 pass # No specific action needed for minimize
 
@@ -6854,64 +7613,213 @@ class PointCloudViewer(ApplicationUI):
     def resizeEvent(self, event):
         super(PointCloudViewer, self).resizeEvent(event)
         if self.vtk_widget:
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =============================================================================================================================================================
-    def load_point_cloud_from_path(self, file_path: str):
+    def load_point_cloud_from_path(self, file_path: str, corridor=None, cache=None):
         """
         Load a point cloud from a given file path without showing QFileDialog.
         Used for auto-loading point clouds linked to a project after creating a new worksheet.
-        Reuses the same logic as load_point_cloud() for consistency.
+        The file is read in the background loader; returns True once loading has started.
+        With a corridor only the points inside it are kept (cached in the given cache).
         """
         if not file_path or not os.path.exists(file_path):
             self.message_text.append(f"Point cloud file not found or invalid: {file_path}")
             return False
 
-        try:
-            # Store the loaded file path and name
-            self.loaded_file_path = file_path
-            self.loaded_file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-            # Show progress bar with file info
-            self.show_progress_bar(file_path)
-            self.update_progress(10, "Starting file loading...")
-
-            # Read the file
-            if file_path.lower().endswith(('.ply', '.pcd')):
-                self.update_progress(30, "Loading point cloud data...")
-                self.point_cloud = o3d.io.read_point_cloud(file_path)
-
-            elif file_path.lower().endswith('.xyz'):
-                self.update_progress(30, "Loading XYZ data...")
-                data = np.loadtxt(file_path, usecols=(0, 1, 2))
-                self.point_cloud = o3d.geometry.PointCloud()
-                self.point_cloud.points = o3d.utility.Vector3dVector(data[:, :3])
+        self.start_point_cloud_loading(file_path, corridor, cache)
+        return True
 
-            else:
-                raise ValueError(f"Unsupported file format: {os.path.splitext(file_path)[1]}")
+    def get_current_worksheet_corridor(self):
+        """get_worksheet_corridor() for the open worksheet and layer, (None, None) outside a worksheet"""
+        config = self.current_worksheet_data
+        layer_name = getattr(self, 'current_layer_name', None)
+        if not self.current_worksheet_name or not config or not layer_name:
+            return None, None
+        worksheet_root = os.path.join(self.WORKSHEETS_BASE_DIR, self.current_worksheet_name)
+        subfolder_type = getattr(self, 'current_subfolder_type', "designs")
+        layer_path = os.path.join(worksheet_root, subfolder_type, layer_name)
+        layer_paths = [layer_path]
+        if subfolder_type == "construction":
+            try:
+                with open(os.path.join(layer_path, "Construction_Layer_config.txt"), 'r', encoding='utf-8') as f:
+                    reference = json.load(f).get("reference_layer_2d")
+                if reference:
+                    layer_paths.append(os.path.join(worksheet_root, "designs", reference))
+            except Exception:
+                pass
+        return self.get_worksheet_corridor(config, worksheet_root, layer_paths)
 
-            if not self.point_cloud.has_points():
-                raise ValueError("No points found in the file.")
+    def save_worksheet_config(self, config, worksheet_root):
+        """Write a worksheet's config dict back to its worksheet_config.txt"""
+        config_path = os.path.join(worksheet_root, "worksheet_config.txt")
+        try:
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=4)
+        except Exception as e:
+            self.message_text.append(f"Could not save worksheet config: {str(e)}")
+
+    def get_worksheet_corridor(self, config, worksheet_root, layer_paths):
+        """Return (Corridor, PointCloudCache) for a corridor-cropped load, or (None, None).
+        Only 2D Road / Bridge worksheets are cropped; the zero line is taken from the first layer
+        folder that has one. The buffer width is asked once per worksheet and kept in
+        worksheet_config.txt (0 = always load the full cloud); Cancel loads the full cloud this
+        time only. The worksheet dialog changes or clears the saved width.
+        """
+        if config.get("dimension") != "2D" or config.get("worksheet_category") not in ("Road", "Bridge"):
+            return None, None
+        layer_paths = [p for p in layer_paths if p]
+        corridor = None
+        buffer_m = config.get("corridor_buffer_m")
+        if buffer_m is not None and float(buffer_m) <= 0:
+            return None, None
+        for layer_path in layer_paths:
+            corridor = Corridor.from_layer(layer_path, float(buffer_m) if buffer_m else 1.0)
+            if corridor is not None:
+                break
+        if corridor is None:
+            return None, None
 
-            if self.point_cloud.has_colors():
-                self.update_progress(70, "Processing colors...")
-            else:
-                self.update_progress(70, "Preparing visualization...")
+        if buffer_m is None:
+            buffer_m, ok = QInputDialog.getDouble(
+                self, "Corridor Load",
+                "Load only the points within this distance of the zero line (m).\n"
+                "Cancel loads the full point cloud this time.",
+                30.0, 1.0, 1000.0, 1)
+            if not ok:
+                return None, None
+            config["corridor_buffer_m"] = buffer_m
+            self.save_worksheet_config(config, worksheet_root)
+            corridor = Corridor(corridor.vertices, buffer_m)
 
-            self.update_progress(90, "Creating visualization...")
-            self.display_point_cloud()
+        self.message_text.append(f"Corridor load: ±{corridor.half_width:.1f} m around the zero line "
+                                 f"({len(corridor.vertices) - 1} segment(s))")
+        cache = PointCloudCache(os.path.join(worksheet_root, CORRIDOR_CACHE_DIR_NAME), CORRIDOR_MAX_CACHE_BYTES)
+        return corridor, cache
 
-            self.update_progress(100, "Loading complete!")
-            QTimer.singleShot(500, self.hide_progress_bar)
+# =============================================================================================================================================================
+    def start_point_cloud_loading(self, file_path, corridor=None, cache=None):
+        """Start reading a point cloud in a worker thread; any load already running is cancelled.
+        corridor (alignment.Corridor) crops the cloud while it streams in; cache overrides the shared cache.
+        """
+        self.cancel_point_cloud_loading()
+
+        self.show_progress_bar(file_path, cancellable=True)
+        self.update_progress(0, "Starting file loading...")
+
+        loader = PointCloudLoader(file_path, self, cache=cache or self.point_cloud_cache, corridor=corridor)
+        loader.progress.connect(self.on_point_cloud_load_progress)
+        loader.chunk_loaded.connect(self.on_point_cloud_chunk_loaded)
+        loader.loaded.connect(self.on_point_cloud_loaded)
+        loader.failed.connect(self.on_point_cloud_load_failed)
+        loader.cancelled.connect(self.on_point_cloud_load_cancelled)
+        loader.finished.connect(loader.deleteLater)
+        self.point_cloud_loader = loader
+        loader.start()
+        self.message_text.append(f"Loading point cloud in background: {os.path.basename(file_path)}")
+
+    def cancel_point_cloud_loading(self):
+        """Cancel the running background load (if any) and drop its partial preview"""
+        loader = self.point_cloud_loader
+        if loader is None:
+            return
+        self.point_cloud_loader = None
+        loader.cancel()
+        self.remove_loading_preview_actor()
+        self.hide_progress_bar()
+        self.message_text.append(f"Point cloud loading cancelled: {os.path.basename(loader.file_path)}")
+
+    def remove_loading_preview_actor(self):
+        """Remove the actor showing the partially loaded cloud"""
+        if self.loading_preview_actor is not None:
+            self.renderer.RemoveActor(self.loading_preview_actor)
+            self.loading_preview_actor = None
+
+    def on_point_cloud_load_progress(self, value, message):
+        if self.sender() is not self.point_cloud_loader:
+            return
+        # Signals arrive through the event loop already – no processEvents() needed
+        self.update_progress(value, message, process_events=False)
 
-            self.message_text.append(f"Successfully loaded point cloud: {os.path.basename(file_path)}")
-            return True
+    def on_point_cloud_chunk_loaded(self, store):
+        """Show the part of the cloud read so far"""
+        if self.sender() is not self.point_cloud_loader:
+            return
+        if self.loading_preview_actor is None:
+            self.loading_preview_actor = self.create_point_cloud_actor(store)
+            self.renderer.AddActor(self.loading_preview_actor)
+            self.renderer.ResetCamera()
+        else:
+            polydata = build_point_polydata(store.local_points, store.colors)
+            self.loading_preview_actor.GetMapper().SetInputData(polydata)
+        self.request_render()
 
-        except Exception as e:
+    def on_point_cloud_loaded(self, store):
+        loader = self.sender()
+        if loader is not self.point_cloud_loader:
+            return
+        self.point_cloud_loader = None
+        self.remove_loading_preview_actor()
+
+        # Store the loaded file path and name for later use
+        self.loaded_file_path = loader.file_path
+        self.loaded_file_name = os.path.splitext(os.path.basename(loader.file_path))[0]
+        self.cancel_octree_build()
+        self.point_cloud = store
+        self.point_tiles = None
+        # Tiles added later are cropped like this cloud (or not at all)
+        self.point_tiles_corridor = (loader.corridor, loader.cache)
+        self.point_octree = loader.octree
+        if self.point_cloud.has_colors():
+            self.update_progress(90, "Processing colors...", process_events=False)
+        else:
+            self.update_progress(90, "Creating visualization...", process_events=False)
+        self.display_point_cloud()
+
+        self.update_progress(100, "Loading complete!", process_events=False)
+        QTimer.singleShot(500, self.hide_progress_bar)
+        source = " (from cache)" if loader.from_cache else ""
+        self.message_text.append(f"Successfully loaded point cloud{source}: {os.path.basename(loader.file_path)}")
+        if loader.corridor is not None:
+            self.message_text.append(f"   → {len(store):,} points inside the zero line corridor")
+        # The octree always covers the whole file, so cropped loads never write one
+        elif self.point_octree is None and len(store) > LOD_POINT_THRESHOLD:
+            self.start_octree_build(loader.file_path, store)
+
+    def on_point_cloud_load_failed(self, error):
+        loader = self.sender()
+        if loader is not self.point_cloud_loader:
+            return
+        self.point_cloud_loader = None
+        self.remove_loading_preview_actor()
+        self.hide_progress_bar()
+        self.request_render()
+        file_path = loader.file_path
+        self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {error}")
+        QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {error}")
+
+    def on_point_cloud_load_cancelled(self):
+        # cancel_point_cloud_loading() already cleaned up; only late stray signals arrive here
+        if self.sender() is self.point_cloud_loader:
+            self.point_cloud_loader = None
+            self.remove_loading_preview_actor()
             self.hide_progress_bar()
-            self.message_text.append(f"Failed to load point cloud '{os.path.basename(file_path)}': {str(e)}")
-            QMessageBox.warning(self, "Load Failed", f"Could not load point cloud:\n{file_path}\n\nError: {str(e)}")
-            return False
+        self.request_render()
+
+    def closeEvent(self, event):
+        # Don't let Qt destroy a running worker thread (including superseded ones still finishing)
+        self.cancel_point_cloud_loading()
+        self.cancel_octree_build()
+        self.cancel_station_index_build()
+        self.cancel_ground_profile_extraction()
+        self.cancel_cross_section_build()
+        self.cancel_dtm_build()
+        self.cancel_deviation_build()
+        for worker in self.findChildren(QThread):
+            worker.wait()
+        if any(store.dirty and len(store) for store in list(self.measurement_layers.values()) + [self.measurement_store]):
+            self.save_measurement_session()
+        super().closeEvent(event)
         
 
 # ===========================================================================================================================================================
@@ -6938,7 +7846,8 @@ class PointCloudViewer(ApplicationUI):
             camera.SetViewUp(0, 0, 1)
             camera.SetViewAngle(15.0)
             self.renderer.ResetCameraClippingRange()
-            self.vtk_widget.GetRenderWindow().Render()
+            self.refresh_point_cloud_lod(render=False)
+            self.request_render()
         except Exception as e:
             print(f"Error in full cloud focus: {e}")
 
@@ -6950,74 +7859,94 @@ class PointCloudViewer(ApplicationUI):
             return
 
         try:
-            # Calculate current position along the zero line
-            fraction = slider_value / 100.0
-            current_dist = fraction * self.total_distance
-
-            dir_vec = self.zero_end_point - self.zero_start_point
-            unit_dir = dir_vec / np.linalg.norm(dir_vec)
-
-            # World position of the marker (on the zero line at reference elevation)
-            pos_along = self.zero_start_point + fraction * dir_vec
-            marker_pos = np.array([pos_along[0], pos_along[1], self.zero_start_z])
-
-            # Add or update the red sphere marker
-            self.add_or_update_slider_marker(marker_pos)
-
-            # Define camera distance and offset (side view, slightly elevated)
-            camera_distance = max(self.total_distance * 0.6, 30.0)  # Scale with project size, min 30m
-            elevation_offset = camera_distance * 0.2  # Slight upward angle
-
-            # Camera position: offset perpendicular to the zero line direction (to the right side)
-            # Compute horizontal perpendicular vector (rotate zero direction 90° clockwise in XY)
-            zero_horizontal = np.array([unit_dir[0], unit_dir[1], 0.0])
-            h_len = np.linalg.norm(zero_horizontal)
-            if h_len < 1e-6:
-                perp = np.array([0.0, 1.0, 0.0])
-            else:
-                perp = np.array([-zero_horizontal[1], zero_horizontal[0], 0.0]) / h_len
-
-            camera_pos = marker_pos + perp * camera_distance
-            camera_pos[2] += elevation_offset  # Lift camera a bit for better view
-
-            # Set camera
-            camera = self.renderer.GetActiveCamera()
-            camera.SetFocalPoint(marker_pos[0], marker_pos[1], marker_pos[2])
-            camera.SetPosition(camera_pos[0], camera_pos[1], camera_pos[2])
-            camera.SetViewUp(0.0, 0.0, 1.0)  # Keep up vector as +Z
-            camera.SetViewAngle(10.0)       # Reasonable field of view
-
-            # Optional: slightly tighter clipping for cleaner view
-            self.renderer.ResetCameraClippingRange()
-
-            self.vtk_widget.GetRenderWindow().Render()
+            # Add or update the red sphere marker, then look at it
+            self.update_slider_markers(slider_value, graph=False)
+            marker_pos, camera_pos = self.slider_camera_target(slider_value)
+            self.apply_slider_camera(marker_pos, camera_pos)
+            self.refresh_point_cloud_lod(render=False)
 
         except Exception as e:
             print(f"Error updating camera view: {e}")
             self.focus_camera_on_full_cloud()
 
+# ===========================================================================================================================================================
+    def slider_marker_position(self, slider_value):
+        """World position of the slider marker (on the zero line at reference elevation)"""
+        fraction = slider_value / 100.0
+        pos_along = self.zero_start_point + fraction * (self.zero_end_point - self.zero_start_point)
+        return np.array([pos_along[0], pos_along[1], self.zero_start_z])
+
+    def slider_camera_target(self, slider_value):
+        """(focal point, camera position) of the side view onto the slider marker, or None"""
+        if not self.zero_line_set or not self.point_cloud:
+            return None
+        dir_vec = self.zero_end_point - self.zero_start_point
+        unit_dir = dir_vec / np.linalg.norm(dir_vec)
+        marker_pos = self.slider_marker_position(slider_value)
+
+        # Define camera distance and offset (side view, slightly elevated)
+        camera_distance = max(self.total_distance * 0.6, 30.0)  # Scale with project size, min 30m
+        elevation_offset = camera_distance * 0.2  # Slight upward angle
+
+        # Camera position: offset perpendicular to the zero line direction (to the right side)
+        # Compute horizontal perpendicular vector (rotate zero direction 90° clockwise in XY)
+        zero_horizontal = np.array([unit_dir[0], unit_dir[1], 0.0])
+        h_len = np.linalg.norm(zero_horizontal)
+        if h_len < 1e-6:
+            perp = np.array([0.0, 1.0, 0.0])
+        else:
+            perp = np.array([-zero_horizontal[1], zero_horizontal[0], 0.0]) / h_len
+
+        camera_pos = marker_pos + perp * camera_distance
+        camera_pos[2] += elevation_offset  # Lift camera a bit for better view
+        return marker_pos, camera_pos
+
+    def apply_slider_camera(self, focal_point, camera_pos):
+        """Point the camera (side view, +Z up) and request a render"""
+        camera = self.renderer.GetActiveCamera()
+        camera.SetFocalPoint(focal_point[0], focal_point[1], focal_point[2])
+        camera.SetPosition(camera_pos[0], camera_pos[1], camera_pos[2])
+        camera.SetViewUp(0.0, 0.0, 1.0)  # Keep up vector as +Z
+        camera.SetViewAngle(10.0)       # Reasonable field of view
+        # Optional: slightly tighter clipping for cleaner view
+        self.renderer.ResetCameraClippingRange()
+        self.request_render()
+
+    def current_slider_camera(self):
+        camera = self.renderer.GetActiveCamera()
+        return camera.GetFocalPoint(), camera.GetPosition()
+
+    def update_slider_markers(self, value, graph=True):
+        """Everything that tracks the slider value exactly: 2D markers, graph scroll and the red sphere"""
+        if graph:
+            self.update_scale_marker(value)
+            self.update_main_graph_marker(value)
+            self.scroll_graph_with_slider(value, update_marker=False)
+        if self.zero_line_set and self.point_cloud:
+            self.add_or_update_slider_marker(self.slider_marker_position(value))
+        self.update_section_window(value)
+        if self.cross_section_dialog is not None and self.cross_section_dialog.isVisible():
+            self.cross_section_dialog.show_chainage(value / 100.0 * self.total_distance)
+
 # ===========================================================================================================================================================
     def volume_changed(self, value):
         """Main handler when volume slider moves – keeps marker and camera perfectly aligned."""
-        print(f"Volume slider changed to: {value}%")
-
         if self.zero_line_set:
-            # Update scale marker and chainage label
-            self.update_scale_marker()
-
-            # Update main graph vertical marker
-            self.update_main_graph_marker(value)
-
-            # **CRITICAL**: Update camera to follow the red sphere marker exactly
-            self.update_camera_view(value)
+            if self.volume_slider.isSliderDown():
+                # Scrubbing: coalesced to one update per frame, camera eased between targets
+                self.slider_scrubber.push(value, self.volume_slider.minimum(), self.volume_slider.maximum())
+            else:
+                # Keyboard / page steps and programmatic changes land at once
+                self.slider_scrubber.jump(value)
+                self.refresh_point_cloud_lod(render=False)
 
         else:
             # No zero line → show full cloud and remove marker
+            self.slider_scrubber.stop()
             self.focus_camera_on_full_cloud()
             self.remove_slider_marker()
-
-        # Always scroll the 2D graph horizontally
-        self.scroll_graph_with_slider(value)
+            # Always scroll the 2D graph horizontally
+            self.scroll_graph_with_slider(value)
 
 # ===========================================================================================================================================================
     def add_or_update_slider_marker(self, world_pos):
@@ -7041,14 +7970,14 @@ class PointCloudViewer(ApplicationUI):
 
         # Always update position
         self.slider_marker_actor.SetPosition(world_pos[0], world_pos[1], world_pos[2])
-        self.vtk_widget.GetRenderWindow().Render()
+        self.request_render()
 
     def remove_slider_marker(self):
         """Remove the slider position sphere from the scene"""
         if self.slider_marker_actor is not None:
             self.renderer.RemoveActor(self.slider_marker_actor)
             self.slider_marker_actor = None
-            self.vtk_widget.GetRenderWindow().Render()
+            self.request_render()
 
 # =============================================================================================================================================================
     def open_zero_line_dialog(self, auto_opened=False):
@@ -7114,7 +8043,7 @@ class PointCloudViewer(ApplicationUI):
 
                 # Refresh 3D view
                 if hasattr(self, 'vtk_widget'):
-                    self.vtk_widget.GetRenderWindow().Render()
+                    self.request_render()
 
                 # === CRITICAL: Save zero line config to current design layer ===
                 success = self.save_zero_line_config_to_current_layer()
@@ -7195,6 +8124,8 @@ class PointCloudViewer(ApplicationUI):
                 json.dump(zero_config, f, indent=4, ensure_ascii=False)
             self.message_text.append("Zero line configuration saved to:")
             self.message_text.append(f"   {json_path}")
+            # Chainages of the saved index refer to the previous zero line
+            self.invalidate_station_index()
             return True
         except Exception as e:
             error_msg = f"Failed to save zero_line_config.json: {str(e)}"
@@ -0,0 +1,106 @@
+# polygon_volume.py
+import numpy as np
+
+from dtm import fill_holes
+
+VOLUME_MAX_CELLS = 250_000          # grid cells over the polygon's bounding box (the cell size grows to fit)
+VOLUME_POINTS_PER_CELL = 2.0        # target point count per cell for the automatic cell size
+VOLUME_MIN_CELL = 0.02              # metres
+
+
+def points_in_polygon(xy, polygon):
+    """Boolean mask of (N, 2) points inside a closed (M, 2) polygon (even-odd rule, any shape).
+    One vectorised crossing test per edge over all points.
+    """
+    x = xy[:, 0]
+    y = xy[:, 1]
+    inside = np.zeros(len(xy), dtype=bool)
+    polygon = np.asarray(polygon, dtype=np.float64)
+    for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if y1 == y2:
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def fit_base_plane(vertices):
+    """Least-squares plane z = a*x + b*y + c through the polygon vertices; returns (a, b, c)"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    design = np.column_stack([vertices[:, 0], vertices[:, 1], np.ones(len(vertices))])
+    (a, b, c), *_ = np.linalg.lstsq(design, vertices[:, 2], rcond=None)
+    return a, b, c
+
+
+def polygon_volume(store, polygon, candidates=None, base=None, cell_size=None):
+    """Cut / fill between the cloud surface inside a picked polygon and a base plane.
+
+    polygon is (M, 3) world vertices (their XY outline is used). candidates optionally limits
+    the search to store indices (e.g. from a spatial index query). base is (a, b, c) of a world
+    plane z = a*x + b*y + c, fitted through the vertices when None. The surface is the mean point
+    elevation per grid cell, with empty cells inside the polygon filled from their neighbours.
+    Returns a dict of volumes (m³), area (m²) and grid details, or None without points inside.
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    if base is None:
+        base = fit_base_plane(polygon)
+    # Everything below runs in the store's local frame
+    local_polygon = polygon[:, :3] - store.origin
+    a, b, c = base
+    local_c = c + a * store.origin[0] + b * store.origin[1] - store.origin[2]
+
+    xmin, ymin = local_polygon[:, :2].min(axis=0)
+    xmax, ymax = local_polygon[:, :2].max(axis=0)
+    if candidates is None:
+        points = store.local_points
+        in_box = ((points[:, 0] >= xmin) & (points[:, 0] <= xmax) &
+                  (points[:, 1] >= ymin) & (points[:, 1] <= ymax))
+        candidates = np.flatnonzero(in_box)
+    points = store.local_points[np.asarray(candidates)]
+    points = points[points_in_polygon(points[:, :2].astype(np.float64), local_polygon[:, :2])]
+    if len(points) == 0:
+        return None
+
+    box_area = max((xmax - xmin) * (ymax - ymin), 1e-12)
+    if cell_size is None:
+        cell_size = max(np.sqrt(box_area / VOLUME_MAX_CELLS),
+                        np.sqrt(VOLUME_POINTS_PER_CELL * box_area / len(points)), VOLUME_MIN_CELL)
+    cols = max(1, int(np.ceil((xmax - xmin) / cell_size)))
+    rows = max(1, int(np.ceil((ymax - ymin) / cell_size)))
+
+    # Mean elevation per cell
+    col = np.clip(((points[:, 0] - xmin) / cell_size).astype(np.int64), 0, cols - 1)
+    row = np.clip(((points[:, 1] - ymin) / cell_size).astype(np.int64), 0, rows - 1)
+    cell = row * cols + col
+    counts = np.bincount(cell, minlength=rows * cols)
+    sums = np.bincount(cell, weights=points[:, 2].astype(np.float64), minlength=rows * cols)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        surface = (sums / counts).reshape(rows, cols)
+
+    # Cells whose centre lies inside the polygon make up the measured area
+    cx = xmin + (np.arange(cols) + 0.5) * cell_size
+    cy = ymin + (np.arange(rows) + 0.5) * cell_size
+    gx, gy = np.meshgrid(cx, cy)
+    inside = points_in_polygon(np.column_stack([gx.ravel(), gy.ravel()]), local_polygon[:, :2]).reshape(rows, cols)
+    if not inside.any():
+        # Polygon thinner than one cell: use the cells that hold points
+        inside = counts.reshape(rows, cols) > 0
+    filled_cells = int(np.count_nonzero(inside & ~np.isnan(surface)))
+    fill_holes(surface, max(rows, cols))
+
+    height = surface - (a * gx + b * gy + local_c)
+    height = np.where(inside, np.nan_to_num(height), 0.0)
+    cell_area = cell_size * cell_size
+    cut = float(np.sum(np.maximum(height, 0.0)) * cell_area)
+    fill = float(np.sum(np.maximum(-height, 0.0)) * cell_area)
+    return {
+        "cut_volume_m3": cut,                   # material above the base plane (stockpile)
+        "fill_volume_m3": fill,                 # space below the base plane (pit)
+        "net_volume_m3": cut - fill,
+        "area_m2": float(np.count_nonzero(inside) * cell_area),
+        "cell_size_m": float(cell_size),
+        "point_count": int(len(points)),
+        "coverage": filled_cells / max(int(np.count_nonzero(inside)), 1),
+        "base_plane": [float(a), float(b), float(c)],
+    }
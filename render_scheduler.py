@@ -0,0 +1,43 @@
+# render_scheduler.py
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+DEFAULT_FRAME_BUDGET_MS = 16        # at most ~60 scene renders per second
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS RENDERSCHEDULER **
+# =====================================================================================================================================
+class RenderScheduler(QObject):
+    """Coalesce render requests for a VTK render window.
+
+    request() only marks the scene dirty; one render is issued on the next event-loop tick,
+    or later if the previous render was less than frame_budget_ms ago.
+    """
+    def __init__(self, render_window, parent=None, frame_budget_ms=DEFAULT_FRAME_BUDGET_MS):
+        super().__init__(parent)
+        self.render_window = render_window
+        self.frame_budget_ms = frame_budget_ms
+        self.dirty = False
+        self._last_render = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._render_pending)
+
+    def request(self):
+        """Mark the scene dirty; the render happens once control returns to the event loop"""
+        if self.dirty:
+            return
+        self.dirty = True
+        elapsed_ms = (time.monotonic() - self._last_render) * 1000.0
+        self._timer.start(int(max(0.0, self.frame_budget_ms - elapsed_ms)))
+
+    def _render_pending(self):
+        if self.dirty:
+            self._render()
+
+    def _render(self):
+        self.dirty = False
+        self._last_render = time.monotonic()
+        self.render_window.Render()
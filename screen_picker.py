@@ -0,0 +1,174 @@
+# screen_picker.py
+import math
+import numpy as np
+
+PROJECTION_BATCH = 2_000_000        # points projected per NumPy batch when no index is available
+RAY_SPHERE_OVERLAP = 1.2            # sphere radius / sample spacing along the pick ray
+MAX_RAY_SAMPLES = 20_000            # spheres get larger (never sparser) beyond this many samples
+
+
+def camera_state_key(renderer):
+    """Identifies everything a projection depends on; changes whenever the view does"""
+    camera = renderer.GetActiveCamera()
+    return (camera.GetMTime(), tuple(renderer.GetSize()), tuple(renderer.GetOrigin()))
+
+
+def world_to_display_matrix(renderer, origin=None):
+    """4x4 matrix taking homogeneous (local) points to clip space of the renderer's camera.
+    With origin the translation from local offsets to world is folded in (float64).
+    """
+    camera = renderer.GetActiveCamera()
+    vtk_matrix = camera.GetCompositeProjectionTransformMatrix(renderer.GetTiledAspectRatio(), -1, 1)
+    matrix = np.array([[vtk_matrix.GetElement(r, c) for c in range(4)] for r in range(4)])
+    if origin is not None:
+        translate = np.eye(4)
+        translate[:3, 3] = origin
+        matrix = matrix @ translate
+    return matrix
+
+
+def project_points(matrix, points, renderer):
+    """Project (N, 3) points with a world_to_display_matrix; returns (display_xy (N, 2), in_front (N,))"""
+    points = np.asarray(points, dtype=np.float64)
+    clip = points @ matrix[:3, :3].T + matrix[:3, 3]
+    w = points @ matrix[3, :3] + matrix[3, 3]
+    in_front = w > 1e-12
+    w = np.where(in_front, w, 1.0)
+    size = renderer.GetSize()
+    low = renderer.GetOrigin()
+    display = np.empty((len(points), 2))
+    display[:, 0] = low[0] + (clip[:, 0] / w + 1.0) * 0.5 * size[0]
+    display[:, 1] = low[1] + (clip[:, 1] / w + 1.0) * 0.5 * size[1]
+    in_front &= np.abs(clip[:, 2] / w) <= 1.0           # between the clipping planes
+    return display, in_front
+
+
+def _clip_segment_to_box(start, end, bounds):
+    """Clip the segment start→end to an axis-aligned box; returns (t0, t1) or None"""
+    direction = end - start
+    t0, t1 = 0.0, 1.0
+    for axis in range(3):
+        low, high = bounds[2 * axis], bounds[2 * axis + 1]
+        if abs(direction[axis]) < 1e-12:
+            if start[axis] < low or start[axis] > high:
+                return None
+            continue
+        a = (low - start[axis]) / direction[axis]
+        b = (high - start[axis]) / direction[axis]
+        t0, t1 = max(t0, min(a, b)), min(t1, max(a, b))
+        if t0 > t1:
+            return None
+    return t0, t1
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS SCREENPICKER **
+# =====================================================================================================================================
+class ScreenPicker:
+    """Find the cloud point drawn closest to a screen position.
+
+    The camera's composite matrix is taken once per pick and applied to points in batches.
+    With a SpatialIndex only the points near the pick ray are projected; without one the whole
+    cloud is projected. Projections are cached until the camera, viewport or cloud changes.
+    """
+    def __init__(self):
+        self._cache_key = None
+        self._cached_display = None     # float32 screen positions of the whole cloud
+        self._cached_visible = None
+        self._bounds_store = None
+        self._bounds = None
+
+    def invalidate(self):
+        self._cache_key = None
+        self._cached_display = self._cached_visible = None
+
+    def _store_bounds(self, store):
+        if self._bounds_store is not store:
+            self._bounds_store = store
+            self._bounds = store.bounds()
+        return self._bounds
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def pick(self, renderer, store, display_pos, pixel_radius=4, index=None):
+        """World coordinates of the point nearest display_pos within pixel_radius, or None"""
+        if store is None or not store.has_points():
+            return None
+        key = camera_state_key(renderer) + (id(store), index is not None)
+        if key != self._cache_key:
+            self.invalidate()
+            self._cache_key = key
+
+        if index is not None:
+            candidates = self._ray_candidates(renderer, store, display_pos, pixel_radius, index)
+            if len(candidates) == 0:
+                return None
+            display, visible = project_points(world_to_display_matrix(renderer, store.origin),
+                                              store.local_points[candidates], renderer)
+        else:
+            if self._cached_display is None:
+                self._project_all(renderer, store)
+            candidates = None
+            display, visible = self._cached_display, self._cached_visible
+
+        distance2 = (display[:, 0] - display_pos[0]) ** 2 + (display[:, 1] - display_pos[1]) ** 2
+        distance2[~visible] = np.inf
+        best = int(np.argmin(distance2))
+        if distance2[best] > pixel_radius ** 2:
+            return None
+        point_index = int(candidates[best]) if candidates is not None else best
+        return store.world_point(point_index)
+
+    def _project_all(self, renderer, store):
+        """Project the whole cloud in batches (float32 screen positions are kept for later picks)"""
+        matrix = world_to_display_matrix(renderer, store.origin)
+        count = len(store)
+        display = np.empty((count, 2), dtype=np.float32)
+        visible = np.empty(count, dtype=bool)
+        for start in range(0, count, PROJECTION_BATCH):
+            end = min(start + PROJECTION_BATCH, count)
+            display[start:end], visible[start:end] = project_points(matrix, store.local_points[start:end], renderer)
+        self._cached_display, self._cached_visible = display, visible
+
+    def _ray_candidates(self, renderer, store, display_pos, pixel_radius, index):
+        """Indices of points inside the cone of pixel_radius around the pick ray (via radius queries)"""
+        camera = renderer.GetActiveCamera()
+        near = self._display_to_world(renderer, display_pos, 0.0)
+        far = self._display_to_world(renderer, display_pos, 1.0)
+        bounds = np.asarray(self._store_bounds(store), dtype=np.float64)
+        pad = 0.01 * np.linalg.norm(bounds[1::2] - bounds[0::2])
+        clipped = _clip_segment_to_box(near, far, bounds + np.tile([-pad, pad], 3))
+        if clipped is None:
+            return np.empty(0, dtype=np.int64)
+        start = near + clipped[0] * (far - near)
+        end = near + clipped[1] * (far - near)
+        length = np.linalg.norm(end - start)
+        direction = (end - start) / length if length > 0 else np.zeros(3)
+
+        height = max(renderer.GetSize()[1], 1)
+        if camera.GetParallelProjection():
+            spacing = max(2.0 * camera.GetParallelScale() / height * pixel_radius, length / MAX_RAY_SAMPLES)
+            samples = np.append(np.arange(0.0, length, spacing), length)
+            radii = np.full(len(samples), spacing)
+        else:
+            # The pixel disc grows linearly with the distance d from the eye, so spheres of radius
+            # d * slope spaced by their radius form a geometric progression along the ray
+            slope = 2.0 * math.tan(math.radians(camera.GetViewAngle()) / 2.0) / height * pixel_radius
+            base = max(np.linalg.norm(start - np.asarray(camera.GetPosition())), 1e-6)
+            span = math.log((base + length) / base)
+            ratio = max(1.0 + slope, math.exp(span / MAX_RAY_SAMPLES))
+            distances = base * ratio ** np.arange(int(math.ceil(span / math.log(ratio))) + 1)
+            samples = np.minimum(distances - base, length)
+            radii = distances * (ratio - 1.0)
+        centres = start + samples[:, None] * direction
+        radii = radii * RAY_SPHERE_OVERLAP
+        hits = index.tree.query_ball_point(store.to_local(centres), radii, workers=-1)
+        if len(hits) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([np.asarray(h, dtype=np.int64) for h in hits]))
+
+    @staticmethod
+    def _display_to_world(renderer, display_pos, depth):
+        renderer.SetDisplayPoint(display_pos[0], display_pos[1], depth)
+        renderer.DisplayToWorld()
+        world = renderer.GetWorldPoint()
+        return np.array(world[:3]) / world[3]
@@ -0,0 +1,114 @@
+# section_window.py
+import numpy as np
+import vtk
+from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
+
+from vtk_utils import VTK_ID_DTYPE, numpy_to_vtk_colors, build_point_polydata, set_point_scalars
+
+DEFAULT_SECTION_HALF_WIDTH = 25.0       # metres either side of the slider chainage
+CONTEXT_POINT_COUNT = 1_000_000         # decimated context cloud is at most about this large
+
+
+# =====================================================================================================================================
+#                                                   ** CLASS SECTIONWINDOWRENDERER **
+# =====================================================================================================================================
+class SectionWindowRenderer:
+    """Draw only the cloud points within ±half_width metres of a chainage, plus an optional decimated context.
+
+    The cloud is gathered once into chainage order (from a StationIndex), so every window is a
+    contiguous range of that copy. Moving the window only re-points the VTK arrays at another
+    slice of it: nothing is copied and only the window's points are uploaded for drawing.
+    """
+    def __init__(self, station_index, colors, half_width=DEFAULT_SECTION_HALF_WIDTH, show_context=True):
+        store = station_index.store
+        order = np.asarray(station_index.order)
+        self.order = order
+        self.chainage = station_index.chainage
+        self.points = store.local_points[order]
+        self.point_colors = store.colors[order] if store.has_colors() else None
+        self.half_width = float(half_width)
+        self.center = None
+        self.range = (0, 0)
+        self._ids = np.arange(1, dtype=VTK_ID_DTYPE)
+        self.scalars = None                     # per-point float array in chainage order (e.g. deviations)
+        self.scalar_table = None
+        self.scalar_name = "Scalars"
+
+        self.polydata = vtk.vtkPolyData()
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputData(self.polydata)
+        self.window_actor = vtk.vtkActor()
+        self.window_actor.SetMapper(mapper)
+        self.window_actor.SetPosition(*store.origin)
+        self.window_actor.GetProperty().SetPointSize(2)
+        if self.point_colors is None:
+            self.window_actor.GetProperty().SetColor(colors.GetColor3d("Black"))
+
+        # Every k-th point in chainage order is an even sample along the whole alignment
+        stride = max(1, len(self.points) // CONTEXT_POINT_COUNT)
+        context = build_point_polydata(np.ascontiguousarray(self.points[::stride]))
+        context_mapper = vtk.vtkPolyDataMapper()
+        context_mapper.SetInputData(context)
+        self.context_actor = vtk.vtkActor()
+        self.context_actor.SetMapper(context_mapper)
+        self.context_actor.SetPosition(*store.origin)
+        self.context_actor.GetProperty().SetPointSize(1)
+        self.context_actor.GetProperty().SetColor(colors.GetColor3d("Silver"))
+        self.context_actor.SetVisibility(bool(show_context))
+        self.context_actor.PickableOff()
+
+    def actors(self):
+        return (self.window_actor, self.context_actor)
+
+    def window_point_count(self):
+        return self.range[1] - self.range[0]
+
+    def set_context_visible(self, visible):
+        self.context_actor.SetVisibility(bool(visible))
+
+    def set_scalars(self, values=None, lookup_table=None, name="Scalars"):
+        """Colour the window by a float array over the store's points (None: back to the RGB colours)"""
+        if self.scalars is not None:
+            set_point_scalars(self.window_actor.GetMapper(), None, name=self.scalar_name)
+        self.scalars = None if values is None else np.asarray(values, dtype=np.float32)[self.order]
+        self.scalar_table = lookup_table
+        self.scalar_name = name
+        if self.scalars is not None:
+            self._apply_scalars()
+
+    def _apply_scalars(self):
+        lo, hi = self.range
+        set_point_scalars(self.window_actor.GetMapper(), self.scalars[lo:hi], self.scalar_table, self.scalar_name)
+
+    def set_half_width(self, half_width):
+        """Change the window size; returns True if the drawn range changed"""
+        self.half_width = float(half_width)
+        return self.center is not None and self.set_chainage(self.center)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def set_chainage(self, chainage):
+        """Centre the window on a chainage; returns True if the drawn range changed"""
+        self.center = float(chainage)
+        lo = int(np.searchsorted(self.chainage, self.center - self.half_width, side='left'))
+        hi = int(np.searchsorted(self.chainage, self.center + self.half_width, side='right'))
+        if (lo, hi) == self.range:
+            return False
+        self.range = (lo, hi)
+        count = hi - lo
+        if len(self._ids) < count + 1:
+            self._ids = np.arange(max(count + 1, 2 * len(self._ids)), dtype=VTK_ID_DTYPE)
+
+        vtk_points = vtk.vtkPoints()
+        vtk_points.SetData(numpy_to_vtk(self.points[lo:hi], deep=False))
+        cells = vtk.vtkCellArray()
+        # Vertex cells of a contiguous range: offsets and connectivity are both prefixes of one arange
+        cells.SetData(numpy_to_vtkIdTypeArray(self._ids[:count + 1], deep=False),
+                      numpy_to_vtkIdTypeArray(self._ids[:count], deep=False))
+        self.polydata.SetPoints(vtk_points)
+        self.polydata.SetVerts(cells)
+        if self.point_colors is not None:
+            self.polydata.GetPointData().SetScalars(numpy_to_vtk_colors(self.point_colors[lo:hi]))
+        if self.scalars is not None:
+            self._apply_scalars()
+        self.polydata.Modified()
+        return True
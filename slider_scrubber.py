@@ -0,0 +1,124 @@
+# slider_scrubber.py
+import math
+import time
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+
+SCRUB_FRAME_MS = 16                 # slider updates are applied at most once per display frame
+CAMERA_SMOOTHING_S = 0.08           # time constant of the camera easing towards its target
+VELOCITY_TIMEOUT_S = 0.05           # slider considered at rest after this long without events
+SETTLE_TOLERANCE = 1e-3             # camera settled within this fraction of its viewing distance
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS SLIDERSCRUBBER **
+# =====================================================================================================================================
+class SliderScrubber(QObject):
+    """Coalesce slider events to one update per frame and ease the camera between targets.
+
+    push() only records the newest slider value. Each frame the 2D callback runs once with
+    that value, then the camera moves a step towards the target of the value predicted from
+    the slider velocity (which cancels the lag of the easing while dragging). The camera
+    callback only requests a render, so a slow 3D frame delays the next camera step but never
+    the 2D marker. jump() applies a value at once (keyboard steps, programmatic changes).
+
+        update_graph(value)             2D markers / scrolling for the exact slider value
+        camera_target(value)            (focal_point, position) arrays or None
+        apply_camera(focal, position)   set the camera and request a render
+        current_camera()                (focal_point, position) the easing starts from
+    """
+    def __init__(self, update_graph, camera_target, apply_camera, current_camera, parent=None,
+                 frame_ms=SCRUB_FRAME_MS, smoothing_s=CAMERA_SMOOTHING_S):
+        super().__init__(parent)
+        self.update_graph = update_graph
+        self.camera_target = camera_target
+        self.apply_camera = apply_camera
+        self.current_camera = current_camera
+        self.smoothing_s = smoothing_s
+        self.value = None                   # newest slider value
+        self.value_range = (0, 100)
+        self.event_count = 0
+        self.frame_count = 0
+        self._graph_value = None            # value the 2D view shows
+        self._camera = None                 # current (focal, position) as one (6,) array
+        self._velocity = 0.0                # slider units per second
+        self._last_event = None
+        self._last_frame = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(frame_ms)
+        self._timer.timeout.connect(self._frame)
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def push(self, value, minimum=0, maximum=100):
+        """Record a slider value while scrubbing; the work happens on the next frame"""
+        now = time.monotonic()
+        if self._last_event is not None and self.value is not None and now > self._last_event:
+            instant = (value - self.value) / (now - self._last_event)
+            self._velocity = 0.5 * self._velocity + 0.5 * instant
+        self.value = value
+        self.value_range = (minimum, maximum)
+        self._last_event = now
+        self.event_count += 1
+        if not self._timer.isActive():
+            # Start easing from wherever the camera is now (it may have been moved with the mouse)
+            focal, position = self.current_camera()
+            self._camera = np.concatenate([np.asarray(focal, dtype=np.float64), np.asarray(position, dtype=np.float64)])
+            self._last_frame = now
+            self._timer.start()
+
+    def jump(self, value):
+        """Apply a value immediately without easing (and stop any scrubbing in progress)"""
+        self._timer.stop()
+        self.value = value
+        self._velocity = 0.0
+        self._last_event = None
+        self._graph_value = value
+        self.update_graph(value)
+        target = self._target(value)
+        if target is not None:
+            self.apply_camera(target[:3], target[3:])
+
+    def stop(self):
+        self._timer.stop()
+        self._velocity = 0.0
+        self._last_event = None
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def _target(self, value):
+        target = self.camera_target(value)
+        if target is None:
+            return None
+        return np.concatenate([np.asarray(target[0], dtype=np.float64), np.asarray(target[1], dtype=np.float64)])
+
+    def _frame(self):
+        now = time.monotonic()
+        dt = max(now - (self._last_frame or now), 1e-3)
+        self._last_frame = now
+        self.frame_count += 1
+        value = self.value
+
+        # 2D first: cheap and must track the slider exactly
+        if value != self._graph_value:
+            self._graph_value = value
+            self.update_graph(value)
+
+        dragging = self._last_event is not None and now - self._last_event < VELOCITY_TIMEOUT_S
+        if not dragging:
+            self._velocity = 0.0
+        low, high = self.value_range
+        predicted = min(max(value + self._velocity * self.smoothing_s, low), high)
+        target = self._target(predicted)
+        if target is None:
+            self._timer.stop()
+            return
+        alpha = 1.0 - math.exp(-dt / self.smoothing_s)
+        camera = self._camera + (target - self._camera) * alpha
+        distance = np.linalg.norm(target[3:] - target[:3])
+        settled = not dragging and np.linalg.norm(target - camera) <= SETTLE_TOLERANCE * max(distance, 1e-6)
+        self._camera = target if settled else camera
+        self.apply_camera(self._camera[:3], self._camera[3:])
+        if settled:
+            self._timer.stop()
@@ -0,0 +1,70 @@
+# spatial_index.py
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS SPATIALINDEX **
+# =====================================================================================================================================
+class SpatialIndex:
+    """KD-tree over a PointStore for snapping, radius and k-nearest queries.
+
+    The tree is built on the store's local float32 offsets; queries take and return world
+    coordinates. Indices refer to the store the index was built for, so an index must be
+    rebuilt whenever the cloud changes (check is_for()).
+    """
+    def __init__(self, store, leafsize=32):
+        self.store = store
+        # Unbalanced trees with loose nodes build several times faster on large clouds
+        self.tree = cKDTree(store.local_points, leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+
+    def __len__(self):
+        return self.tree.n
+
+    def is_for(self, store):
+        return store is self.store
+
+    def _local(self, world_points):
+        return self.store.to_local(world_points)
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def nearest(self, world_points, k=1, max_distance=np.inf):
+        """Return (distances, indices) of the k nearest points for one or many world points.
+        Missing neighbours beyond max_distance have distance inf and index len(self).
+        """
+        return self.tree.query(self._local(world_points), k=k, distance_upper_bound=max_distance, workers=-1)
+
+    def nearest_point(self, world_point, max_distance=np.inf):
+        """World coordinates of the cloud point closest to world_point, or None"""
+        distance, index = self.tree.query(self._local(world_point), k=1, distance_upper_bound=max_distance)
+        if not np.isfinite(distance):
+            return None
+        return self.store.world_point(int(index))
+
+    def k_nearest(self, world_point, k):
+        """Indices of the k nearest points (closest first)"""
+        _, indices = self.tree.query(self._local(world_point), k=k)
+        indices = np.atleast_1d(indices)
+        return indices[indices < len(self)]
+
+    def radius(self, world_point, radius, sort=False):
+        """Indices of all points within radius (3D distance) of world_point"""
+        indices = np.asarray(self.tree.query_ball_point(self._local(world_point), radius,
+                                                        workers=-1, return_sorted=sort), dtype=np.int64)
+        return indices
+
+    def radius_points(self, world_point, radius):
+        """World coordinates of all points within radius of world_point"""
+        return self.store.world_points(self.radius(world_point, radius))
+
+    def box(self, world_min, world_max):
+        """Indices of all points inside an axis-aligned world box (cube query, then trimmed to the box)"""
+        low = self._local(np.asarray(world_min, dtype=np.float64))
+        high = self._local(np.asarray(world_max, dtype=np.float64))
+        centre = (low + high) / 2.0
+        half = float(np.max(high - low)) / 2.0
+        indices = np.asarray(self.tree.query_ball_point(centre, half, p=np.inf, workers=-1), dtype=np.int64)
+        if len(indices) == 0:
+            return indices
+        points = self.store.local_points[indices]
+        return indices[np.all((points >= low) & (points <= high), axis=1)]
@@ -0,0 +1,168 @@
+# station_index.py
+import os
+import json
+import hashlib
+import numpy as np
+
+STATION_CACHE_DIR_NAME = ".station_index"
+STATION_INDEX_VERSION = 1
+STATION_CHUNK = 4_000_000           # points stationed per vectorised batch
+
+
+def alignment_signature(vertices):
+    """Stable text identifying an alignment polyline"""
+    return hashlib.sha1(np.round(np.asarray(vertices, dtype=np.float64), 3).tobytes()).hexdigest()
+
+
+def cloud_signature(store, source_paths=()):
+    """Identify a loaded cloud by its source files (path, size, mtime), origin and a sample of its points.
+    The sample also tells apart stores holding the same points in another order (e.g. octree order).
+    """
+    sample = np.ascontiguousarray(store.local_points[::max(1, len(store) // 4096)])
+    ident = [f"{len(store)}", ",".join(f"{c:.3f}" for c in store.origin), hashlib.sha1(sample.tobytes()).hexdigest()]
+    for path in sorted(source_paths or ()):
+        try:
+            st = os.stat(path)
+            ident.append(f"{os.path.normcase(os.path.abspath(path))}|{st.st_size}|{st.st_mtime_ns}")
+        except OSError:
+            ident.append(str(path))
+    return hashlib.sha1("|".join(ident).encode('utf-8')).hexdigest()
+
+
+def station_coordinates(vertices, points_xy):
+    """Chainage along a plan polyline and signed offset from it (positive to the left) for (N, 2) points.
+    Each point is stationed on its nearest segment; the first and last segments are extended so
+    points before the start / past the end get negative / over-length chainages.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)[:, :2]
+    px = np.asarray(points_xy[:, 0], dtype=np.float64)
+    py = np.asarray(points_xy[:, 1], dtype=np.float64)
+    best = np.full(len(px), np.inf)
+    chainage = np.zeros(len(px))
+    offset = np.zeros(len(px))
+    start_chainage = 0.0
+    last = len(vertices) - 2
+    for i, (a, b) in enumerate(zip(vertices[:-1], vertices[1:])):
+        seg = b - a
+        length = float(np.hypot(*seg))
+        if length <= 0:
+            continue
+        ux, uy = seg / length
+        along = (px - a[0]) * ux + (py - a[1]) * uy
+        np.clip(along, -np.inf if i == 0 else 0.0, np.inf if i == last else length, out=along)
+        dx = px - (a[0] + along * ux)
+        dy = py - (a[1] + along * uy)
+        d2 = dx * dx + dy * dy
+        closer = d2 < best
+        best[closer] = d2[closer]
+        chainage[closer] = start_chainage + along[closer]
+        offset[closer] = (ux * (py - a[1]) - uy * (px - a[0]))[closer]
+        start_chainage += length
+    return chainage, offset
+
+
+# =====================================================================================================================================
+#                                                       ** CLASS STATIONINDEX **
+# =====================================================================================================================================
+class StationIndex:
+    """Cloud points sorted by chainage along the zero line (and its curves).
+
+    chainage[i] and offset[i] belong to point order[i] of the store. Any chainage window is a
+    contiguous range found by binary search, so the index arrays of a window are views, not copies.
+    Saved as .npy files and memory-mapped on load; signature ties it to one cloud and alignment.
+    """
+    def __init__(self, order, chainage, offset, signature, store=None):
+        self.order = order                  # (N,) point indices into the store, sorted by chainage
+        self.chainage = chainage            # (N,) float32 metres along the alignment, ascending
+        self.offset = offset                # (N,) float32 signed plan distance from the alignment
+        self.signature = signature
+        self.store = store
+
+    def __len__(self):
+        return len(self.order)
+
+    def is_for(self, store, signature):
+        return store is self.store and signature == self.signature
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def build(cls, store, vertices, signature, is_cancelled=None):
+        """Station every point of a PointStore against alignment vertices (world XY)"""
+        count = len(store)
+        chainage = np.empty(count, dtype=np.float32)
+        offset = np.empty(count, dtype=np.float32)
+        # Work in the store's local frame: shift the (few) vertices instead of the points
+        local_vertices = np.asarray(vertices, dtype=np.float64)[:, :2] - store.origin[:2]
+        for start in range(0, count, STATION_CHUNK):
+            if is_cancelled and is_cancelled():
+                return None
+            end = min(start + STATION_CHUNK, count)
+            chainage[start:end], offset[start:end] = station_coordinates(local_vertices, store.local_points[start:end])
+        order = np.argsort(chainage, kind='stable').astype(np.int32 if count < 2 ** 31 else np.int64)
+        return cls(order, chainage[order], offset[order], signature, store)
+
+    def window(self, start, end):
+        """slice of the sorted arrays covering start <= chainage <= end"""
+        lo = int(np.searchsorted(self.chainage, start, side='left'))
+        hi = int(np.searchsorted(self.chainage, end, side='right'))
+        return slice(lo, hi)
+
+    def indices(self, start, end, max_offset=None):
+        """Store indices of the points in a chainage window (a view unless max_offset filters it)"""
+        window = self.window(start, end)
+        if max_offset is None:
+            return self.order[window]
+        return self.order[window][np.abs(self.offset[window]) <= max_offset]
+
+    def near(self, chainage, half_width, max_offset=None):
+        """Store indices of the points within half_width metres (along the alignment) of a chainage"""
+        return self.indices(chainage - half_width, chainage + half_width, max_offset)
+
+    def world_points(self, start, end, max_offset=None):
+        return self.store.world_points(self.indices(start, end, max_offset))
+
+    # -------------------------------------------------------------------------------------------------------------------------
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        # meta.json goes last: an interrupted save never pairs old metadata with new arrays
+        meta_path = os.path.join(cache_dir, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        for name in ("order", "chainage", "offset"):
+            path = os.path.join(cache_dir, f"{name}.npy")
+            with open(path + ".tmp", 'wb') as f:
+                np.save(f, getattr(self, name))
+            os.replace(path + ".tmp", path)
+        meta = {"version": STATION_INDEX_VERSION, "signature": self.signature, "point_count": len(self)}
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    @classmethod
+    def load(cls, cache_dir, store, signature):
+        """Memory-map a saved index, or None if it is missing or was built for another cloud / alignment"""
+        meta_path = os.path.join(cache_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get("version") != STATION_INDEX_VERSION or meta.get("signature") != signature
+                    or meta.get("point_count") != len(store)):
+                return None
+            arrays = [np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode='r')
+                      for name in ("order", "chainage", "offset")]
+        except Exception as e:
+            print(f"Ignoring unreadable station index in {cache_dir}: {e}")
+            return None
+        return cls(*arrays, signature, store)
+
+    @staticmethod
+    def remove(cache_dir):
+        """Delete a saved index (the alignment it was built for has changed)"""
+        for name in ("meta.json", "order.npy", "chainage.npy", "offset.npy"):
+            path = os.path.join(cache_dir, name)
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
@@ -4,6 +4,6 @@ def find_best_fitting_plane(points):
     """Find the best fitting plane for given points"""
     centroid = np.mean(points, axis=0)
     centered = points - centroid
-    _, _, vh = np.linalg.svd(centered)
+    _, _, vh = np.linalg.svd(centered, full_matrices=False)
     normal = vh[2]  # The third row is the normal to the best-fit plane
     return centroid, normal
\ No newline at end of file
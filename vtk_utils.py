@@ -0,0 +1,106 @@
+# vtk_utils.py
+import numpy as np
+import vtk
+from vtkmodules.util.numpy_support import (numpy_to_vtk, numpy_to_vtkIdTypeArray,
+                                           get_numpy_array_type, VTK_ID_TYPE)
+
+# numpy dtype matching vtkIdType on this VTK build (int64 on 64-bit builds)
+VTK_ID_DTYPE = np.dtype(get_numpy_array_type(VTK_ID_TYPE))
+
+
+def numpy_to_vtk_points(points):
+    """Wrap an (N, 3) float array as vtkPoints without copying when the layout allows it"""
+    points = np.asarray(points)
+    if points.dtype not in (np.float32, np.float64):
+        points = points.astype(np.float32)
+    points = np.ascontiguousarray(points)
+    vtk_points = vtk.vtkPoints()
+    # deep=False keeps a reference to the numpy buffer on the VTK array
+    vtk_points.SetData(numpy_to_vtk(points, deep=False))
+    return vtk_points
+
+
+def make_vertex_cells(num_points):
+    """Build one vertex cell per point from prebuilt offsets/connectivity arrays"""
+    offsets = np.arange(num_points + 1, dtype=VTK_ID_DTYPE)
+    connectivity = np.arange(num_points, dtype=VTK_ID_DTYPE)
+    cells = vtk.vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                  numpy_to_vtkIdTypeArray(connectivity, deep=False))
+    return cells
+
+
+def make_line_cells(num_segments):
+    """Build one two-point line cell per segment (segment i uses points 2i and 2i+1)"""
+    offsets = np.arange(0, 2 * num_segments + 1, 2, dtype=VTK_ID_DTYPE)
+    connectivity = np.arange(2 * num_segments, dtype=VTK_ID_DTYPE)
+    cells = vtk.vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets, deep=False),
+                  numpy_to_vtkIdTypeArray(connectivity, deep=False))
+    return cells
+
+
+def colors_to_uint8(colors):
+    """Convert Open3D style 0-1 float colors to contiguous uint8 RGB"""
+    colors = np.asarray(colors)
+    if colors.dtype == np.uint8:
+        return np.ascontiguousarray(colors)
+    return np.clip(colors * 255.0, 0, 255).astype(np.uint8)
+
+
+def numpy_to_vtk_colors(colors, name="Colors"):
+    """Wrap (N, 3) RGB colors as a vtkUnsignedCharArray usable as point scalars"""
+    vtk_colors = numpy_to_vtk(colors_to_uint8(colors), deep=False,
+                              array_type=vtk.VTK_UNSIGNED_CHAR)
+    vtk_colors.SetName(name)
+    return vtk_colors
+
+
+def build_point_polydata(points, colors=None):
+    """Create vtkPolyData with vertex cells (and optional RGB scalars) for a point array in one step"""
+    points = np.asarray(points)
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(numpy_to_vtk_points(points))
+    polydata.SetVerts(make_vertex_cells(len(points)))
+    if colors is not None and len(colors) == len(points):
+        polydata.GetPointData().SetScalars(numpy_to_vtk_colors(colors))
+    return polydata
+
+
+def make_diverging_lookup_table(limit, nan_color=(0.75, 0.75, 0.75), table_size=256):
+    """Blue (below) - white - red (above) lookup table over [-limit, limit]; NaN values are drawn grey"""
+    transfer = vtk.vtkColorTransferFunction()
+    transfer.SetColorSpaceToDiverging()
+    transfer.AddRGBPoint(-limit, 0.23, 0.30, 0.75)
+    transfer.AddRGBPoint(0.0, 0.87, 0.87, 0.87)
+    transfer.AddRGBPoint(limit, 0.71, 0.02, 0.15)
+    table = vtk.vtkLookupTable()
+    table.SetNumberOfTableValues(table_size)
+    table.SetRange(-limit, limit)
+    for i, value in enumerate(np.linspace(-limit, limit, table_size)):
+        table.SetTableValue(i, *transfer.GetColor(value), 1.0)
+    table.SetNanColor(*nan_color, 1.0)
+    table.SetUseBelowRangeColor(False)
+    table.SetUseAboveRangeColor(False)
+    return table
+
+
+def set_point_scalars(mapper, values=None, lookup_table=None, name="Scalars"):
+    """Colour a point polydata mapper by a float array through a lookup table (the array is wrapped,
+    not copied, and no RGB array is built); values=None goes back to the RGB / actor colours
+    """
+    point_data = mapper.GetInput().GetPointData()
+    if values is None:
+        point_data.RemoveArray(name)
+        mapper.SetScalarModeToDefault()
+        mapper.SetColorModeToDefault()
+        return
+    array = numpy_to_vtk(np.ascontiguousarray(values, dtype=np.float32), deep=False)
+    array.SetName(name)
+    point_data.AddArray(array)
+    mapper.SetLookupTable(lookup_table)
+    mapper.UseLookupTableScalarRangeOn()
+    mapper.SetColorModeToMapScalars()
+    mapper.SetScalarModeToUsePointFieldData()
+    mapper.SelectColorArray(name)
+    mapper.ScalarVisibilityOn()